@@ -0,0 +1,85 @@
+# Search/category index build over a compiled catalog file, in-process versus
+# on BatchExecutor pools of increasing size, plus the parent-side cost of
+# handing the order history to workers: pickling versus the snapshot encoding
+# map_orders places in shared memory.
+# Run from the repository root: python -m benchmarks.batch_benchmark
+import os
+import pickle
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from models.Order import Order, OrderItem
+from models.Product import Product
+from persistence.CatalogFile import CatalogFile
+from persistence.OrderLog import OrderLog
+from services.BatchExecutor import BatchExecutor
+from services.ProductService import ProductService
+
+PRODUCT_COUNT = 100000
+ORDER_COUNT = 200000
+WORDS = ["fresh", "organic", "milk", "bread", "rice", "atta", "dal", "paneer", "curd", "tea",
+         "coffee", "sugar", "salt", "oil", "ghee", "butter", "cheese", "juice", "biscuit", "soap"]
+
+
+def build_products(rng: random.Random):
+    return [Product(product_id=f"p{i}", name=" ".join(rng.sample(WORDS, 3)), image="",
+                    category_id=f"c{i % 40}", price=float(rng.randint(10, 500)), discount=0.0,
+                    weight="1kg", description=" ".join(rng.sample(WORDS, 6)), stock=rng.randint(0, 20))
+            for i in range(PRODUCT_COUNT)]
+
+
+def build_orders(rng: random.Random):
+    now = datetime(2026, 1, 1)
+    return [Order(f"o{i}", f"u{i % 5000}", now - timedelta(minutes=rng.randrange(60 * 24 * 60)), "delivered",
+                  0.0, "", "upi", [OrderItem(order_id=f"o{i}", product_id=f"p{rng.randrange(PRODUCT_COUNT)}",
+                                             quantity=rng.randint(1, 3), unit_price=10.0, product_name="",
+                                             product_image="", weight="")
+                                   for _ in range(rng.randint(1, 6))])
+            for i in range(ORDER_COUNT)]
+
+
+def run(catalog_path: str, max_workers: int = None) -> float:
+    product_service = ProductService(catalog_file=CatalogFile(catalog_path))
+    executor = BatchExecutor(max_workers) if max_workers else None
+    try:
+        started = time.perf_counter()
+        product_service.build_indexes(executor)
+        return time.perf_counter() - started
+    finally:
+        if executor:
+            executor.close()
+
+
+def timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def main():
+    rng = random.Random(7)
+    catalog_path = os.path.join(tempfile.mkdtemp(), "catalog.bin")
+    CatalogFile.compile(catalog_path, build_products(rng))
+    cores = os.cpu_count() or 1
+    print(f"Index build, {PRODUCT_COUNT} products, {cores} cores")
+    print(f"{'workers':<10}{'seconds':>10}")
+    print(f"{'inline':<10}{run(catalog_path):>10.2f}")
+    workers = 1
+    while workers <= cores:
+        print(f"{workers:<10}{run(catalog_path, workers):>10.2f}")
+        workers *= 2
+
+    orders = build_orders(rng)
+    pickled = pickle.dumps(orders)
+    encoded = OrderLog.encode_snapshot(orders)
+    print(f"Order hand-off, {ORDER_COUNT} orders")
+    print(f"{'format':<10}{'bytes':>12}{'encode s':>10}{'decode s':>10}")
+    print(f"{'pickle':<10}{len(pickled):>12}{timed(lambda: pickle.dumps(orders)):>10.2f}"
+          f"{timed(lambda: pickle.loads(pickled)):>10.2f}")
+    print(f"{'snapshot':<10}{len(encoded):>12}{timed(lambda: OrderLog.encode_snapshot(orders)):>10.2f}"
+          f"{timed(lambda: OrderLog.decode_snapshot(encoded)):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
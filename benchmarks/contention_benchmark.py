@@ -0,0 +1,80 @@
+# Concurrent checkouts against StockReservationService: striped locks versus a
+# single global lock, plus an oversell check on a handful of hot SKUs.
+# Run from the repository root: python -m benchmarks.contention_benchmark
+import random
+import threading
+import time
+from models.Product import Product
+from services.ProductService import ProductService
+from services.StockReservationService import StockReservationService
+
+THREADS = 32
+CHECKOUTS_PER_THREAD = 2000
+SKU_COUNT = 2000
+HOT_SKUS = 10
+HOT_SHARE = 0.3
+STOCK = 400
+
+
+def build_catalog() -> ProductService:
+    return ProductService([Product(product_id=f"p{i}", name=f"Product {i}", image="", category_id="c",
+                                   price=100.0, discount=0.0, weight="1kg", stock=STOCK)
+                           for i in range(SKU_COUNT)])
+
+
+def run(stripe_count: int):
+    product_service = build_catalog()
+    reservations = StockReservationService(product_service, stripe_count=stripe_count)
+    sold = [0] * SKU_COUNT
+    sold_lock = threading.Lock()
+    start_gate = threading.Barrier(THREADS)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        local_sold = [0] * SKU_COUNT
+        start_gate.wait()
+        for _ in range(CHECKOUTS_PER_THREAD):
+            basket = {}
+            for _ in range(rng.randint(1, 4)):
+                index = rng.randrange(HOT_SKUS) if rng.random() < HOT_SHARE else rng.randrange(SKU_COUNT)
+                basket[index] = basket.get(index, 0) + rng.randint(1, 2)
+            reservation_id = reservations.try_reserve((f"p{i}", q) for i, q in basket.items())
+            if reservation_id is None:
+                continue
+            # Every few checkouts are abandoned instead of paid for
+            if rng.random() < 0.1:
+                reservations.release(reservation_id)
+            elif reservations.commit(reservation_id):
+                for index, quantity in basket.items():
+                    local_sold[index] += quantity
+        with sold_lock:
+            for index, quantity in enumerate(local_sold):
+                sold[index] += quantity
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    oversold = 0
+    for index in range(SKU_COUNT):
+        product = product_service.get_product_by_id(f"p{index}")
+        if sold[index] > STOCK or product.stock != STOCK - sold[index]:
+            oversold += 1
+    attempts = THREADS * CHECKOUTS_PER_THREAD
+    return attempts / elapsed, sum(sold), oversold, reservations.get_active_reservation_count()
+
+
+def main():
+    print(f"{THREADS} threads x {CHECKOUTS_PER_THREAD} checkouts, {SKU_COUNT} SKUs ({HOT_SKUS} hot)")
+    print(f"{'locks':<10}{'checkouts/s':>14}{'units sold':>12}{'bad SKUs':>10}{'leaked':>8}")
+    for label, stripe_count in (("global", 1), ("striped", 64)):
+        throughput, units, bad, leaked = run(stripe_count)
+        print(f"{label:<10}{throughput:>14.0f}{units:>12}{bad:>10}{leaked:>8}")
+
+
+if __name__ == "__main__":
+    main()
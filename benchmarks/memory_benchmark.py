@@ -0,0 +1,131 @@
+# Per-object memory of the model classes before and after __slots__/interning.
+# Run from the repository root: python -m benchmarks.memory_benchmark
+import gc
+import tracemalloc
+from datetime import datetime
+from models.Banner import Banner
+from models.Cart import CartItem
+from models.Order import Order, OrderItem
+from models.OrderItemStore import OrderItemStore
+from models.Product import Product
+from models.Profile import Location
+
+COUNT = 20000
+
+
+# Previous dict-backed layouts, kept here only as the baseline
+class LegacyProduct:
+    def __init__(self, product_id, name, image, category_id, price, discount, weight,
+                 description="", stock=0, max_quantity=10, images=[]):
+        self.product_id = product_id
+        self.name = name
+        self.image = image
+        self.categories = {}
+        self.price = price
+        self.discount = discount
+        self.weight = weight
+        self.description = description
+        self.stock = stock
+        self.max_quantity = max_quantity
+        self.images = images
+
+
+class LegacyLine:
+    def __init__(self, product_id, quantity, unit_price, product_name="", product_image="",
+                 weight="", order_id=None):
+        if order_id is not None:
+            self.order_id = order_id
+        self.product_id = product_id
+        self.quantity = quantity
+        self.unit_price = unit_price
+        self.product_name = product_name
+        self.product_image = product_image
+        self.weight = weight
+
+
+class LegacyRecord:
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+def measure(build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [build(i) for i in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return allocated / COUNT
+
+
+# Strings are rebuilt per object, the way rows decoded from JSON or a database arrive
+def product_args(i):
+    return dict(product_id=f"p{i}", name=f"Product {i % 500}", image=f"img/{i % 500}.png",
+                category_id="".join(["dairy"]), price=10.0 + i, discount=5.0,
+                weight="".join(["500", "g"]), stock=10)
+
+
+def line_args(i):
+    return dict(product_id=f"p{i % 500}", quantity=2, unit_price=45.5,
+                product_name=f"Product {i % 500}", product_image=f"img/{i % 500}.png",
+                weight="".join(["500", "g"]))
+
+
+def order_args(i):
+    return dict(order_id=f"o{i}", user_id=f"u{i % 100}", order_date=datetime(2024, 1, 1),
+                status="delivered", total_amount=250.0, delivery_address=f"{i} MG Road",
+                payment_method="upi", order_items=[])
+
+
+def order_extras():
+    return dict(subtotal=0.0, delivery_charges=0.0, discount_amount=0.0, applied_promo_code="")
+
+
+def location_args(i):
+    return dict(location_id=f"l{i}", address=f"{i} MG Road", city="Bengaluru", state="KA",
+                pincode="560001", latitude=12.97, longitude=77.59, is_default=False)
+
+
+def banner_args(i):
+    return dict(banner_id=f"b{i}", image_url=f"img/b{i}.png", title="", description="",
+                link_url="", is_active=True)
+
+
+def main():
+    cases = [
+        ("Product", lambda i: LegacyProduct(**product_args(i)), lambda i: Product(**product_args(i))),
+        ("CartItem", lambda i: LegacyLine(**line_args(i)), lambda i: CartItem(**line_args(i))),
+        ("OrderItem", lambda i: LegacyLine(order_id=f"o{i // 4}", **line_args(i)),
+         lambda i: OrderItem(order_id=f"o{i // 4}", **line_args(i))),
+        ("Order", lambda i: LegacyRecord(**order_args(i), **order_extras()), lambda i: Order(**order_args(i))),
+        ("Location", lambda i: LegacyRecord(**location_args(i)), lambda i: Location(**location_args(i))),
+        ("Banner", lambda i: LegacyRecord(**banner_args(i)), lambda i: Banner(**banner_args(i))),
+    ]
+
+    print(f"{'class':<12}{'before (B)':>12}{'after (B)':>12}{'saved':>8}")
+    for label, build_before, build_after in cases:
+        before = measure(build_before)
+        after = measure(build_after)
+        print(f"{label:<12}{before:>12.0f}{after:>12.0f}{1 - after / before:>8.0%}")
+
+    object_lines = measure(lambda i: OrderItem(order_id=f"o{i // 4}", **line_args(i)))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    store = OrderItemStore()
+    for start in range(0, COUNT, 4):
+        order_id = f"o{start // 4}"
+        store.add_order_items(order_id, [OrderItem(order_id=order_id, **line_args(i))
+                                         for i in range(start, start + 4)])
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    columnar = sum(stat.size_diff for stat in after.compare_to(before, "filename")) / COUNT
+    print(f"{'OrderItem':<12}{object_lines:>12.0f}{columnar:>12.0f}{1 - columnar / object_lines:>8.0%}"
+          "  (objects vs OrderItemStore)")
+
+
+if __name__ == "__main__":
+    main()
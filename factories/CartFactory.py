@@ -1,3 +1,4 @@
+import json
 from models.Cart import Cart, CartItem
 from models.Product import Product
 
@@ -54,9 +55,47 @@ class CartFactory:
                 product_image=item_data.get("product_image", ""),
                 weight=item_data.get("weight", "")
             )
-            cart.items[product_id] = cart_item
+            cart.add_item(cart_item)
         
-        cart.applied_promo_code = data.get("applied_promo_code", "")
+        # CartService resolves the codes again, so the discount follows the
+        # restored subtotal; the stored amount stands only until then
+        codes = data.get("applied_promo_codes")
+        if codes is None:
+            codes = [code for code in data.get("applied_promo_code", "").split(",") if code]
+        cart.applied_promo_code = ",".join(codes)
         cart.discount_amount = data.get("discount_amount", 0.0)
         
         return cart
+    
+    @staticmethod
+    def create_dict_from_cart(cart: Cart) -> dict:
+        return {
+            "cart_id": cart.cart_id,
+            "minimum_order_value": cart.minimum_order_value,
+            "delivery_charges": cart.delivery_charges,
+            "items": {
+                product_id: {
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "product_name": item.product_name,
+                    "product_image": item.product_image,
+                    "weight": item.weight
+                }
+                for product_id, item in cart.items.items()
+            },
+            # Codes not resolved yet are kept along with resolved ones
+            "applied_promo_codes": [code for code in cart.applied_promo_code.split(",") if code],
+            "discount_amount": cart.discount_amount
+        }
+    
+    @staticmethod
+    def create_bytes_from_dict(data: dict) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+    
+    @staticmethod
+    def create_bytes_from_cart(cart: Cart) -> bytes:
+        return CartFactory.create_bytes_from_dict(CartFactory.create_dict_from_cart(cart))
+    
+    @staticmethod
+    def create_cart_from_bytes(data: bytes) -> Cart:
+        return CartFactory.create_cart_from_dict(json.loads(data.decode("utf-8")))
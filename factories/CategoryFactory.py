@@ -4,12 +4,13 @@ from models.Product import Category
 class CategoryFactory:
     @staticmethod
     def create_category(category_id: str, name: str, icon: str = "", 
-                      image: str = "") -> Category:
+                      image: str = "", parent_id: str = "") -> Category:
         return Category(
             category_id=category_id,
             name=name,
             icon=icon,
-            image=image
+            image=image,
+            parent_id=parent_id
         )
     
     @staticmethod
@@ -18,5 +19,6 @@ class CategoryFactory:
             category_id=data.get("category_id", ""),
             name=data.get("name", ""),
             icon=data.get("icon", ""),
-            image=data.get("image", "")
+            image=data.get("image", ""),
+            parent_id=data.get("parent_id", "")
         )
@@ -98,3 +98,30 @@ class OrderFactory:
         order.applied_promo_code = data.get("applied_promo_code", "")
         
         return order
+    
+    @staticmethod
+    def create_dict_from_order(order: Order) -> dict:
+        return {
+            "order_id": order.order_id,
+            "user_id": order.user_id,
+            "order_date": order.order_date.isoformat(),
+            "status": order.status,
+            "total_amount": order.total_amount,
+            "delivery_address": order.delivery_address,
+            "payment_method": order.payment_method,
+            "order_items": [
+                {
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "product_name": item.product_name,
+                    "product_image": item.product_image,
+                    "weight": item.weight
+                }
+                for item in order.order_items
+            ],
+            "subtotal": order.subtotal,
+            "delivery_charges": order.delivery_charges,
+            "discount_amount": order.discount_amount,
+            "applied_promo_code": order.applied_promo_code
+        }
@@ -1,5 +1,6 @@
 from models.Product import Product
-from typing import List
+import json
+from typing import Dict, List, Sequence
 
 
 class ProductFactory:
@@ -7,7 +8,8 @@ class ProductFactory:
     def create_product(product_id: str, name: str, image: str, category_id: str,
                       price: float, discount: float = 0.0, weight: str = "",
                       description: str = "", stock: int = 0, max_quantity: int = 10, 
-                      images: List[str] = []) -> Product:
+                      images: Sequence[str] = None,
+                      categories: Dict[str, List[str]] = None) -> Product:
         return Product(
             product_id=product_id,
             name=name,
@@ -19,7 +21,8 @@ class ProductFactory:
             description=description,
             stock=stock,
             max_quantity=max_quantity,
-            images=images
+            images=images,
+            categories=categories
         )
     
     @staticmethod
@@ -35,5 +38,26 @@ class ProductFactory:
             description=data.get("description", ""),
             stock=data.get("stock", 0),
             max_quantity=data.get("max_quantity", 10),
-            images=data.get("images", [])
+            images=data.get("images"),
+            categories=data.get("categories", {})
         )
+    
+    @staticmethod
+    def create_from_csv_row(row: dict) -> Product:
+        # CSV cells are strings: images are "|"-separated and categories is a JSON object
+        images = row.get("images") or ""
+        categories = row.get("categories") or ""
+        return ProductFactory.create_from_dict({
+            "product_id": row.get("product_id", ""),
+            "name": row.get("name", ""),
+            "image": row.get("image", ""),
+            "category_id": row.get("category_id", ""),
+            "price": float(row.get("price") or 0.0),
+            "discount": float(row.get("discount") or 0.0),
+            "weight": row.get("weight", ""),
+            "description": row.get("description", ""),
+            "stock": int(row.get("stock") or 0),
+            "max_quantity": int(row.get("max_quantity") or 10),
+            "images": images.split("|") if images else None,
+            "categories": json.loads(categories) if categories else {}
+        })
@@ -7,7 +7,8 @@ class PromoCodeFactory:
     def create_promo_code(code: str, discount_type: str, discount_value: float,
                          min_order_value: float = 0.0, max_discount: float = 0.0,
                          valid_from: datetime = None, valid_until: datetime = None,
-                         is_active: bool = True) -> PromoCode:
+                         is_active: bool = True, conditions: dict = None,
+                         stackable: bool = False) -> PromoCode:
         return PromoCode(
             code=code,
             discount_type=discount_type,
@@ -16,7 +17,9 @@ class PromoCodeFactory:
             max_discount=max_discount,
             valid_from=valid_from,
             valid_until=valid_until,
-            is_active=is_active
+            is_active=is_active,
+            conditions=conditions,
+            stackable=stackable
         )
     
     @staticmethod
@@ -32,5 +35,7 @@ class PromoCodeFactory:
             max_discount=data.get("max_discount", 0.0),
             valid_from=valid_from,
             valid_until=valid_until,
-            is_active=data.get("is_active", True)
+            is_active=data.get("is_active", True),
+            conditions=data.get("conditions"),
+            stackable=data.get("stackable", False)
         )
@@ -0,0 +1,137 @@
+from array import array
+from heapq import nlargest, nsmallest
+from itertools import compress, repeat
+from operator import ge, gt, le
+from typing import Dict, Iterable, List, Sequence
+from models.Product import Product
+
+
+# Column values are coerced so a row holding "5" or 5.0 still fits a typed
+# array; one that can't be read as a number is stored as 0 rather than failing
+# every listing read
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _as_int(value) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+# Immutable column-oriented copy of the catalog. Filters and sort keys run over
+# typed arrays through C-level iterators (map/compress/heapq) instead of calling
+# Product methods per row; doc ids are mapped back to Product objects only for
+# the final page. Changes produce a new snapshot via patched(), so readers
+# holding an older snapshot are unaffected.
+class CatalogSnapshot:
+    def __init__(self, products: Sequence[Product], category_codes: Dict[str, int] = None):
+        self._products = products
+        # Append-only and shared between patched snapshots
+        self._category_codes = category_codes if category_codes is not None else {}
+        self.price = array("d")
+        self.discount = array("d")
+        self.discounted_price = array("d")
+        self.stock = array("l")
+        self.max_quantity = array("l")
+        self.category_code = array("l")
+        self._append(products)
+
+    @staticmethod
+    def from_columns(products: Sequence[Product], price: Iterable[float], discount: Iterable[float],
+                     discounted_price: Iterable[float], stock: Iterable[int],
+                     max_quantity: Iterable[int], category_ids: Iterable[str]) -> "CatalogSnapshot":
+        # Built straight from stored columns, without reading the Product objects
+        snapshot = CatalogSnapshot.__new__(CatalogSnapshot)
+        snapshot._products = products
+        snapshot._category_codes = {}
+        snapshot.price = array("d", map(_as_float, price))
+        snapshot.discount = array("d", map(_as_float, discount))
+        snapshot.discounted_price = array("d", map(_as_float, discounted_price))
+        snapshot.stock = array("l", map(_as_int, stock))
+        snapshot.max_quantity = array("l", map(_as_int, max_quantity))
+        snapshot.category_code = array("l", map(snapshot._code_for, category_ids))
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def _code_for(self, category_id: str) -> int:
+        code = self._category_codes.get(category_id)
+        if code is None:
+            code = len(self._category_codes)
+            self._category_codes[category_id] = code
+        return code
+
+    def _append(self, products: Iterable[Product]):
+        for product in products:
+            self.price.append(_as_float(product.price))
+            self.discount.append(_as_float(product.discount))
+            self.discounted_price.append(_as_float(product.get_discounted_price()))
+            self.stock.append(_as_int(product.stock))
+            self.max_quantity.append(_as_int(product.max_quantity))
+            self.category_code.append(self._code_for(product.category_id))
+
+    def patched(self, products: Sequence[Product], changed_doc_ids: Iterable[int]) -> "CatalogSnapshot":
+        snapshot = CatalogSnapshot.__new__(CatalogSnapshot)
+        snapshot._products = products
+        snapshot._category_codes = self._category_codes
+        for column in ("price", "discount", "discounted_price", "stock", "max_quantity", "category_code"):
+            source = getattr(self, column)
+            setattr(snapshot, column, array(source.typecode, source))
+
+        size = len(self)
+        for doc_id in changed_doc_ids:
+            if doc_id >= size:
+                continue
+            product = products[doc_id]
+            snapshot.price[doc_id] = _as_float(product.price)
+            snapshot.discount[doc_id] = _as_float(product.discount)
+            snapshot.discounted_price[doc_id] = _as_float(product.get_discounted_price())
+            snapshot.stock[doc_id] = _as_int(product.stock)
+            snapshot.max_quantity[doc_id] = _as_int(product.max_quantity)
+            snapshot.category_code[doc_id] = snapshot._code_for(product.category_id)
+        snapshot._append(products[size:len(products)])
+        return snapshot
+
+    def get_category_code(self, category_id: str) -> int:
+        return self._category_codes.get(category_id, -1)
+
+    def select(self, doc_ids: Sequence[int] = None, available_only: bool = True,
+               min_price: float = None, max_price: float = None,
+               category_code: int = None) -> List[int]:
+        selected = range(len(self)) if doc_ids is None else doc_ids
+        if available_only:
+            selected = list(compress(selected, map(gt, map(self.stock.__getitem__, selected), repeat(0))))
+        if min_price is not None:
+            prices = map(self.discounted_price.__getitem__, selected)
+            selected = list(compress(selected, map(ge, prices, repeat(min_price))))
+        if max_price is not None:
+            prices = map(self.discounted_price.__getitem__, selected)
+            selected = list(compress(selected, map(le, prices, repeat(max_price))))
+        if category_code is not None:
+            codes = map(self.category_code.__getitem__, selected)
+            selected = list(compress(selected, map(category_code.__eq__, codes)))
+        return list(selected)
+
+    def _column(self, sort_by: str) -> array:
+        if sort_by == "price":
+            return self.discounted_price
+        if sort_by == "discount":
+            return self.discount
+        raise ValueError(f"Unsupported sort key: {sort_by}")
+
+    def top_k(self, doc_ids: Sequence[int], sort_by: str, k: int = None,
+              descending: bool = False) -> List[int]:
+        key = self._column(sort_by).__getitem__
+        if k is None:
+            return sorted(doc_ids, key=key, reverse=descending)
+        if descending:
+            return nlargest(k, doc_ids, key=key)
+        return nsmallest(k, doc_ids, key=key)
+
+    def to_products(self, doc_ids: Iterable[int]) -> List[Product]:
+        return list(map(self._products.__getitem__, doc_ids))
@@ -0,0 +1,77 @@
+from heapq import merge
+from typing import Dict, Iterable, List, Optional
+
+
+# Category tree with a precomputed posting list per node. A node's subtree
+# posting holds the doc ids of every product tagged with the node or any of its
+# descendants, kept sorted so pages come back in catalog order.
+class CategoryIndex:
+    def __init__(self):
+        self._parent: Dict[str, str] = {}
+        self._children: Dict[str, List[str]] = {}
+        self._direct: Dict[str, List[int]] = {}
+        self._subtree: Dict[str, List[int]] = {}
+
+    def get_parent(self, category_id: str) -> Optional[str]:
+        return self._parent.get(category_id)
+
+    def get_children(self, category_id: str) -> List[str]:
+        return self._children.get(category_id, [])
+
+    def get_ancestors(self, category_id: str) -> List[str]:
+        ancestors = []
+        parent = self._parent.get(category_id)
+        while parent and parent not in ancestors:
+            ancestors.append(parent)
+            parent = self._parent.get(parent)
+        return ancestors
+
+    def add_category(self, category_id: str, parent_id: str = ""):
+        self._subtree.setdefault(category_id, [])
+        if not parent_id or category_id in self._parent:
+            return
+        if parent_id == category_id or category_id in self.get_ancestors(parent_id):
+            raise ValueError(f"Category {category_id} cannot be placed under {parent_id}")
+
+        self._parent[category_id] = parent_id
+        self._children.setdefault(parent_id, []).append(category_id)
+        self._subtree.setdefault(parent_id, [])
+
+        doc_ids = self._subtree[category_id]
+        if doc_ids:
+            for ancestor in [parent_id] + self.get_ancestors(parent_id):
+                self._subtree[ancestor] = self._merge(self._subtree[ancestor], doc_ids)
+
+    @staticmethod
+    def _merge(left: List[int], right: List[int]) -> List[int]:
+        merged = []
+        for doc_id in merge(left, right):
+            if not merged or merged[-1] != doc_id:
+                merged.append(doc_id)
+        return merged
+
+    def add_product(self, doc_id: int, category_ids: Iterable[str]):
+        nodes = []
+        for category_id in category_ids:
+            if not category_id:
+                continue
+            direct = self._direct.setdefault(category_id, [])
+            if not direct or direct[-1] != doc_id:
+                direct.append(doc_id)
+            for node in [category_id] + self.get_ancestors(category_id):
+                if node not in nodes:
+                    nodes.append(node)
+
+        for node in nodes:
+            subtree = self._subtree.setdefault(node, [])
+            if not subtree or subtree[-1] < doc_id:
+                subtree.append(doc_id)
+            elif doc_id not in subtree:
+                self._subtree[node] = self._merge(subtree, [doc_id])
+
+    def get_doc_ids(self, category_id: str, include_subcategories: bool = True) -> List[int]:
+        postings = self._subtree if include_subcategories else self._direct
+        return postings.get(category_id, [])
+
+    def count(self, category_id: str, include_subcategories: bool = True) -> int:
+        return len(self.get_doc_ids(category_id, include_subcategories))
@@ -0,0 +1,126 @@
+from heapq import nlargest
+from math import sqrt
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+# Item-to-item co-occurrence counts over order baskets, with each product's
+# top neighbours kept precomputed. Memory is bounded for bulk builds over
+# large order histories: a product's candidate row is pruned back to its
+# max_candidates strongest entries whenever it doubles past that, and only
+# the first max_basket_size distinct products of a basket are paired.
+# Neighbours are ranked by cosine similarity, count(a, b) / sqrt(n(a) * n(b)),
+# so best sellers don't top every list.
+class CoPurchaseIndex:
+    def __init__(self, neighbor_count: int = 20, max_candidates: int = 200,
+                 max_basket_size: int = 50, min_support: int = 2):
+        self.neighbor_count = neighbor_count
+        self.max_candidates = max_candidates
+        self.max_basket_size = max_basket_size
+        self.min_support = min_support
+        self._item_counts: Dict[str, int] = {}
+        self._pair_counts: Dict[str, Dict[str, int]] = {}
+        self._neighbors: Dict[str, List[Tuple[str, float]]] = {}
+        self._dirty: Set[str] = set()
+        self.basket_count = 0
+
+    def __len__(self) -> int:
+        return len(self._item_counts)
+
+    def _prune(self, row: Dict[str, int]) -> Dict[str, int]:
+        return dict(nlargest(self.max_candidates, row.items(), key=lambda entry: entry[1]))
+
+    def _count_basket(self, product_ids: Iterable[str]) -> List[str]:
+        basket = list(dict.fromkeys(product_ids))[:self.max_basket_size]
+        self.basket_count += 1
+        item_counts = self._item_counts
+        pair_counts = self._pair_counts
+        limit = 2 * self.max_candidates
+        for product_id in basket:
+            item_counts[product_id] = item_counts.get(product_id, 0) + 1
+        if len(basket) < 2:
+            return basket
+        for product_id in basket:
+            row = pair_counts.get(product_id)
+            if row is None:
+                row = pair_counts[product_id] = {}
+            for other_id in basket:
+                if other_id != product_id:
+                    row[other_id] = row.get(other_id, 0) + 1
+            if len(row) > limit:
+                pair_counts[product_id] = self._prune(row)
+        return basket
+
+    def add_basket(self, product_ids: Iterable[str]):
+        # Online update: neighbour lists of the touched products are recomputed on next read
+        self._dirty.update(self._count_basket(product_ids))
+
+    def remove_basket(self, product_ids: Iterable[str]):
+        # Takes back a basket added earlier (a cancelled order). Pairs pruned
+        # since then are already gone and stay gone.
+        basket = list(dict.fromkeys(product_ids))[:self.max_basket_size]
+        if not basket:
+            return
+        self.basket_count -= 1
+        item_counts = self._item_counts
+        pair_counts = self._pair_counts
+        for product_id in basket:
+            count = item_counts.get(product_id, 0) - 1
+            if count > 0:
+                item_counts[product_id] = count
+            else:
+                item_counts.pop(product_id, None)
+            self._dirty.add(product_id)
+            row = pair_counts.get(product_id)
+            if row is None:
+                continue
+            # Scores against this product changed for every product it pairs with
+            self._dirty.update(row)
+            for other_id in basket:
+                pair_count = row.get(other_id, 0) - 1
+                if pair_count > 0:
+                    row[other_id] = pair_count
+                else:
+                    row.pop(other_id, None)
+            if not row:
+                del pair_counts[product_id]
+
+    def build(self, baskets: Iterable[Iterable[str]]) -> int:
+        # Offline bulk build: count everything, then compute every neighbour list once
+        counted = 0
+        for basket in baskets:
+            self._count_basket(basket)
+            counted += 1
+        self._neighbors = {product_id: self._rank(product_id) for product_id in self._pair_counts}
+        self._dirty.clear()
+        return counted
+
+    def _rank(self, product_id: str) -> List[Tuple[str, float]]:
+        row = self._pair_counts.get(product_id)
+        if not row:
+            return []
+        item_counts = self._item_counts
+        own_count = item_counts[product_id]
+        scored = ((other_id, count / sqrt(own_count * item_counts[other_id]))
+                  for other_id, count in row.items() if count >= self.min_support)
+        return nlargest(self.neighbor_count, scored, key=lambda entry: entry[1])
+
+    def get_neighbors(self, product_id: str, limit: int = None) -> List[Tuple[str, float]]:
+        if product_id in self._dirty:
+            self._neighbors[product_id] = self._rank(product_id)
+            self._dirty.discard(product_id)
+        neighbors = self._neighbors.get(product_id, [])
+        return neighbors[:limit] if limit else list(neighbors)
+
+    def get_co_purchase_count(self, product_id: str, other_id: str) -> int:
+        return self._pair_counts.get(product_id, {}).get(other_id, 0)
+
+    def recommend(self, seed_product_ids: List[str], limit: int = 10) -> List[str]:
+        # Earlier seeds weigh more; seeds themselves are never recommended
+        seeds = set(seed_product_ids)
+        scores: Dict[str, float] = {}
+        for position, seed_id in enumerate(seed_product_ids):
+            weight = 1.0 / (position + 1)
+            for other_id, similarity in self.get_neighbors(seed_id):
+                if other_id not in seeds:
+                    scores[other_id] = scores.get(other_id, 0.0) + weight * similarity
+        return nlargest(limit, scores, key=scores.__getitem__)
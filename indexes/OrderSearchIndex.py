@@ -0,0 +1,132 @@
+from typing import Dict, List, Set, Tuple
+from models.Order import Order
+from indexes.ProductSearchIndex import ProductSearchIndex
+
+_MAX_PREFIX_LENGTH = 12
+_GRAM_SIZE = 3
+
+
+# Search index over one user's order history. By default a query matches an
+# order when it occurs anywhere in the order id or in a product name, found
+# through n-gram postings and confirmed against the text. Prefix mode matches
+# whole words instead, through token and token prefix postings, for
+# search-as-you-type. Orders are bucketed by (year, month) for date facets.
+class OrderSearchIndex:
+    def __init__(self):
+        self._orders: Dict[str, Order] = {}
+        self._tokens: Dict[str, Dict[str, int]] = {}
+        self._token_prefixes: Dict[str, Set[str]] = {}
+        self._order_id_prefixes: Dict[str, Set[str]] = {}
+        # Lowercased order id and product names per order, for substring matching
+        self._texts: Dict[str, Tuple[str, List[str]]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._months: Dict[Tuple[int, int], Set[str]] = {}
+        self._years: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def add(self, order: Order):
+        if order.order_id in self._orders:
+            return
+        order_id = order.order_id
+        self._orders[order_id] = order
+
+        lowered_id = order_id.lower()
+        for i in range(1, len(lowered_id) + 1):
+            self._order_id_prefixes.setdefault(lowered_id[:i], set()).add(order_id)
+        names = [item.product_name.lower() for item in order.order_items]
+        self._texts[order_id] = (lowered_id, names)
+        for text in [lowered_id] + names:
+            for gram in ProductSearchIndex._grams(text):
+                self._grams.setdefault(gram, set()).add(order_id)
+
+        for item in order.order_items:
+            for token in set(ProductSearchIndex.tokenize(item.product_name)):
+                postings = self._tokens.setdefault(token, {})
+                postings[order_id] = postings.get(order_id, 0) + 1
+                for i in range(1, min(len(token), _MAX_PREFIX_LENGTH) + 1):
+                    self._token_prefixes.setdefault(token[:i], set()).add(order_id)
+
+        date = order.order_date
+        self._months.setdefault((date.year, date.month), set()).add(order_id)
+        self._years.setdefault(date.year, set()).add(order_id)
+
+    def _token_matches(self, token: str, prefix: bool) -> Set[str]:
+        if prefix:
+            if len(token) <= _MAX_PREFIX_LENGTH:
+                return self._token_prefixes.get(token, set())
+            candidates = self._token_prefixes.get(token[:_MAX_PREFIX_LENGTH], set())
+            return {order_id for order_id in candidates
+                    if any(t.startswith(token) for t in self._tokens_of(order_id))}
+        return set(self._tokens.get(token, {}))
+
+    def _tokens_of(self, order_id: str) -> Set[str]:
+        tokens = set()
+        for item in self._orders[order_id].order_items:
+            tokens.update(ProductSearchIndex.tokenize(item.product_name))
+        return tokens
+
+    def _substring_scores(self, query: str) -> Dict[str, int]:
+        if len(query) <= _GRAM_SIZE:
+            candidates = self._grams.get(query, set())
+        else:
+            postings = [self._grams.get(query[i:i + _GRAM_SIZE], set())
+                        for i in range(len(query) - _GRAM_SIZE + 1)]
+            candidates = min(postings, key=len)
+        scores = {}
+        # An order id match outranks any product name match
+        id_match_score = len(self._orders) + 1
+        for order_id in candidates:
+            lowered_id, names = self._texts[order_id]
+            if query in lowered_id:
+                scores[order_id] = id_match_score
+            else:
+                lines = sum(query in name for name in names)
+                if lines:
+                    scores[order_id] = lines
+        return scores
+
+    def _prefix_scores(self, query: str) -> Dict[str, int]:
+        scores: Dict[str, int] = {}
+        tokens = ProductSearchIndex.tokenize(query)
+        if tokens:
+            # Every token must match; only the last one may be a partial word
+            matched = [self._token_matches(t, i == len(tokens) - 1) for i, t in enumerate(tokens)]
+            matched.sort(key=len)
+            hits = set(matched[0])
+            for other in matched[1:]:
+                hits.intersection_update(other)
+                if not hits:
+                    break
+            for order_id in hits:
+                scores[order_id] = sum(self._tokens.get(t, {}).get(order_id, 0) for t in tokens)
+
+        id_match_score = len(self._orders) + 1
+        for order_id in self._order_id_prefixes.get(query.strip(), ()):
+            scores[order_id] = id_match_score
+        return scores
+
+    def _facet(self, year: int = None, month: int = None) -> Set[str]:
+        if year is not None and month is not None:
+            return self._months.get((year, month), set())
+        if year is not None:
+            return self._years.get(year, set())
+        return None
+
+    def search(self, query: str, prefix: bool = False, year: int = None, month: int = None,
+               offset: int = 0, limit: int = None) -> List[Order]:
+        query_lower = query.lower()
+        facet = self._facet(year, month)
+
+        if not query_lower.strip():
+            scores = dict.fromkeys(self._orders if facet is None else facet, 0)
+        else:
+            scores = self._prefix_scores(query_lower) if prefix else self._substring_scores(query_lower)
+            if facet is not None:
+                scores = {order_id: score for order_id, score in scores.items() if order_id in facet}
+
+        ranked = sorted(scores, key=lambda order_id: (scores[order_id], self._orders[order_id].order_date),
+                        reverse=True)
+        page = ranked[offset:offset + limit] if limit else ranked[offset:]
+        return [self._orders[order_id] for order_id in page]
@@ -0,0 +1,131 @@
+import re
+from typing import Dict, Iterator, List, Set
+from models.Product import Product
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_GRAM_SIZE = 3
+_MAX_PREFIX_LENGTH = 12
+
+
+# Postings hold doc ids (the product's position in the catalog) in insertion
+# order, so every posting list is already sorted and ranking ties fall back to
+# catalog order. A shard built with first_doc_id covers the doc ids from
+# there on and is appended to the index ahead of it with extend().
+class ProductSearchIndex:
+    def __init__(self, first_doc_id: int = 0):
+        self.first_doc_id = first_doc_id
+        self._names: List[str] = []
+        self._descriptions: List[str] = []
+        self._name_tokens: Dict[str, List[int]] = {}
+        self._name_prefixes: Dict[str, List[int]] = {}
+        self._name_grams: Dict[str, List[int]] = {}
+        self._description_grams: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return _TOKEN_PATTERN.findall(text.lower())
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        grams = set()
+        for size in range(1, _GRAM_SIZE + 1):
+            for i in range(len(text) - size + 1):
+                grams.add(text[i:i + size])
+        return grams
+
+    @staticmethod
+    def _post(postings: Dict[str, List[int]], keys, doc_id: int):
+        for key in keys:
+            posting = postings.get(key)
+            if posting is None:
+                postings[key] = [doc_id]
+            elif posting[-1] != doc_id:
+                posting.append(doc_id)
+
+    def add(self, doc_id: int, product: Product):
+        expected = self.first_doc_id + len(self._names)
+        if doc_id != expected:
+            raise ValueError(f"Expected doc id {expected}, got {doc_id}")
+
+        name = product.name.lower()
+        description = product.description.lower()
+        self._names.append(name)
+        self._descriptions.append(description)
+
+        tokens = set(self.tokenize(name))
+        prefixes = {t[:i] for t in tokens for i in range(1, min(len(t), _MAX_PREFIX_LENGTH) + 1)}
+        self._post(self._name_tokens, tokens, doc_id)
+        self._post(self._name_prefixes, prefixes, doc_id)
+        self._post(self._name_grams, self._grams(name), doc_id)
+        self._post(self._description_grams, self._grams(description), doc_id)
+
+    def add_empty(self, doc_id: int):
+        # Holds a doc id for a product that can't be indexed; it never matches a query
+        expected = self.first_doc_id + len(self._names)
+        if doc_id != expected:
+            raise ValueError(f"Expected doc id {expected}, got {doc_id}")
+        self._names.append("")
+        self._descriptions.append("")
+
+    def extend(self, shard: "ProductSearchIndex"):
+        expected = self.first_doc_id + len(self._names)
+        if shard.first_doc_id != expected:
+            raise ValueError(f"Expected a shard starting at doc id {expected}, got {shard.first_doc_id}")
+        self._names.extend(shard._names)
+        self._descriptions.extend(shard._descriptions)
+        for postings, shard_postings in ((self._name_tokens, shard._name_tokens),
+                                         (self._name_prefixes, shard._name_prefixes),
+                                         (self._name_grams, shard._name_grams),
+                                         (self._description_grams, shard._description_grams)):
+            for key, posting in shard_postings.items():
+                existing = postings.get(key)
+                if existing is None:
+                    postings[key] = posting
+                else:
+                    existing.extend(posting)
+
+    def _substring_candidates(self, grams: Dict[str, List[int]], query: str) -> List[int]:
+        if len(query) <= _GRAM_SIZE:
+            return grams.get(query, [])
+        rarest: List[int] = None
+        for i in range(len(query) - _GRAM_SIZE + 1):
+            posting = grams.get(query[i:i + _GRAM_SIZE])
+            if not posting:
+                return []
+            if rarest is None or len(posting) < len(rarest):
+                rarest = posting
+        return rarest
+
+    def _ranked(self, query: str) -> Iterator[int]:
+        # Tiers, best first: whole name token, name token prefix, anywhere in
+        # the name, anywhere in the description.
+        seen: Set[int] = set()
+
+        tiers = []
+        if len(query) <= _MAX_PREFIX_LENGTH and _TOKEN_PATTERN.fullmatch(query):
+            tiers.append(self._name_tokens.get(query, []))
+            tiers.append(self._name_prefixes.get(query, []))
+        for tier in tiers:
+            for doc_id in tier:
+                if doc_id not in seen:
+                    seen.add(doc_id)
+                    yield doc_id
+
+        for doc_id in self._substring_candidates(self._name_grams, query):
+            if doc_id not in seen and query in self._names[doc_id]:
+                seen.add(doc_id)
+                yield doc_id
+
+        for doc_id in self._substring_candidates(self._description_grams, query):
+            if doc_id not in seen and query in self._descriptions[doc_id]:
+                seen.add(doc_id)
+                yield doc_id
+
+    def search(self, query: str) -> Iterator[int]:
+        query_lower = query.lower()
+        if not query_lower:
+            return iter(range(len(self._names)))
+        return self._ranked(query_lower)
@@ -0,0 +1,56 @@
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+
+
+# A sorted view of (key, doc_id) pairs. Reads are slices, so top-k and page
+# reads cost O(k); a key change is one bisect plus one list insert.
+class SortedProductIndex:
+    def __init__(self):
+        self._entries: List[Tuple[float, int]] = []
+        self._keys: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._keys
+
+    def get_key(self, doc_id: int):
+        return self._keys.get(doc_id)
+
+    def set(self, doc_id: int, key: float):
+        old_key = self._keys.get(doc_id)
+        if old_key is not None:
+            if old_key == key:
+                return
+            self.discard(doc_id)
+        insort(self._entries, (key, doc_id))
+        self._keys[doc_id] = key
+
+    def discard(self, doc_id: int):
+        key = self._keys.pop(doc_id, None)
+        if key is None:
+            return
+        position = bisect_left(self._entries, (key, doc_id))
+        del self._entries[position]
+
+    def bulk_set(self, items: Iterable[Tuple[int, float]]):
+        for doc_id, key in items:
+            if doc_id in self._keys:
+                self.discard(doc_id)
+            self._keys[doc_id] = key
+            self._entries.append((key, doc_id))
+        self._entries.sort()
+
+    def count_below(self, key: float) -> int:
+        return bisect_left(self._entries, (key, -1))
+
+    def doc_ids(self, offset: int = 0, limit: int = None, reverse: bool = False,
+                stop: int = None) -> List[int]:
+        end = len(self._entries) if stop is None else min(stop, len(self._entries))
+        if reverse:
+            upper = end - offset
+            lower = max(0, upper - limit) if limit else 0
+            return [doc_id for _, doc_id in reversed(self._entries[lower:max(0, upper)])]
+        upper = min(end, offset + limit) if limit else end
+        return [doc_id for _, doc_id in self._entries[offset:upper]]
@@ -0,0 +1,184 @@
+from collections import OrderedDict
+from math import asin, cos, radians, sin, sqrt
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.Profile import Location
+from models.Store import Store, StoreAssignment
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Geohash precision 5: 12 latitude bits and 13 longitude bits, i.e. cells of
+# about 4.9 km x 4.9 km at the equator
+_LAT_BITS = 12
+_LON_BITS = 13
+_LAT_STEP = 180.0 / (1 << _LAT_BITS)
+_LON_STEP = 360.0 / (1 << _LON_BITS)
+
+DEFAULT_ETA_BANDS: List[Tuple[float, str]] = [
+    (2.0, "10-15 min"),
+    (5.0, "15-25 min"),
+    (10.0, "25-40 min"),
+]
+FALLBACK_ETA_BAND = "40-60 min"
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+# Maps coordinates to the nearest store that services them. Each store is
+# registered in every geohash cell its service area overlaps, so a lookup is
+# one cell hash plus a distance check against the few stores in that cell.
+# Results are cached per location_id until the store set changes; the least
+# recently used entry is evicted once max_cached_locations is reached.
+class StoreSpatialIndex:
+    def __init__(self, stores: Iterable[Store] = None, eta_bands: List[Tuple[float, str]] = None,
+                 max_cached_locations: int = 100000):
+        self._stores: Dict[str, Store] = {}
+        self._cells: Dict[str, List[Store]] = {}
+        # Cells each store was registered in, so removal doesn't depend on its
+        # current (possibly edited) coordinates and service area
+        self._store_cells: Dict[str, List[str]] = {}
+        self._eta_bands = sorted(eta_bands or DEFAULT_ETA_BANDS)
+        self.max_cached_locations = max_cached_locations
+        self._cache: "OrderedDict[str, Tuple[float, float, Optional[StoreAssignment]]]" = OrderedDict()
+        for store in stores or []:
+            self.add_store(store)
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    @staticmethod
+    def _cell_of(latitude: float, longitude: float) -> Tuple[int, int]:
+        lat_cell = min(int((latitude + 90.0) / _LAT_STEP), (1 << _LAT_BITS) - 1)
+        lon_cell = min(int((longitude + 180.0) / _LON_STEP), (1 << _LON_BITS) - 1)
+        return max(lat_cell, 0), max(lon_cell, 0)
+
+    @staticmethod
+    def _geohash_of_cell(lat_cell: int, lon_cell: int) -> str:
+        # Interleave longitude and latitude bits, longitude first
+        bits = 0
+        lat_bit, lon_bit = _LAT_BITS, _LON_BITS
+        for i in range(_LAT_BITS + _LON_BITS):
+            if i % 2 == 0:
+                lon_bit -= 1
+                bits = (bits << 1) | ((lon_cell >> lon_bit) & 1)
+            else:
+                lat_bit -= 1
+                bits = (bits << 1) | ((lat_cell >> lat_bit) & 1)
+        return "".join(_BASE32[(bits >> shift) & 31] for shift in range(20, -1, -5))
+
+    @staticmethod
+    def geohash(latitude: float, longitude: float) -> str:
+        return StoreSpatialIndex._geohash_of_cell(*StoreSpatialIndex._cell_of(latitude, longitude))
+
+    @staticmethod
+    def _service_bounds(store: Store) -> Tuple[float, float, float, float]:
+        if store.service_polygon:
+            latitudes = [lat for lat, _ in store.service_polygon]
+            longitudes = [lon for _, lon in store.service_polygon]
+            return min(latitudes), max(latitudes), min(longitudes), max(longitudes)
+        lat_delta = store.service_radius_km / KM_PER_DEGREE_LAT
+        lon_delta = store.service_radius_km / (KM_PER_DEGREE_LAT * max(cos(radians(store.latitude)), 0.01))
+        return (store.latitude - lat_delta, store.latitude + lat_delta,
+                store.longitude - lon_delta, store.longitude + lon_delta)
+
+    def _covered_cells(self, store: Store) -> List[str]:
+        min_lat, max_lat, min_lon, max_lon = self._service_bounds(store)
+        low_lat, low_lon = self._cell_of(min_lat, min_lon)
+        high_lat, high_lon = self._cell_of(max_lat, max_lon)
+        return [self._geohash_of_cell(lat_cell, lon_cell)
+                for lat_cell in range(low_lat, high_lat + 1)
+                for lon_cell in range(low_lon, high_lon + 1)]
+
+    def add_store(self, store: Store):
+        if store.store_id in self._stores:
+            self.remove_store(store.store_id)
+        self._stores[store.store_id] = store
+        cells = self._store_cells[store.store_id] = self._covered_cells(store)
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(store)
+        self._cache.clear()
+
+    def remove_store(self, store_id: str) -> bool:
+        store = self._stores.pop(store_id, None)
+        if store is None:
+            return False
+        for cell in self._store_cells.pop(store_id, ()):
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                continue
+            bucket.remove(store)
+            if not bucket:
+                del self._cells[cell]
+        self._cache.clear()
+        return True
+
+    def set_store_active(self, store_id: str, is_active: bool) -> bool:
+        store = self._stores.get(store_id)
+        if store is None:
+            return False
+        store.is_active = is_active
+        self._cache.clear()
+        return True
+
+    def get_eta_band(self, distance_km: float) -> str:
+        for max_distance, band in self._eta_bands:
+            if distance_km <= max_distance:
+                return band
+        return FALLBACK_ETA_BAND
+
+    def find_store(self, latitude: float, longitude: float) -> Optional[StoreAssignment]:
+        best: Optional[Store] = None
+        best_distance = 0.0
+        for store in self._cells.get(self.geohash(latitude, longitude), ()):
+            if not store.is_active:
+                continue
+            distance = haversine_km(latitude, longitude, store.latitude, store.longitude)
+            if store.service_polygon:
+                if not store.polygon_contains(latitude, longitude):
+                    continue
+            elif distance > store.service_radius_km:
+                continue
+            if best is None or distance < best_distance:
+                best, best_distance = store, distance
+        if best is None:
+            return None
+        return StoreAssignment(best, best_distance, self.get_eta_band(best_distance))
+
+    def resolve(self, location: Location) -> Optional[StoreAssignment]:
+        if not location.latitude and not location.longitude:
+            return None
+        if not location.location_id:
+            return self.find_store(location.latitude, location.longitude)
+        cached = self._cache.get(location.location_id)
+        # An edited address keeps its id, so the cached coordinates must match
+        if cached is not None and cached[0] == location.latitude and cached[1] == location.longitude:
+            self._cache.move_to_end(location.location_id)
+            return cached[2]
+        assignment = self.find_store(location.latitude, location.longitude)
+        self._cache[location.location_id] = (location.latitude, location.longitude, assignment)
+        self._cache.move_to_end(location.location_id)
+        while len(self._cache) > self.max_cached_locations:
+            self._cache.popitem(last=False)
+        return assignment
+
+    def resolve_many(self, locations: Iterable[Location],
+                     cache_results: bool = False) -> List[Optional[StoreAssignment]]:
+        # Backfills of saved addresses skip the per-location cache by default so
+        # memory stays bounded by the result list
+        if cache_results:
+            return [self.resolve(location) for location in locations]
+        find_store = self.find_store
+        return [find_store(location.latitude, location.longitude)
+                if location.latitude or location.longitude else None
+                for location in locations]
+
+    def invalidate(self, location_id: str = None):
+        if location_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(location_id, None)
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Dict, List
+from models.Cart import to_paise
+from models.Order import Order
+
+
+# Running aggregates over one user's order history, updated as orders are
+# created and change status so the profile screen never rescans history.
+# Spend is tracked in integer paise so repeated status flips can't drift.
+class UserOrderStats:
+    def __init__(self):
+        self.total_orders = 0
+        self.status_counts: Dict[str, int] = {}
+        self._delivered_paise = 0
+        self._product_order_counts: Dict[str, int] = {}
+        self._product_last_ordered: Dict[str, datetime] = {}
+
+    def add_order(self, order: Order):
+        self.total_orders += 1
+        self._count_status(order.status, 1, order.total_amount)
+        for product_id in set(order.get_ordered_product_ids()):
+            self._product_order_counts[product_id] = self._product_order_counts.get(product_id, 0) + 1
+            last_ordered = self._product_last_ordered.get(product_id)
+            if last_ordered is None or order.order_date > last_ordered:
+                self._product_last_ordered[product_id] = order.order_date
+
+    def change_status(self, order: Order, old_status: str, new_status: str):
+        self._count_status(old_status, -1, order.total_amount)
+        self._count_status(new_status, 1, order.total_amount)
+
+    def _count_status(self, status: str, delta: int, total_amount: float):
+        count = self.status_counts.get(status, 0) + delta
+        if count:
+            self.status_counts[status] = count
+        else:
+            self.status_counts.pop(status, None)
+        if status == "delivered":
+            self._delivered_paise += delta * to_paise(total_amount)
+
+    def get_status_count(self, status: str) -> int:
+        return self.status_counts.get(status, 0)
+
+    def get_total_spent(self) -> float:
+        return self._delivered_paise / 100
+
+    def get_product_order_count(self, product_id: str) -> int:
+        return self._product_order_counts.get(product_id, 0)
+
+    def get_product_last_ordered(self, product_id: str) -> datetime:
+        return self._product_last_ordered.get(product_id)
+
+    def get_product_ids_by_recency(self) -> List[str]:
+        return sorted(self._product_last_ordered, key=self._product_last_ordered.__getitem__, reverse=True)
+
+    def get_product_ids_by_frequency(self) -> List[str]:
+        return sorted(self._product_order_counts, key=self._product_order_counts.__getitem__, reverse=True)
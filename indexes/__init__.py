@@ -0,0 +1,23 @@
+"""
+Indexes package - Contains in-memory lookup structures used by the services
+"""
+
+from indexes.ProductSearchIndex import ProductSearchIndex
+from indexes.CategoryIndex import CategoryIndex
+from indexes.SortedProductIndex import SortedProductIndex
+from indexes.CatalogSnapshot import CatalogSnapshot
+from indexes.UserOrderStats import UserOrderStats
+from indexes.OrderSearchIndex import OrderSearchIndex
+from indexes.StoreSpatialIndex import StoreSpatialIndex
+from indexes.CoPurchaseIndex import CoPurchaseIndex
+
+__all__ = [
+    'ProductSearchIndex',
+    'CategoryIndex',
+    'SortedProductIndex',
+    'CatalogSnapshot',
+    'UserOrderStats',
+    'OrderSearchIndex',
+    'StoreSpatialIndex',
+    'CoPurchaseIndex'
+]
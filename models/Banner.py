@@ -1,4 +1,6 @@
 class Banner:
+    __slots__ = ("banner_id", "image_url", "title", "description", "link_url", "is_active")
+    
     def __init__(self, banner_id: str, image_url: str, title: str = "", 
                  description: str = "", link_url: str = "", is_active: bool = True):
         self.banner_id = banner_id
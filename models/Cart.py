@@ -1,15 +1,20 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+from models.Interning import intern_str
+from models.PromoCode import PromoCode
 
 
 class CartItem:
+    __slots__ = ("product_id", "quantity", "unit_price", "product_name", "product_image", "weight")
+    
     def __init__(self, product_id: str, quantity: int, unit_price: float, 
                  product_name: str = "", product_image: str = "", weight: str = ""):
-        self.product_id = product_id
+        # Display strings are shared with the catalog and every other line for the product
+        self.product_id = intern_str(product_id)
         self.quantity = quantity
         self.unit_price = unit_price
-        self.product_name = product_name
-        self.product_image = product_image
-        self.weight = weight
+        self.product_name = intern_str(product_name)
+        self.product_image = intern_str(product_image)
+        self.weight = intern_str(weight)
     
     def get_item_total(self) -> float:
         return self.quantity * self.unit_price
@@ -24,7 +29,17 @@ class CartItem:
         self.quantity = max(0, self.quantity - amount)
 
 
+def to_paise(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+# Cart keeps its subtotal (in integer paise) and item count up to date as items
+# change, so reads are O(1) and repeated float sums can't drift. Change items
+# through the Cart methods; set Cart.debug_checks to verify the running totals
+# against a full recomputation on every read.
 class Cart:
+    debug_checks = False
+    
     def __init__(self, cart_id: str = "", minimum_order_value: float = 0.0, 
                  delivery_charges: float = 0.0):
         self.cart_id = cart_id
@@ -33,29 +48,74 @@ class Cart:
         self.delivery_charges = delivery_charges
         self.applied_promo_code: str = ""
         self.discount_amount: float = 0.0
+        # Several codes only when all of them are stackable
+        self._applied_promos: List[PromoCode] = []
+        self._subtotal_paise = 0
+        self._item_count = 0
+    
+    def _adjust_totals(self, quantity_delta: int, unit_price: float):
+        if quantity_delta:
+            self._item_count += quantity_delta
+            self._subtotal_paise += quantity_delta * to_paise(unit_price)
+            self._refresh_discount()
+    
+    def _refresh_discount(self):
+        if self._applied_promos:
+            subtotal = self.get_subtotal()
+            discount = sum(promo.calculate_discount(subtotal) for promo in self._applied_promos)
+            self.discount_amount = min(discount, subtotal)
+    
+    def _check_totals(self):
+        expected_paise = sum(item.quantity * to_paise(item.unit_price) for item in self.items.values())
+        expected_count = sum(item.quantity for item in self.items.values())
+        if expected_paise != self._subtotal_paise or expected_count != self._item_count:
+            raise AssertionError(
+                f"Cart {self.cart_id} totals drifted: subtotal {self._subtotal_paise} != {expected_paise} "
+                f"paise or count {self._item_count} != {expected_count}"
+            )
     
     def add_item(self, cart_item: CartItem):
         if cart_item.product_id in self.items:
-            self.items[cart_item.product_id].quantity += cart_item.quantity
+            existing = self.items[cart_item.product_id]
+            existing.quantity += cart_item.quantity
+            self._adjust_totals(cart_item.quantity, existing.unit_price)
         else:
             self.items[cart_item.product_id] = cart_item
+            self._adjust_totals(cart_item.quantity, cart_item.unit_price)
     
     def remove_item(self, product_id: str):
         if product_id in self.items:
-            del self.items[product_id]
+            item = self.items.pop(product_id)
+            self._adjust_totals(-item.quantity, item.unit_price)
     
     def update_item_quantity(self, product_id: str, quantity: int):
         if product_id in self.items:
             if quantity > 0:
-                self.items[product_id].update_quantity(quantity)
+                item = self.items[product_id]
+                previous_quantity = item.quantity
+                item.update_quantity(quantity)
+                self._adjust_totals(item.quantity - previous_quantity, item.unit_price)
             else:
                 self.remove_item(product_id)
     
+    def update_item_price(self, product_id: str, unit_price: float) -> bool:
+        item = self.items.get(product_id)
+        if item is None or item.unit_price == unit_price:
+            return False
+        self._subtotal_paise += item.quantity * (to_paise(unit_price) - to_paise(item.unit_price))
+        item.unit_price = unit_price
+        self._refresh_discount()
+        return True
+    
     def get_item_count(self) -> int:
-        return sum(item.quantity for item in self.items.values())
+        if Cart.debug_checks:
+            self._check_totals()
+        return self._item_count
     
     def get_subtotal(self) -> float:
-        return sum(item.get_item_total() for item in self.items.values())
+        if Cart.debug_checks:
+            self._check_totals()
+        return self._subtotal_paise / 100
     
     def get_total(self) -> float:
         return self.get_subtotal() + self.delivery_charges - self.discount_amount
@@ -63,10 +123,38 @@ class Cart:
     def is_minimum_order_met(self) -> bool:
         return self.get_subtotal() >= self.minimum_order_value
     
+    def apply_promo(self, promo_code: PromoCode, stack: bool = False):
+        # The discount is re-evaluated whenever the subtotal changes
+        if stack:
+            self._applied_promos = [p for p in self._applied_promos if p.code != promo_code.code]
+            self._applied_promos.append(promo_code)
+        else:
+            self._applied_promos = [promo_code]
+        self._sync_promo_fields()
+    
+    def remove_promo(self, code: str = None):
+        if code is None:
+            self._applied_promos = []
+        else:
+            self._applied_promos = [p for p in self._applied_promos if p.code.upper() != code.upper()]
+        self._sync_promo_fields()
+    
+    def _sync_promo_fields(self):
+        self.applied_promo_code = ",".join(p.code for p in self._applied_promos)
+        self.discount_amount = 0.0
+        self._refresh_discount()
+    
+    def get_applied_promo(self) -> Optional[PromoCode]:
+        return self._applied_promos[0] if self._applied_promos else None
+    
+    def get_applied_promos(self) -> List[PromoCode]:
+        return list(self._applied_promos)
+    
     def clear(self):
         self.items.clear()
-        self.applied_promo_code = ""
-        self.discount_amount = 0.0
+        self._subtotal_paise = 0
+        self._item_count = 0
+        self.remove_promo()
     
     def get_items_list(self) -> List[CartItem]:
         return list(self.items.values())
@@ -0,0 +1,7 @@
+from sys import intern
+
+
+# Interns model strings. Only exact str values can be interned; None or other
+# values from loosely typed input are kept as given.
+def intern_str(value):
+    return intern(value) if type(value) is str else value
@@ -1,23 +1,31 @@
 from typing import List
 from datetime import datetime
+from models.Interning import intern_str
 
 
 class OrderItem:
+    __slots__ = ("order_id", "product_id", "quantity", "unit_price",
+                 "product_name", "product_image", "weight")
+    
     def __init__(self, order_id: str, product_id: str, quantity: int, unit_price: float,
                  product_name: str = "", product_image: str = "", weight: str = ""):
         self.order_id = order_id
-        self.product_id = product_id
+        self.product_id = intern_str(product_id)
         self.quantity = quantity
         self.unit_price = unit_price
-        self.product_name = product_name
-        self.product_image = product_image
-        self.weight = weight
+        self.product_name = intern_str(product_name)
+        self.product_image = intern_str(product_image)
+        self.weight = intern_str(weight)
     
     def get_item_total(self) -> float:
         return self.quantity * self.unit_price
 
 
 class Order:
+    __slots__ = ("order_id", "user_id", "order_date", "status", "total_amount", "delivery_address",
+                 "payment_method", "order_items", "subtotal", "delivery_charges",
+                 "discount_amount", "applied_promo_code")
+    
     def __init__(self, order_id: str, user_id: str, order_date: datetime = None,
                  status: str = "pending", total_amount: float = 0.0,
                  delivery_address: str = "", payment_method: str = "",
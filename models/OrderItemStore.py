@@ -0,0 +1,72 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+from models.Interning import intern_str
+from models.Order import OrderItem
+
+
+# Columnar storage for historical order lines. Quantities and prices live in
+# typed arrays, and the (name, image, weight) display triple is stored once per
+# distinct value and referenced by index. OrderItem objects are only built when
+# a row is read back.
+class OrderItemStore:
+    def __init__(self):
+        self._order_ids: List[str] = []
+        self._product_ids: List[str] = []
+        self._quantities = array("l")
+        self._unit_prices = array("d")
+        self._detail_refs = array("l")
+        self._details: List[Tuple[str, str, str]] = []
+        self._detail_index: Dict[Tuple[str, str, str], int] = {}
+        self._order_rows: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._quantities)
+
+    def _detail_ref(self, name: str, image: str, weight: str) -> int:
+        key = (name, image, weight)
+        ref = self._detail_index.get(key)
+        if ref is None:
+            ref = len(self._details)
+            self._details.append((intern_str(name), intern_str(image), intern_str(weight)))
+            self._detail_index[key] = ref
+        return ref
+
+    def append(self, item: OrderItem) -> int:
+        row = len(self._quantities)
+        self._order_ids.append(intern_str(item.order_id))
+        self._product_ids.append(intern_str(item.product_id))
+        self._quantities.append(item.quantity)
+        self._unit_prices.append(item.unit_price)
+        self._detail_refs.append(self._detail_ref(item.product_name, item.product_image, item.weight))
+        return row
+
+    def add_order_items(self, order_id: str, items: Iterable[OrderItem]) -> range:
+        start = len(self._quantities)
+        for item in items:
+            self.append(item)
+        end = len(self._quantities)
+        self._order_rows[order_id] = (start, end)
+        return range(start, end)
+
+    def get(self, row: int) -> OrderItem:
+        name, image, weight = self._details[self._detail_refs[row]]
+        return OrderItem(
+            order_id=self._order_ids[row],
+            product_id=self._product_ids[row],
+            quantity=self._quantities[row],
+            unit_price=self._unit_prices[row],
+            product_name=name,
+            product_image=image,
+            weight=weight
+        )
+
+    def get_order_items(self, order_id: str) -> List[OrderItem]:
+        start, end = self._order_rows.get(order_id, (0, 0))
+        return [self.get(row) for row in range(start, end)]
+
+    def get_order_total(self, order_id: str) -> float:
+        start, end = self._order_rows.get(order_id, (0, 0))
+        return sum(self._quantities[row] * self._unit_prices[row] for row in range(start, end))
+
+    def iter_rows(self) -> Iterator[Tuple[str, str, int, float]]:
+        return zip(self._order_ids, self._product_ids, self._quantities, self._unit_prices)
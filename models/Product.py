@@ -1,32 +1,57 @@
-from typing import List
+from typing import Dict, List, Sequence
+from models.Interning import intern_str
 
 
 class Category:
-    def __init__(self, category_id: str, name: str, icon: str = "", image: str = ""):
+    __slots__ = ("category_id", "name", "icon", "image", "parent_id")
+    
+    def __init__(self, category_id: str, name: str, icon: str = "", image: str = "",
+                 parent_id: str = ""):
         self.category_id = category_id
         self.name = name
         self.icon = icon
         self.image = image
+        self.parent_id = parent_id
     
     def get_display_name(self) -> str:
         return self.name
+    
+    def is_sub_category(self) -> bool:
+        return bool(self.parent_id)
 
 
 class Product:
+    __slots__ = ("product_id", "name", "image", "category_id", "categories", "price", "discount",
+                 "weight", "description", "stock", "max_quantity", "images")
+    
     def __init__(self, product_id: str, name: str, image: str, category_id: str, 
                  price: float, discount: float, weight: str, description: str = "", 
-                 stock: int = 0, max_quantity: int = 10, images: List[str] = []):
+                 stock: int = 0, max_quantity: int = 10, images: Sequence[str] = None,
+                 categories: Dict[str, List[str]] = None):
         self.product_id = product_id
         self.name = name
         self.image = image
-        self.categories = {}  # Add category : sub category mapping or something better ? 
+        self.category_id = intern_str(category_id)
+        # Extra category -> sub-category ids the product is also listed under
+        self.categories: Dict[str, List[str]] = categories or {}
         self.price = price
         self.discount = discount
-        self.weight = weight
+        self.weight = intern_str(weight)
         self.description = description
         self.stock = stock
         self.max_quantity = max_quantity
-        self.images = images
+        # A lone string would otherwise be read as a list of one-character URLs
+        if isinstance(images, str):
+            raise TypeError("images must be a list of image URLs, not a string")
+        self.images: List[str] = list(images) if images else []
+    
+    def get_category_ids(self) -> List[str]:
+        category_ids = [self.category_id] if self.category_id else []
+        for category_id, sub_category_ids in self.categories.items():
+            for cid in [category_id] + list(sub_category_ids):
+                if cid not in category_ids:
+                    category_ids.append(cid)
+        return category_ids
     
     def get_discounted_price(self) -> float:
         if self.discount > 0:
@@ -0,0 +1,28 @@
+from typing import Iterable
+
+
+# One product's state after a stock, price, discount or popularity change.
+# `changed` names the fields that moved: "stock", "price", "discount",
+# "popularity" and "available" when the product went in or out of stock.
+class ProductChange:
+    __slots__ = ("product_id", "changed", "price", "discount", "discounted_price",
+                 "stock", "is_available", "version", "popularity")
+    
+    def __init__(self, product_id: str, changed: Iterable[str], price: float = 0.0,
+                 discount: float = 0.0, discounted_price: float = 0.0, stock: int = 0,
+                 is_available: bool = False, version: int = 0, popularity: float = 0.0):
+        self.product_id = product_id
+        self.changed = frozenset(changed)
+        self.price = price
+        self.discount = discount
+        self.discounted_price = discounted_price
+        self.stock = stock
+        self.is_available = is_available
+        self.version = version
+        self.popularity = popularity
+    
+    def merge(self, newer: "ProductChange") -> "ProductChange":
+        # Latest values win; an availability flip that flipped back is still reported
+        return ProductChange(self.product_id, self.changed | newer.changed, newer.price,
+                             newer.discount, newer.discounted_price, newer.stock,
+                             newer.is_available, newer.version, newer.popularity)
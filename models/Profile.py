@@ -2,6 +2,9 @@ from typing import List, Optional
 
 
 class Location:
+    __slots__ = ("location_id", "address", "city", "state", "pincode",
+                 "latitude", "longitude", "is_default")
+    
     def __init__(self, location_id: str = "", address: str = "", 
                  city: str = "", state: str = "", pincode: str = "", 
                  latitude: float = 0.0, longitude: float = 0.0, is_default: bool = False):
@@ -1,11 +1,13 @@
 from datetime import datetime
+from typing import Optional
 
 
 class PromoCode:
     def __init__(self, code: str, discount_type: str, discount_value: float,
                  min_order_value: float = 0.0, max_discount: float = 0.0,
                  valid_from: datetime = None, valid_until: datetime = None,
-                 is_active: bool = True):
+                 is_active: bool = True, conditions: Optional[dict] = None,
+                 stackable: bool = False):
         self.code = code
         self.discount_type = discount_type
         self.discount_value = discount_value
@@ -14,8 +16,15 @@ class PromoCode:
         self.valid_from = valid_from
         self.valid_until = valid_until
         self.is_active = is_active
+        # Declarative eligibility rules, see services/PromoRuleCompiler.py
+        self.conditions: dict = conditions or {}
+        # Stackable codes can be applied together with other stackable codes
+        self.stackable = stackable
     
-    def is_valid(self, order_value: float, current_date: datetime = None) -> bool:
+    def has_conditions(self) -> bool:
+        return bool(self.conditions)
+    
+    def is_active_at(self, current_date: datetime = None) -> bool:
         if not self.is_active:
             return False
         
@@ -28,15 +37,18 @@ class PromoCode:
         if self.valid_until and current_date > self.valid_until:
             return False
         
-        if order_value < self.min_order_value:
-            return False
-        
         return True
     
-    def calculate_discount(self, order_value: float) -> float:
-        if not self.is_valid(order_value):
+    def is_valid(self, order_value: float, current_date: datetime = None) -> bool:
+        return self.is_active_at(current_date) and order_value >= self.min_order_value
+    
+    def calculate_discount(self, order_value: float, current_date: datetime = None) -> float:
+        if not self.is_valid(order_value, current_date):
             return 0.0
-        
+        return self.get_discount_amount(order_value)
+    
+    def get_discount_amount(self, order_value: float) -> float:
+        # Discount for an order value already known to be eligible
         if self.discount_type == "percentage":
             discount = order_value * (self.discount_value / 100)
             if self.max_discount > 0:
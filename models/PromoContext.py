@@ -0,0 +1,25 @@
+from typing import Iterable
+
+
+# Everything a promo condition may look at when deciding eligibility
+class PromoContext:
+    __slots__ = ("order_value", "item_count", "product_ids", "category_ids", "is_first_order",
+                 "payment_method", "user_segments", "applied_promo_codes")
+    
+    def __init__(self, order_value: float = 0.0, item_count: int = 0,
+                 product_ids: Iterable[str] = None, category_ids: Iterable[str] = None,
+                 is_first_order: bool = False, payment_method: str = "",
+                 user_segments: Iterable[str] = None, applied_promo_codes: Iterable[str] = None):
+        self.order_value = order_value
+        self.item_count = item_count
+        self.product_ids = frozenset(product_ids or ())
+        self.category_ids = frozenset(category_ids or ())
+        self.is_first_order = is_first_order
+        self.payment_method = payment_method
+        self.user_segments = frozenset(user_segments or ())
+        self.applied_promo_codes = frozenset(code.upper() for code in applied_promo_codes or ())
+    
+    def with_applied_promo_codes(self, applied_promo_codes: Iterable[str]) -> "PromoContext":
+        return PromoContext(self.order_value, self.item_count, self.product_ids, self.category_ids,
+                            self.is_first_order, self.payment_method, self.user_segments,
+                            applied_promo_codes)
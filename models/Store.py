@@ -0,0 +1,45 @@
+from typing import List, Tuple
+
+
+class Store:
+    __slots__ = ("store_id", "name", "latitude", "longitude", "pincodes",
+                 "service_radius_km", "is_active", "service_polygon")
+    
+    def __init__(self, store_id: str, name: str = "", latitude: float = 0.0,
+                 longitude: float = 0.0, pincodes: List[str] = None,
+                 service_radius_km: float = 5.0, is_active: bool = True,
+                 service_polygon: List[Tuple[float, float]] = None):
+        self.store_id = store_id
+        self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+        self.pincodes: List[str] = pincodes or []
+        self.service_radius_km = service_radius_km
+        self.is_active = is_active
+        # (latitude, longitude) vertices; replaces the radius when set
+        self.service_polygon: List[Tuple[float, float]] = service_polygon or []
+    
+    def serves_pincode(self, pincode: str) -> bool:
+        return pincode in self.pincodes
+    
+    def polygon_contains(self, latitude: float, longitude: float) -> bool:
+        inside = False
+        vertices = self.service_polygon
+        for i in range(len(vertices)):
+            lat1, lon1 = vertices[i - 1]
+            lat2, lon2 = vertices[i]
+            if (lat1 > latitude) != (lat2 > latitude):
+                crossing = lon1 + (latitude - lat1) * (lon2 - lon1) / (lat2 - lat1)
+                if longitude < crossing:
+                    inside = not inside
+        return inside
+
+
+# The store chosen to serve a location
+class StoreAssignment:
+    __slots__ = ("store", "distance_km", "eta_band")
+    
+    def __init__(self, store: Store, distance_km: float, eta_band: str):
+        self.store = store
+        self.distance_km = distance_km
+        self.eta_band = eta_band
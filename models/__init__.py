@@ -5,9 +5,13 @@ Models package - Contains all entity classes
 from models.Product import Product, Category
 from models.Cart import Cart, CartItem
 from models.Order import Order, OrderItem
+from models.OrderItemStore import OrderItemStore
 from models.PromoCode import PromoCode
+from models.PromoContext import PromoContext
 from models.UserSettings import UserSettings, Location
 from models.Banner import Banner
+from models.Store import Store, StoreAssignment
+from models.ProductChange import ProductChange
 
 __all__ = [
     'Product',
@@ -16,9 +20,14 @@ __all__ = [
     'Cart',
     'Order',
     'OrderItem',
+    'OrderItemStore',
     'PromoCode',
+    'PromoContext',
     'UserSettings',
     'Location',
-    'Banner'
+    'Banner',
+    'Store',
+    'StoreAssignment',
+    'ProductChange'
 ]
 
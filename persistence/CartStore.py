@@ -0,0 +1,106 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+from models.Cart import Cart
+from factories.CartFactory import CartFactory
+
+
+# Key-value storage of serialized carts, keyed by cart_id. Backends implement
+# write/read/delete of raw bytes; (de)serialization lives in CartFactory.
+class CartStore(ABC):
+    @abstractmethod
+    def write(self, cart_id: str, data: bytes):
+        pass
+
+    @abstractmethod
+    def read(self, cart_id: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def delete(self, cart_id: str):
+        pass
+
+    def save_cart(self, cart: Cart):
+        if cart.cart_id:
+            self.write(cart.cart_id, CartFactory.create_bytes_from_cart(cart))
+
+    def load_cart(self, cart_id: str) -> Optional[Cart]:
+        data = self.read(cart_id)
+        return CartFactory.create_cart_from_bytes(data) if data is not None else None
+
+    def close(self):
+        pass
+
+
+class FileCartStore(CartStore):
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, cart_id: str) -> str:
+        # cart ids come from clients, so keep them from escaping the directory
+        safe_id = "".join(c if c.isalnum() or c in "-_" else f"%{ord(c):02x}" for c in cart_id)
+        return os.path.join(self.directory, f"{safe_id}.json")
+
+    def write(self, cart_id: str, data: bytes):
+        path = self._path(cart_id)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def read(self, cart_id: str) -> Optional[bytes]:
+        try:
+            with open(self._path(cart_id), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, cart_id: str):
+        try:
+            os.remove(self._path(cart_id))
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteCartStore(CartStore):
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS carts (cart_id TEXT PRIMARY KEY, data BLOB NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def write(self, cart_id: str, data: bytes):
+        self.write_many({cart_id: data})
+
+    def write_many(self, carts: dict):
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO carts (cart_id, data, updated_at) VALUES (?, ?, ?)",
+                [(cart_id, data, now) for cart_id, data in carts.items()]
+            )
+            self._connection.commit()
+
+    def read(self, cart_id: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM carts WHERE cart_id = ?", (cart_id,)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def delete(self, cart_id: str):
+        with self._lock:
+            self._connection.execute("DELETE FROM carts WHERE cart_id = ?", (cart_id,))
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,241 @@
+import json
+import mmap
+import os
+import struct
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from models.Product import Category, Product
+
+# Header: magic, format version, reserved, product count, string count,
+# string table bytes, category section bytes
+_CATALOG_MAGIC = b"CATALOG1"
+_CATALOG_HEADER = struct.Struct("<8sIIQQQQ")
+# Numeric columns, one value per product in doc id order
+_NUMERIC_COLUMNS = (("price", "d"), ("discount", "d"), ("discounted_price", "d"),
+                    ("stock", "q"), ("max_quantity", "q"))
+# String columns hold indexes into the string table
+_STRING_COLUMNS = ("product_id", "name", "image", "category_id", "weight", "description",
+                   "images", "categories")
+_IMAGE_SEPARATOR = "\x1f"
+_ALIGNMENT = 8
+
+
+def _pad(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGNMENT)
+
+
+# Read-only compiled catalog. compile() writes fixed-width numeric columns,
+# string-id columns, a product_id lookup order and a string table; opening the
+# file maps it and reads every column in place as a memoryview, so startup
+# costs a header read regardless of catalog size, and processes mapping the
+# same file share its pages through the OS page cache. Products are decoded
+# one at a time by get_product, which CatalogProducts calls on access.
+class CatalogFile:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, _, _, self.product_count, string_count, string_bytes,
+         categories_bytes) = _CATALOG_HEADER.unpack_from(self._data, 0)
+        if magic != _CATALOG_MAGIC:
+            self.close()
+            raise ValueError(f"Not a compiled catalog: {path}")
+        view = memoryview(self._data)
+        self._views: List[memoryview] = [view]
+        position = _CATALOG_HEADER.size
+
+        def column(typecode: str, count: int) -> memoryview:
+            nonlocal position
+            size = count * struct.calcsize(typecode)
+            values = view[position:position + size].cast(typecode)
+            self._views.append(values)
+            position += size + len(_pad(size))
+            return values
+
+        for name, typecode in _NUMERIC_COLUMNS:
+            setattr(self, name, column(typecode, self.product_count))
+        # Doc ids ordered by product_id bytes, for find_doc_id
+        self._sorted_ids = column("I", self.product_count)
+        self._string_columns: Dict[str, memoryview] = {
+            name: column("I", self.product_count) for name in _STRING_COLUMNS}
+        self._string_offsets = column("I", string_count + 1)
+        self._blob_start = position
+        position += string_bytes + len(_pad(string_bytes))
+        self._categories_json = bytes(view[position:position + categories_bytes])
+
+    def __len__(self) -> int:
+        return self.product_count
+
+    @staticmethod
+    def compile(path: str, products: Sequence[Product], categories: Sequence[Category] = None):
+        strings: Dict[str, int] = {}
+
+        def sid(value: str) -> int:
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings)
+            return index
+
+        string_ids = {name: [] for name in _STRING_COLUMNS}
+        for product in products:
+            string_ids["product_id"].append(sid(product.product_id))
+            string_ids["name"].append(sid(product.name))
+            string_ids["image"].append(sid(product.image))
+            string_ids["category_id"].append(sid(product.category_id))
+            string_ids["weight"].append(sid(product.weight))
+            string_ids["description"].append(sid(product.description))
+            string_ids["images"].append(sid(_IMAGE_SEPARATOR.join(product.images)))
+            string_ids["categories"].append(
+                sid(json.dumps(product.categories, separators=(",", ":")) if product.categories else ""))
+
+        encoded = [value.encode("utf-8") for value in strings]
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        product_ids = [encoded[index] for index in string_ids["product_id"]]
+        sorted_ids = sorted(range(len(products)), key=product_ids.__getitem__)
+        blob = b"".join(encoded)
+        categories_json = json.dumps(
+            [[c.category_id, c.name, c.icon, c.image, c.parent_id] for c in categories or []],
+            separators=(",", ":")).encode("utf-8")
+
+        count = len(products)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_CATALOG_HEADER.pack(_CATALOG_MAGIC, 1, 0, count, len(strings), len(blob),
+                                         len(categories_json)))
+
+            def write_column(typecode: str, values):
+                packed = struct.pack(f"<{len(values)}{typecode}", *values)
+                f.write(packed)
+                f.write(_pad(len(packed)))
+
+            write_column("d", [p.price for p in products])
+            write_column("d", [p.discount for p in products])
+            write_column("d", [p.get_discounted_price() for p in products])
+            write_column("q", [p.stock for p in products])
+            write_column("q", [p.max_quantity for p in products])
+            write_column("I", sorted_ids)
+            for name in _STRING_COLUMNS:
+                write_column("I", string_ids[name])
+            write_column("I", offsets)
+            f.write(blob)
+            f.write(_pad(len(blob)))
+            f.write(categories_json)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def _string_bytes(self, index: int) -> bytes:
+        offsets, start = self._string_offsets, self._blob_start
+        return self._data[start + offsets[index]:start + offsets[index + 1]]
+
+    def _string(self, index: int) -> str:
+        return str(self._string_bytes(index), "utf-8")
+
+    def get_string_column(self, name: str) -> List[str]:
+        # Each distinct string is decoded once
+        decoded: Dict[int, str] = {}
+        values = []
+        for index in self._string_columns[name]:
+            value = decoded.get(index)
+            if value is None:
+                value = decoded[index] = self._string(index)
+            values.append(value)
+        return values
+
+    def get_product_id(self, doc_id: int) -> str:
+        return self._string(self._string_columns["product_id"][doc_id])
+
+    def find_doc_id(self, product_id: str) -> Optional[int]:
+        key = product_id.encode("utf-8")
+        product_ids = self._string_columns["product_id"]
+        sorted_ids = self._sorted_ids
+        low, high = 0, self.product_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string_bytes(product_ids[sorted_ids[middle]]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.product_count:
+            doc_id = sorted_ids[low]
+            if self._string_bytes(product_ids[doc_id]) == key:
+                return doc_id
+        return None
+
+    def get_product(self, doc_id: int) -> Product:
+        columns = self._string_columns
+        images = self._string(columns["images"][doc_id])
+        categories = self._string(columns["categories"][doc_id])
+        return Product(
+            product_id=self._string(columns["product_id"][doc_id]),
+            name=self._string(columns["name"][doc_id]),
+            image=self._string(columns["image"][doc_id]),
+            category_id=self._string(columns["category_id"][doc_id]),
+            price=self.price[doc_id],
+            discount=self.discount[doc_id],
+            weight=self._string(columns["weight"][doc_id]),
+            description=self._string(columns["description"][doc_id]),
+            stock=self.stock[doc_id],
+            max_quantity=self.max_quantity[doc_id],
+            images=images.split(_IMAGE_SEPARATOR) if images else None,
+            categories=json.loads(categories) if categories else None)
+
+    def get_categories(self) -> List[Category]:
+        return [Category(*fields) for fields in json.loads(self._categories_json)]
+
+    def close(self):
+        # Views must be released before the map can close
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        self._data.close()
+        self._file.close()
+
+
+# Product list backed by a CatalogFile. A product is decoded on first access
+# and kept, so updates made through ProductService stick; products added
+# after opening are held in memory after the file's doc ids. scan() reads
+# products for one-off passes (index builds) without keeping them.
+class CatalogProducts:
+    def __init__(self, catalog_file: CatalogFile):
+        self.catalog_file = catalog_file
+        self._loaded: Dict[int, Product] = {}
+        self._added: List[Product] = []
+
+    def __len__(self) -> int:
+        return self.catalog_file.product_count + len(self._added)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[doc_id] for doc_id in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        file_count = self.catalog_file.product_count
+        if index >= file_count:
+            return self._added[index - file_count]
+        if index < 0:
+            raise IndexError(index)
+        product = self._loaded.get(index)
+        if product is None:
+            product = self._loaded[index] = self.catalog_file.get_product(index)
+        return product
+
+    def __iter__(self) -> Iterator[Product]:
+        for doc_id in range(len(self)):
+            yield self[doc_id]
+
+    def append(self, product: Product):
+        self._added.append(product)
+
+    @property
+    def loaded_count(self) -> int:
+        return len(self._loaded)
+
+    def scan(self, start: int = 0) -> Iterator[Tuple[int, Product]]:
+        file_count = self.catalog_file.product_count
+        for doc_id in range(start, file_count):
+            product = self._loaded.get(doc_id)
+            yield doc_id, product if product is not None else self.catalog_file.get_product(doc_id)
+        yield from enumerate(islice(self._added, max(0, start - file_count), None), max(start, file_count))
@@ -0,0 +1,272 @@
+import gc
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Sequence, Tuple
+from models.Order import Order, OrderItem
+from factories.OrderFactory import OrderFactory
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Log record: payload length and CRC32, then a JSON event
+_RECORD_HEADER = struct.Struct("<II")
+
+# Snapshot: header, then fixed-width order and item records, then the string
+# table as NUL-separated UTF-8. Every record field is an index into the
+# string table or a number, so the file can be mapped and read in place.
+_SNAPSHOT_MAGIC = b"ORDSNAP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sIQQQQQ")
+# order_id, user_id, order_date (us since epoch), status, total_amount, delivery_address,
+# payment_method, subtotal, delivery_charges, discount_amount, applied_promo_code, item_count
+_ORDER_RECORD = struct.Struct("<IIqIdIIdddII")
+# product_id, quantity, unit_price, product_name, product_image, weight
+_ITEM_RECORD = struct.Struct("<IidIII")
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Offset-aware dates are restored as naive UTC, from the snapshot and the log alike
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _to_micros(value: datetime) -> int:
+    return (_naive_utc(value) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+# Append-only local log of order events ("created" with the full order,
+# "status" with the new status) plus periodic compact snapshots. A snapshot
+# starts a new log generation, so a restart reads the snapshot and replays
+# only the events appended since. Order dates are restored as naive
+# datetimes, offset-aware ones converted to UTC, whether they come from the
+# snapshot or the log.
+#
+# Files in `directory`: orders.snapshot and orders-<generation>.log. A torn
+# record at the end of the log (crash mid-append) is detected by its CRC and
+# cut off on open.
+class OrderLog:
+    def __init__(self, directory: str, snapshot_interval: int = 100000, fsync: bool = False):
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.generation = self._read_snapshot_generation()
+        self.events_since_snapshot = 0
+        self._remove_stale_logs()
+        self._log_file = None
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.directory, "orders.snapshot")
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"orders-{generation}.log")
+
+    def _read_snapshot_generation(self) -> int:
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                header = f.read(_SNAPSHOT_HEADER.size)
+        except FileNotFoundError:
+            return 0
+        magic, _, generation = _SNAPSHOT_HEADER.unpack(header)[:3]
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError(f"Not an order snapshot: {self.snapshot_path}")
+        return generation
+
+    def _remove_stale_logs(self):
+        current = self._log_path(self.generation)
+        for path in glob.glob(os.path.join(self.directory, "orders-*.log")):
+            if path != current:
+                os.remove(path)
+
+    def _scan_log(self) -> Tuple[List[dict], int]:
+        path = self._log_path(self.generation)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return [], 0
+        events = []
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position, end = 0, len(data)
+            while position + _RECORD_HEADER.size <= end:
+                length, checksum = _RECORD_HEADER.unpack_from(data, position)
+                start = position + _RECORD_HEADER.size
+                payload = data[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                events.append(json.loads(payload))
+                position = start + length
+        return events, position
+
+    def load(self) -> List[Order]:
+        orders = self.read_snapshot()
+        events, valid_end = self._scan_log()
+        self._open_log(valid_end)
+        order_map: Dict[str, Order] = {order.order_id: order for order in orders}
+        for event in events:
+            if event["type"] == "created":
+                order = OrderFactory.create_from_dict(event["order"])
+                order.order_date = _naive_utc(order.order_date)
+                if order.order_id not in order_map:
+                    order_map[order.order_id] = order
+                    orders.append(order)
+            elif event["type"] == "status":
+                order = order_map.get(event["order_id"])
+                if order is not None:
+                    order.status = event["status"]
+        self.events_since_snapshot = len(events)
+        return orders
+
+    def _open_log(self, valid_end: int = None):
+        if self._log_file is not None:
+            return
+        if valid_end is None:
+            valid_end = self._scan_log()[1]
+        path = self._log_path(self.generation)
+        self._log_file = open(path, "ab")
+        # Cut off a torn record left by a crash mid-append
+        if self._log_file.tell() != valid_end:
+            self._log_file.truncate(valid_end)
+            self._log_file.seek(valid_end)
+
+    def _append(self, event: dict):
+        payload = json.dumps(event, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._open_log()
+            self._log_file.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._log_file.flush()
+            if self.fsync:
+                os.fsync(self._log_file.fileno())
+            self.events_since_snapshot += 1
+
+    def append_created(self, order: Order):
+        self._append({"type": "created", "order": OrderFactory.create_dict_from_order(order)})
+
+    def append_status(self, order_id: str, status: str):
+        self._append({"type": "status", "order_id": order_id, "status": status})
+
+    def needs_snapshot(self) -> bool:
+        return 0 < self.snapshot_interval <= self.events_since_snapshot
+
+    def write_snapshot(self, orders: List[Order]):
+        # Held throughout so no append can land in the generation being retired
+        with self._lock:
+            self._write_snapshot(orders)
+
+    @staticmethod
+    def encode_snapshot(orders: Sequence[Order], generation: int = 0) -> bytes:
+        strings: Dict[str, int] = {}
+
+        def sid(value: str) -> int:
+            index = strings.get(value)
+            if index is None:
+                if "\0" in value:
+                    raise ValueError(f"Order snapshot strings may not contain NUL: {value!r}")
+                index = strings[value] = len(strings)
+            return index
+
+        order_records = bytearray()
+        item_records = bytearray()
+        item_count = 0
+        for order in orders:
+            order_records += _ORDER_RECORD.pack(
+                sid(order.order_id), sid(order.user_id), _to_micros(order.order_date), sid(order.status),
+                order.total_amount, sid(order.delivery_address), sid(order.payment_method),
+                order.subtotal, order.delivery_charges, order.discount_amount,
+                sid(order.applied_promo_code), len(order.order_items))
+            for item in order.order_items:
+                item_records += _ITEM_RECORD.pack(
+                    sid(item.product_id), item.quantity, item.unit_price,
+                    sid(item.product_name), sid(item.product_image), sid(item.weight))
+            item_count += len(order.order_items)
+        string_table = "\0".join(strings).encode("utf-8")
+        header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, 1, generation, len(orders), item_count,
+                                       len(strings), len(string_table))
+        return b"".join((header, order_records, item_records, string_table))
+
+    def _write_snapshot(self, orders: List[Order]):
+        generation = self.generation + 1
+        snapshot = self.encode_snapshot(orders, generation)
+        # The new generation's log exists before the snapshot that names it
+        open(self._log_path(generation), "ab").close()
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(snapshot)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        previous_log = self._log_path(self.generation)
+        self.generation = generation
+        self.events_since_snapshot = 0
+        if os.path.exists(previous_log):
+            os.remove(previous_log)
+
+    def read_snapshot(self) -> List[Order]:
+        if not os.path.exists(self.snapshot_path):
+            return []
+        with open(self.snapshot_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic = _SNAPSHOT_HEADER.unpack_from(data, 0)[0]
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError(f"Not an order snapshot: {self.snapshot_path}")
+            return self.decode_snapshot(data)
+
+    @staticmethod
+    def decode_snapshot(data) -> List[Order]:
+        # data is any buffer holding an encoded snapshot: a mapped file or shared memory
+        (_, _, _, order_count, item_count,
+         string_count, string_bytes) = _SNAPSHOT_HEADER.unpack_from(data, 0)
+        view = memoryview(data)
+        try:
+            orders_start = _SNAPSHOT_HEADER.size
+            items_start = orders_start + order_count * _ORDER_RECORD.size
+            strings_start = items_start + item_count * _ITEM_RECORD.size
+            strings = str(view[strings_start:strings_start + string_bytes], "utf-8").split("\0")
+            if len(strings) != string_count and string_count:
+                raise ValueError("Corrupt order snapshot")
+            order_rows = _ORDER_RECORD.iter_unpack(bytes(view[orders_start:items_start]))
+            item_rows = _ITEM_RECORD.iter_unpack(bytes(view[items_start:strings_start]))
+        finally:
+            view.release()
+
+        # Nothing built here is garbage, so skip the cyclic collector's passes over it
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            orders = []
+            for (order_id, user_id, order_date, status, total_amount, delivery_address, payment_method,
+                 subtotal, delivery_charges, discount_amount, applied_promo_code, count) in order_rows:
+                order_id = strings[order_id]
+                order_items = []
+                for _ in range(count):
+                    product_id, quantity, unit_price, name, image, weight = next(item_rows)
+                    order_items.append(OrderItem(order_id, strings[product_id], quantity, unit_price,
+                                                 strings[name], strings[image], strings[weight]))
+                order = Order(order_id, strings[user_id], _from_micros(order_date), strings[status],
+                              total_amount, strings[delivery_address], strings[payment_method], order_items)
+                order.subtotal = subtotal
+                order.delivery_charges = delivery_charges
+                order.discount_amount = discount_amount
+                order.applied_promo_code = strings[applied_promo_code]
+                orders.append(order)
+        finally:
+            if collecting:
+                gc.enable()
+        return orders
+
+    def close(self):
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
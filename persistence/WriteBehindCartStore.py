@@ -0,0 +1,115 @@
+import threading
+from typing import Dict, Optional, Union
+from models.Cart import Cart
+from factories.CartFactory import CartFactory
+from persistence.CartStore import CartStore
+
+_DELETED = object()
+
+
+# Write-behind wrapper around another CartStore. save_cart only snapshots the
+# cart into memory; a background thread writes the latest snapshot per cart
+# every flush_interval seconds, so a burst of quantity taps on one cart turns
+# into a single disk write and callers never wait on I/O.
+class WriteBehindCartStore(CartStore):
+    def __init__(self, backing_store: CartStore, flush_interval: float = 1.0):
+        self.backing_store = backing_store
+        self.flush_interval = flush_interval
+        self.writes_requested = 0
+        self.writes_flushed = 0
+        self.failed_writes = 0
+        self._pending: Dict[str, Union[dict, bytes, object]] = {}
+        # Taken out of _pending by the running flush; still served by read()
+        # until the backing store has them
+        self._in_flight: Dict[str, Union[dict, bytes, object]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="cart-write-behind", daemon=True)
+        self._thread.start()
+
+    def _queue(self, cart_id: str, value):
+        with self._lock:
+            self._pending[cart_id] = value
+            self.writes_requested += 1
+
+    def save_cart(self, cart: Cart):
+        if cart.cart_id:
+            self._queue(cart.cart_id, CartFactory.create_dict_from_cart(cart))
+
+    def write(self, cart_id: str, data: bytes):
+        self._queue(cart_id, data)
+
+    def delete(self, cart_id: str):
+        self._queue(cart_id, _DELETED)
+
+    def read(self, cart_id: str) -> Optional[bytes]:
+        with self._lock:
+            pending = self._pending.get(cart_id)
+            if pending is None:
+                pending = self._in_flight.get(cart_id)
+        if pending is _DELETED:
+            return None
+        if isinstance(pending, dict):
+            return CartFactory.create_bytes_from_dict(pending)
+        if pending is not None:
+            return pending
+        return self.backing_store.read(cart_id)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._in_flight = pending
+            if not pending:
+                return
+            try:
+                self._write_pending(pending)
+            finally:
+                with self._lock:
+                    self._in_flight = {}
+
+    def _write_pending(self, pending: dict):
+        writes = {}
+        for cart_id, value in pending.items():
+            if value is _DELETED:
+                self._apply(pending, cart_id, lambda: self.backing_store.delete(cart_id))
+            else:
+                writes[cart_id] = value if isinstance(value, bytes) else CartFactory.create_bytes_from_dict(value)
+
+        write_many = getattr(self.backing_store, "write_many", None)
+        if write_many and writes:
+            self._apply(pending, None, lambda: write_many(writes), writes)
+        else:
+            for cart_id, data in writes.items():
+                self._apply(pending, cart_id, lambda: self.backing_store.write(cart_id, data))
+
+    def _apply(self, pending: dict, cart_id: Optional[str], operation, batch: dict = None):
+        cart_ids = list(batch) if batch is not None else [cart_id]
+        try:
+            operation()
+            self.writes_flushed += len(cart_ids)
+        except Exception:
+            # Keep the value for the next flush unless a newer one was queued meanwhile
+            self.failed_writes += len(cart_ids)
+            with self._lock:
+                for failed_id in cart_ids:
+                    self._pending.setdefault(failed_id, pending[failed_id])
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+        self.backing_store.close()
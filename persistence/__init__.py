@@ -0,0 +1,18 @@
+"""
+Persistence package - Contains local storage backends for service state
+"""
+
+from persistence.CartStore import CartStore, FileCartStore, SQLiteCartStore
+from persistence.WriteBehindCartStore import WriteBehindCartStore
+from persistence.OrderLog import OrderLog
+from persistence.CatalogFile import CatalogFile, CatalogProducts
+
+__all__ = [
+    'CartStore',
+    'FileCartStore',
+    'SQLiteCartStore',
+    'WriteBehindCartStore',
+    'OrderLog',
+    'CatalogFile',
+    'CatalogProducts'
+]
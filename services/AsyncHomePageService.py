@@ -0,0 +1,105 @@
+import asyncio
+from typing import Dict, List
+from models.Banner import Banner
+from models.Cart import CartItem
+from models.Product import Product, Category
+from services.AsyncProductService import AsyncProductService
+from services.AsyncUserService import AsyncUserService
+from services.CartService import CartService
+from services.HomePageCache import HomePageCache
+
+
+# Async home page render. Sections are fetched concurrently, each under its own
+# timeout; a section that times out or fails is served from its last good
+# value (or empty) and named in "degraded_sections" instead of failing or
+# delaying the page. Shared sections use the same HomePageCache entries as a
+# HomePageService without a change feed; a feed-mode HomePageService keeps its
+# product sections under separate keys, so either kind can back one cache.
+class AsyncHomePageService:
+    def __init__(self, product_service: AsyncProductService,
+                 cart_service: CartService = None,
+                 user_service: AsyncUserService = None,
+                 banners: List[Banner] = None,
+                 section_cache: HomePageCache = None,
+                 default_timeout: float = 0.5,
+                 section_timeouts: Dict[str, float] = None):
+        self.product_service = product_service
+        self.cart_service = cart_service or CartService()
+        self.user_service = user_service
+        self.banners = banners or []
+        self.section_cache = section_cache or HomePageCache()
+        self.default_timeout = default_timeout
+        self.section_timeouts = section_timeouts or {}
+        self._last_good: Dict[str, object] = {}
+    
+    async def get_active_banners(self) -> List[Banner]:
+        async def build():
+            return [b for b in self.banners if b.is_valid()]
+        return list(await self.section_cache.get_section_async(
+            "banners", self.section_cache.get_version("banners"), build))
+    
+    async def get_categories(self) -> List[Category]:
+        return list(await self.section_cache.get_section_async(
+            "categories", self.product_service.category_version,
+            self.product_service.get_all_categories))
+    
+    async def get_deals_products(self, limit: int = 20) -> List[Product]:
+        return list(await self.section_cache.get_section_async(
+            f"deals:{limit}", self.product_service.catalog_version,
+            lambda: self.product_service.get_top_discounted_products(limit)))
+    
+    async def get_featured_products(self, limit: int = 20) -> List[Product]:
+        return list(await self.section_cache.get_section_async(
+            f"featured:{limit}",
+            (self.product_service.catalog_version, self.product_service.popularity_version),
+            lambda: self.product_service.get_products_sorted_by_popularity(limit)))
+    
+    async def get_quick_reorder_section(self) -> List[CartItem]:
+        if not self.user_service:
+            return []
+        return await self.user_service.get_quick_reorder_items()
+    
+    async def get_recently_viewed_products(self, limit: int = 10) -> List[Product]:
+        if not self.user_service:
+            return []
+        return await self.user_service.get_previously_ordered_products(limit)
+    
+    async def _fetch_section(self, name: str, section, degraded: List[str]):
+        try:
+            value = await asyncio.wait_for(section, self.section_timeouts.get(name, self.default_timeout))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            degraded.append(name)
+            return self._last_good.get(name, [])
+        self._last_good[name] = value
+        return value
+    
+    async def get_homepage_data(self, user_id: str = None) -> Dict:
+        sections = {
+            "banners": self.get_active_banners(),
+            "categories": self.get_categories(),
+            "deals_products": self.get_deals_products(20),
+            "featured_products": self.get_featured_products(20),
+        }
+        if self.user_service:
+            sections["quick_reorder"] = self.get_quick_reorder_section()
+            sections["recently_viewed"] = self.get_recently_viewed_products(10)
+        
+        degraded: List[str] = []
+        values = await asyncio.gather(*(self._fetch_section(name, section, degraded)
+                                        for name, section in sections.items()))
+        fetched = dict(zip(sections, values))
+        data = {
+            "banners": fetched["banners"],
+            "categories": fetched["categories"],
+            "top_deals": fetched["deals_products"][:10],
+            "deals_products": fetched["deals_products"],
+            "featured_products": fetched["featured_products"],
+            "cart_item_count": self.cart_service.cart.get_item_count()
+        }
+        if self.user_service:
+            data["quick_reorder"] = fetched["quick_reorder"]
+            data["recently_viewed"] = fetched["recently_viewed"]
+        data["degraded_sections"] = [name for name in sections if name in degraded]
+        return data
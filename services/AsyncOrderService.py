@@ -0,0 +1,32 @@
+from typing import List, Optional
+from models.Order import Order, OrderItem
+from indexes.UserOrderStats import UserOrderStats
+from services.AsyncServiceAdapter import AsyncServiceAdapter
+from services.OrderService import OrderService
+
+
+class AsyncOrderService(AsyncServiceAdapter):
+    def __init__(self, order_service: OrderService, executor=None, offload: bool = True):
+        super().__init__(order_service, executor, offload)
+        self.order_service = order_service
+
+    async def get_order_by_id(self, order_id: str) -> Optional[Order]:
+        return await self._call(self.order_service.get_order_by_id, order_id)
+
+    async def get_user_orders_page(self, user_id: str, offset: int = 0, limit: int = 20) -> List[Order]:
+        return await self._call(self.order_service.get_user_orders_page, user_id, offset, limit)
+
+    async def get_recent_orders(self, user_id: str, limit: int = 5) -> List[Order]:
+        return await self._call(self.order_service.get_recent_orders, user_id, limit)
+
+    async def get_user_stats(self, user_id: str) -> UserOrderStats:
+        return await self._call(self.order_service.get_user_stats, user_id)
+
+    async def get_previously_ordered_products(self, user_id: str) -> List[str]:
+        return await self._call(self.order_service.get_previously_ordered_products, user_id)
+
+    async def get_quick_reorder_items(self, user_id: str) -> List[OrderItem]:
+        return await self._call(self.order_service.get_quick_reorder_items, user_id)
+
+    async def search_orders(self, user_id: str, query: str, **options) -> List[Order]:
+        return await self._call(self.order_service.search_orders, user_id, query, **options)
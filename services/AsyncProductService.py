@@ -0,0 +1,49 @@
+from typing import List, Optional
+from models.Product import Product, Category
+from services.AsyncServiceAdapter import AsyncServiceAdapter
+from services.ProductService import ProductService
+
+
+class AsyncProductService(AsyncServiceAdapter):
+    def __init__(self, product_service: ProductService, executor=None, offload: bool = True):
+        super().__init__(product_service, executor, offload)
+        self.product_service = product_service
+
+    @property
+    def catalog_version(self) -> int:
+        return self.product_service.catalog_version
+
+    @property
+    def popularity_version(self) -> int:
+        return self.product_service.popularity_version
+
+    @property
+    def category_version(self) -> int:
+        return self.product_service.category_version
+
+    async def get_product_by_id(self, product_id: str) -> Optional[Product]:
+        return await self._call(self.product_service.get_product_by_id, product_id)
+
+    async def get_products_by_ids(self, product_ids: List[str]) -> List[Product]:
+        get_product = self.product_service.get_product_by_id
+        return await self._call(lambda: [p for pid in product_ids if (p := get_product(pid))])
+
+    async def get_all_categories(self) -> List[Category]:
+        return await self._call(self.product_service.get_all_categories)
+
+    async def get_top_discounted_products(self, limit: int = 10, offset: int = 0) -> List[Product]:
+        return await self._call(self.product_service.get_top_discounted_products, limit, offset)
+
+    async def get_products_sorted_by_popularity(self, limit: int = None, offset: int = 0) -> List[Product]:
+        return await self._call(self.product_service.get_products_sorted_by_popularity, limit, offset)
+
+    async def filter_available_products(self, products: List[Product] = None,
+                                        limit: int = None) -> List[Product]:
+        return await self._call(self.product_service.filter_available_products, products, limit)
+
+    async def search_products(self, query: str, limit: int = None,
+                              available_only: bool = False) -> List[Product]:
+        return await self._call(self.product_service.search_products, query, limit, available_only)
+
+    async def find_products(self, **filters) -> List[Product]:
+        return await self._call(self.product_service.find_products, **filters)
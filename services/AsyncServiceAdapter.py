@@ -0,0 +1,20 @@
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+
+
+# Base for the async service interfaces. The default implementations wrap a
+# synchronous service and run its calls on an executor so a blocking storage
+# backend never stalls the event loop; pass offload=False for purely
+# in-memory services, where the thread hop costs more than the call.
+class AsyncServiceAdapter:
+    def __init__(self, service, executor: Executor = None, offload: bool = True):
+        self.service = service
+        self.executor = executor
+        self.offload = offload
+
+    async def _call(self, function, *args, **kwargs):
+        if not self.offload:
+            return function(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
@@ -0,0 +1,53 @@
+from typing import List
+from models.Cart import CartItem
+from models.Order import Order
+from models.Product import Product
+from services.AsyncOrderService import AsyncOrderService
+from services.AsyncProductService import AsyncProductService
+from services.UserService import UserService
+
+
+# Async counterpart of UserService's read paths, built on the async order and
+# product interfaces so each step can sit behind its own storage backend
+class AsyncUserService:
+    def __init__(self, user_service: UserService, order_service: AsyncOrderService,
+                 product_service: AsyncProductService):
+        self.user_service = user_service
+        self.user_id = user_service.user_id
+        self.order_service = order_service
+        self.product_service = product_service
+
+    async def get_order_history(self, limit: int = 20) -> List[Order]:
+        return await self.order_service.get_user_orders_page(self.user_id, 0, limit)
+
+    async def get_previously_ordered_products(self, limit: int = None) -> List[Product]:
+        product_ids = await self.order_service.get_previously_ordered_products(self.user_id)
+        products = await self.product_service.get_products_by_ids(product_ids)
+        return products[:limit] if limit else products
+
+    async def get_quick_reorder_items(self) -> List[CartItem]:
+        order_items = await self.order_service.get_quick_reorder_items(self.user_id)
+        products = await self.product_service.get_products_by_ids([item.product_id for item in order_items])
+        product_map = {product.product_id: product for product in products}
+        cart_items = []
+        for order_item in order_items:
+            product = product_map.get(order_item.product_id)
+            if product and product.is_available():
+                cart_items.append(CartItem(
+                    product_id=product.product_id,
+                    quantity=order_item.quantity,
+                    unit_price=product.get_discounted_price(),
+                    product_name=product.name,
+                    product_image=product.image,
+                    weight=product.weight
+                ))
+        return cart_items
+
+    async def get_order_stats(self) -> dict:
+        stats = await self.order_service.get_user_stats(self.user_id)
+        return {
+            "total_orders": stats.total_orders,
+            "total_spent": stats.get_total_spent(),
+            "pending_orders": stats.get_status_count("pending"),
+            "delivered_orders": stats.get_status_count("delivered")
+        }
@@ -0,0 +1,88 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from models.Order import Order
+from persistence.CatalogFile import CatalogFile
+from persistence.OrderLog import OrderLog
+
+# Catalog files opened in this worker process, kept mapped for later shards.
+# Keyed by modification time too, so a recompiled catalog is reopened.
+_worker_catalogs: Dict[Tuple[str, int], CatalogFile] = {}
+
+
+def _run_catalog_shard(path: str, task: Callable[..., Any], start: int, end: int, args: tuple) -> Any:
+    key = (path, os.stat(path).st_mtime_ns)
+    catalog_file = _worker_catalogs.get(key)
+    if catalog_file is None:
+        catalog_file = _worker_catalogs[key] = CatalogFile(path)
+    return task(catalog_file, start, end, *args)
+
+
+def _run_order_shard(name: str, offset: int, size: int, task: Callable[..., Any], args: tuple) -> Any:
+    segment = SharedMemory(name=name)
+    view = segment.buf[offset:offset + size]
+    try:
+        orders = OrderLog.decode_snapshot(view)
+    finally:
+        view.release()
+        segment.close()
+    return task(orders, *args)
+
+
+# Runs catalog-wide and order-wide batch jobs on a process pool. The input is
+# split into contiguous shards and no Product or Order objects are pickled to
+# the workers: a catalog shard is a doc id range over the compiled catalog
+# file, which each worker maps once, and order shards are encoded in the order
+# snapshot format into one shared memory segment. Tasks are module-level
+# functions, called as task(catalog_file, start, end, *args) or
+# task(orders, *args), and map_* returns their partial results in shard order
+# for the caller to merge.
+class BatchExecutor:
+    def __init__(self, max_workers: int = None, shards_per_worker: int = 4, mp_context=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # A few shards per worker even out shards that cost more than others
+        self.shards_per_worker = shards_per_worker
+        # Workers must share the parent's resource tracker; one of their own would
+        # report the segments they attach to as leaked and unlink them on exit
+        resource_tracker.ensure_running()
+        self._pool = ProcessPoolExecutor(self.max_workers, mp_context=mp_context)
+
+    def __enter__(self) -> "BatchExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def shard_ranges(self, count: int) -> List[Tuple[int, int]]:
+        shard_count = max(1, min(count, self.max_workers * self.shards_per_worker))
+        bounds = [count * shard // shard_count for shard in range(shard_count + 1)]
+        return list(zip(bounds, bounds[1:]))
+
+    def map_catalog(self, catalog_file: CatalogFile, task: Callable[..., Any], *args) -> List[Any]:
+        futures = [self._pool.submit(_run_catalog_shard, catalog_file.path, task, start, end, args)
+                   for start, end in self.shard_ranges(len(catalog_file))]
+        return [future.result() for future in futures]
+
+    def map_orders(self, orders: Sequence[Order], task: Callable[..., Any], *args) -> List[Any]:
+        # Shards are encoded separately, each with its own string table, so a
+        # worker decodes its own shard and nothing else
+        shards = [OrderLog.encode_snapshot(orders[start:end])
+                  for start, end in self.shard_ranges(len(orders))]
+        segment = SharedMemory(create=True, size=sum(map(len, shards)))
+        try:
+            futures = []
+            offset = 0
+            for shard in shards:
+                segment.buf[offset:offset + len(shard)] = shard
+                futures.append(self._pool.submit(_run_order_shard, segment.name, offset, len(shard),
+                                                 task, args))
+                offset += len(shard)
+            return [future.result() for future in futures]
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def close(self):
+        self._pool.shutdown()
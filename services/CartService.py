@@ -1,25 +1,150 @@
-from typing import List
+from typing import Iterable, List, Optional, Set
 from models.Cart import Cart, CartItem
+from models.Order import Order
+from models.ProductChange import ProductChange
 from models.Product import Product
 from models.PromoCode import PromoCode
+from models.PromoContext import PromoContext
 from factories.CartFactory import CartFactory
+from factories.OrderFactory import OrderFactory
+from persistence.CartStore import CartStore
+from services.InventoryService import InventoryService
+from services.ProductChangeFeed import ProductChangeFeed
+from services.ProductService import ProductService
+from services.PromoCodeService import PromoCodeService
+from services.PromoRuleCompiler import PromoRuleCompiler, Rule
+from services.StockReservationService import StockReservationService
 
 
 class CartService:
-    def __init__(self, cart: Cart = None):
-        self.cart = cart or CartFactory.create_cart()
+    def __init__(self, cart: Cart = None, cart_store: CartStore = None,
+                 promo_code_service: PromoCodeService = None,
+                 product_service: ProductService = None,
+                 inventory_service: InventoryService = None, store_id: str = None,
+                 reservation_service: StockReservationService = None):
+        self.cart = CartFactory.create_cart()
+        self.cart_store = cart_store
+        self.promo_code_service = promo_code_service
+        self.product_service = product_service
+        # Stock is checked against this store when both are set
+        self.inventory_service = inventory_service
+        self.store_id = store_id
+        self.reservation_service = reservation_service
+        self.reservation_id: Optional[str] = None
+        # Lines whose product no longer has enough stock, as reported by the change feed
+        self.unavailable_product_ids: Set[str] = set()
+        # User-level promo facts from the last build_promo_context call
+        self._is_first_order = False
+        self._payment_method = ""
+        self._user_segments: frozenset = frozenset()
+        # Set by watch_product_changes; subscribed for the cart's product ids only
+        self.change_feed: Optional[ProductChangeFeed] = None
+        self._watched_product_ids: frozenset = frozenset()
+        if cart:
+            self.set_cart(cart)
+    
+    def _persist(self):
+        if self.cart_store:
+            self.cart_store.save_cart(self.cart)
+    
+    def _on_cart_changed(self):
+        # A held reservation no longer matches the cart's quantities
+        self.release_stock()
+        self._revalidate_promos()
+        self._sync_watched_products()
+        self._persist()
+    
+    def watch_product_changes(self, change_feed: ProductChangeFeed):
+        self.unwatch_product_changes()
+        self.change_feed = change_feed
+        self._sync_watched_products()
+    
+    def unwatch_product_changes(self):
+        if self.change_feed:
+            self.change_feed.unsubscribe(self.on_product_changes)
+        self.change_feed = None
+        self._watched_product_ids = frozenset()
+    
+    def _sync_watched_products(self):
+        # An empty cart holds no subscription, so a dropped cart isn't kept alive by the feed
+        if not self.change_feed:
+            return
+        product_ids = frozenset(self.cart.items)
+        if product_ids == self._watched_product_ids:
+            return
+        if product_ids:
+            self.change_feed.subscribe(self.on_product_changes, product_ids)
+        else:
+            self.change_feed.unsubscribe(self.on_product_changes)
+        self._watched_product_ids = product_ids
+    
+    def on_product_changes(self, changes: List[ProductChange]):
+        repriced = False
+        for change in changes:
+            item = self.cart.items.get(change.product_id)
+            if item is None:
+                continue
+            if "price" in change.changed or "discount" in change.changed:
+                repriced = self.cart.update_item_price(change.product_id, change.discounted_price) or repriced
+            if change.stock < item.quantity:
+                self.unavailable_product_ids.add(change.product_id)
+            else:
+                self.unavailable_product_ids.discard(change.product_id)
+        if repriced:
+            self._revalidate_promos()
+            self._persist()
+    
+    def restore_cart(self, cart_id: str) -> bool:
+        if not self.cart_store:
+            return False
+        cart = self.cart_store.load_cart(cart_id)
+        if cart is None:
+            return False
+        self.set_cart(cart)
+        return True
+    
+    def set_cart(self, cart: Cart):
+        # A cart loaded from a store carries its promo codes only; they are resolved
+        # through the promo code service and applied again so the discount tracks
+        # the subtotal as it would on the live cart. Without the service the codes
+        # and stored discount are kept as they are.
+        self.cart = cart
+        self._sync_watched_products()
+        if not self.promo_code_service:
+            return
+        codes = [code for code in cart.applied_promo_code.split(",") if code]
+        cart.remove_promo()
+        promo_codes = [promo_code for code in codes
+                       if (promo_code := self.promo_code_service.get_promo_code_by_code(code))]
+        for promo_code in promo_codes:
+            cart.apply_promo(promo_code, stack=len(promo_codes) > 1)
+        self._revalidate_promos()
+    
+    def set_store(self, store_id: str):
+        self.store_id = store_id
+    
+    def _in_store_stock(self, product_id: str, quantity: int) -> bool:
+        if not self.inventory_service or not self.store_id:
+            return True
+        return self.inventory_service.is_available(self.store_id, product_id, quantity)
     
     def add_product_to_cart(self, product: Product, quantity: int = 1) -> bool:
         if not product.is_available() or not product.is_valid_quantity(quantity):
             return False
+        in_cart = self.cart.items.get(product.product_id)
+        if not self._in_store_stock(product.product_id, quantity + (in_cart.quantity if in_cart else 0)):
+            return False
         
         cart_item = CartFactory.create_cart_item_from_product(product, quantity)
         self.cart.add_item(cart_item)
+        self._on_cart_changed()
         return True
     
     def remove_product_from_cart(self, product_id: str) -> bool:
         if product_id in self.cart.items:
             self.cart.remove_item(product_id)
+            self.unavailable_product_ids.discard(product_id)
+            self._on_cart_changed()
             return True
         return False
     
@@ -30,8 +155,11 @@ class CartService:
         if quantity <= 0:
             self.remove_product_from_cart(product_id)
             return True
+        if not self._in_store_stock(product_id, quantity):
+            return False
         
         self.cart.update_item_quantity(product_id, quantity)
+        self._on_cart_changed()
         return True
     
     def increment_quantity(self, product_id: str, amount: int = 1) -> bool:
@@ -46,33 +174,125 @@ class CartService:
         current_item = self.cart.items[product_id]
         return self.update_product_quantity(product_id, max(0, current_item.quantity - amount))
     
-    def apply_promo_code(self, promo_code: PromoCode) -> bool:
-        subtotal = self.cart.get_subtotal()
-        if not promo_code.is_valid(subtotal):
+    def build_promo_context(self, is_first_order: bool = None, payment_method: str = None,
+                            user_segments: Iterable[str] = None) -> PromoContext:
+        if is_first_order is not None:
+            self._is_first_order = is_first_order
+        if payment_method is not None:
+            self._payment_method = payment_method
+        if user_segments is not None:
+            self._user_segments = frozenset(user_segments)
+        
+        category_ids = set()
+        if self.product_service:
+            for product_id in self.cart.items:
+                product = self.product_service.get_product_by_id(product_id)
+                if product:
+                    for category_id in product.get_category_ids():
+                        category_ids.add(category_id)
+                        category_ids.update(self.product_service.get_category_ancestors(category_id))
+        
+        return PromoContext(
+            order_value=self.cart.get_subtotal(),
+            item_count=self.cart.get_item_count(),
+            product_ids=self.cart.items.keys(),
+            category_ids=category_ids,
+            is_first_order=self._is_first_order,
+            payment_method=self._payment_method,
+            user_segments=self._user_segments,
+            applied_promo_codes=[p.code for p in self.cart.get_applied_promos()]
+        )
+    
+    def _get_rule(self, promo_code: PromoCode) -> Rule:
+        if self.promo_code_service:
+            return self.promo_code_service.get_rule(promo_code)
+        return PromoRuleCompiler.compile(promo_code.conditions)
+    
+    def apply_promo_code(self, promo_code: PromoCode, context: PromoContext = None) -> bool:
+        if context is None:
+            context = self.build_promo_context()
+        
+        applied = [p for p in self.cart.get_applied_promos() if p.code != promo_code.code]
+        stack = bool(applied) and promo_code.stackable and all(p.stackable for p in applied)
+        kept_codes = [p.code for p in applied] if stack else []
+        
+        if not promo_code.is_valid(context.order_value):
+            return False
+        if not self._get_rule(promo_code)(context.with_applied_promo_codes(kept_codes)):
             return False
+        # Codes already on the cart must also accept the newcomer (e.g. "not_with")
+        for existing in applied if stack else []:
+            others = [code for code in kept_codes if code != existing.code] + [promo_code.code]
+            if not self._get_rule(existing)(context.with_applied_promo_codes(others)):
+                return False
         
-        discount = promo_code.calculate_discount(subtotal)
-        self.cart.applied_promo_code = promo_code.code
-        self.cart.discount_amount = discount
+        self.cart.apply_promo(promo_code, stack=stack)
+        self._persist()
         return True
     
-    def remove_promo_code(self):
-        self.cart.applied_promo_code = ""
-        self.cart.discount_amount = 0.0
+    def _revalidate_promos(self):
+        conditional = [p for p in self.cart.get_applied_promos() if p.has_conditions()]
+        if not conditional:
+            return
+        context = self.build_promo_context()
+        for promo_code in conditional:
+            others = [code for code in context.applied_promo_codes if code != promo_code.code.upper()]
+            if not self._get_rule(promo_code)(context.with_applied_promo_codes(others)):
+                self.cart.remove_promo(promo_code.code)
+    
+    def remove_promo_code(self, code: str = None):
+        self.cart.remove_promo(code)
+        self._persist()
     
     def get_cart_summary(self) -> dict:
+        subtotal = self.cart.get_subtotal()
         return {
             "item_count": self.cart.get_item_count(),
-            "subtotal": self.cart.get_subtotal(),
+            "subtotal": subtotal,
             "delivery_charges": self.cart.delivery_charges,
             "discount": self.cart.discount_amount,
             "total": self.cart.get_total(),
-            "minimum_order_met": self.cart.is_minimum_order_met(),
+            "minimum_order_met": subtotal >= self.cart.minimum_order_value,
             "minimum_order_value": self.cart.minimum_order_value
         }
     
     def clear_cart(self):
+        self.release_stock()
         self.cart.clear()
+        self.unavailable_product_ids.clear()
+        self._sync_watched_products()
+        self._persist()
+    
+    def reserve_stock(self, ttl_seconds: float = None) -> bool:
+        if not self.reservation_service or not self.cart.items:
+            return False
+        if self.reservation_id:
+            return True
+        items = [(item.product_id, item.quantity) for item in self.cart.get_items_list()]
+        store_id = self.store_id if self.inventory_service else None
+        self.reservation_id = self.reservation_service.try_reserve(items, store_id, ttl_seconds)
+        return self.reservation_id is not None
+    
+    def release_stock(self) -> bool:
+        if not self.reservation_id:
+            return False
+        released = self.reservation_service.release(self.reservation_id)
+        self.reservation_id = None
+        return released
+    
+    def checkout(self, user_id: str, order_id: str, delivery_address: str,
+                 payment_method: str = "") -> Optional[Order]:
+        # Without a reservation service this only builds the order, as before
+        if self.reservation_service:
+            if not self.reserve_stock():
+                return None
+            reservation_id, self.reservation_id = self.reservation_id, None
+            if not self.reservation_service.commit(reservation_id):
+                return None
+        order = OrderFactory.create_order_from_cart(self.cart, user_id, order_id,
+                                                    delivery_address, payment_method)
+        self.clear_cart()
+        return order
     
     def get_cart_items(self) -> List[CartItem]:
         return self.cart.get_items_list()
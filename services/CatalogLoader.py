@@ -0,0 +1,180 @@
+import csv
+import json
+import time
+from typing import IO, Callable, Iterator, List, Optional, Tuple, Union
+from models.Product import Category, Product
+from factories.ProductFactory import ProductFactory
+from factories.CategoryFactory import CategoryFactory
+from services.ProductService import ProductService
+
+
+class LoadReport:
+    def __init__(self):
+        self.loaded = 0
+        self.rejected: List[Tuple[int, str]] = []  # (row number, reason)
+        self.elapsed_seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        total = self.loaded + len(self.rejected)
+        return total / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def get_summary(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "rejected": len(self.rejected),
+            "elapsed_seconds": self.elapsed_seconds,
+            "rows_per_second": self.rows_per_second
+        }
+
+
+# Streams JSONL/CSV catalog files into a ProductService. Rows are read one at a
+# time and turned into products in batches; the products are installed with a
+# single ProductService.add_products call so the indexes are built once.
+class CatalogLoader:
+    def __init__(self, product_service: ProductService, batch_size: int = 5000):
+        self.product_service = product_service
+        self.batch_size = batch_size
+
+    @staticmethod
+    def _open(source: Union[str, IO[str]]) -> IO[str]:
+        return open(source, newline="", encoding="utf-8") if isinstance(source, str) else source
+
+    @staticmethod
+    def _read_jsonl(stream: IO[str]) -> Iterator[Tuple[int, Optional[dict], str]]:
+        for row_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield row_number, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "row is not an object"
+                continue
+            yield row_number, data, ""
+
+    @staticmethod
+    def _read_csv(stream: IO[str]) -> Iterator[Tuple[int, Optional[dict], str]]:
+        # Header is line 1, so data rows start at 2
+        for row_number, row in enumerate(csv.DictReader(stream), start=2):
+            yield row_number, row, ""
+
+    @staticmethod
+    def _validate_product(product: Product) -> str:
+        for field in ("product_id", "name", "image", "category_id", "weight", "description"):
+            if not isinstance(getattr(product, field), str):
+                return f"{field} must be a string"
+        for field in ("price", "discount"):
+            value = getattr(product, field)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return f"{field} must be a number"
+        for field in ("stock", "max_quantity"):
+            value = getattr(product, field)
+            if isinstance(value, bool) or not isinstance(value, int):
+                return f"{field} must be a whole number"
+        if not all(isinstance(image, str) for image in product.images):
+            return "images must be a list of strings"
+        if not product.product_id:
+            return "missing product_id"
+        if not product.name:
+            return "missing name"
+        if product.price < 0:
+            return "negative price"
+        if not 0 <= product.discount <= 100:
+            return "discount out of range"
+        if product.stock < 0:
+            return "negative stock"
+        if not isinstance(product.categories, dict) or not all(
+                isinstance(sub_category_ids, list) for sub_category_ids in product.categories.values()):
+            return "categories must map category ids to lists of sub-category ids"
+        return ""
+
+    def _load_products(self, rows: Iterator[Tuple[int, Optional[dict], str]],
+                       build: Callable[[dict], Product]) -> LoadReport:
+        report = LoadReport()
+        started = time.perf_counter()
+        seen_ids = set()
+        products: List[Product] = []
+        batch: List[Tuple[int, dict]] = []
+
+        def flush():
+            for row_number, data in batch:
+                try:
+                    product = build(data)
+                    reason = self._validate_product(product)
+                except (TypeError, ValueError) as e:
+                    report.rejected.append((row_number, str(e)))
+                    continue
+                if not reason and (product.product_id in seen_ids
+                                   or self.product_service.get_product_by_id(product.product_id)):
+                    reason = f"duplicate product_id {product.product_id}"
+                if reason:
+                    report.rejected.append((row_number, reason))
+                    continue
+                seen_ids.add(product.product_id)
+                products.append(product)
+            batch.clear()
+
+        for row_number, data, error in rows:
+            if error:
+                report.rejected.append((row_number, error))
+                continue
+            batch.append((row_number, data))
+            if len(batch) >= self.batch_size:
+                flush()
+        flush()
+
+        report.loaded = self.product_service.add_products(products)
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    def load_products_jsonl(self, source: Union[str, IO[str]]) -> LoadReport:
+        stream = self._open(source)
+        try:
+            return self._load_products(self._read_jsonl(stream), ProductFactory.create_from_dict)
+        finally:
+            if stream is not source:
+                stream.close()
+
+    def load_products_csv(self, source: Union[str, IO[str]]) -> LoadReport:
+        stream = self._open(source)
+        try:
+            return self._load_products(self._read_csv(stream), ProductFactory.create_from_csv_row)
+        finally:
+            if stream is not source:
+                stream.close()
+
+    def load_products(self, path: str) -> LoadReport:
+        if path.endswith(".csv"):
+            return self.load_products_csv(path)
+        return self.load_products_jsonl(path)
+
+    def _load_categories(self, rows: Iterator[Tuple[int, Optional[dict], str]]) -> LoadReport:
+        report = LoadReport()
+        started = time.perf_counter()
+        for row_number, data, error in rows:
+            if error:
+                report.rejected.append((row_number, error))
+                continue
+            category: Category = CategoryFactory.create_from_dict(data)
+            if not category.category_id or not category.name:
+                report.rejected.append((row_number, "missing category_id or name"))
+                continue
+            if self.product_service.get_category_by_id(category.category_id):
+                report.rejected.append((row_number, f"duplicate category_id {category.category_id}"))
+                continue
+            try:
+                self.product_service.add_category(category)
+            except ValueError as e:
+                report.rejected.append((row_number, str(e)))
+                continue
+            report.loaded += 1
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    def load_categories(self, path: str) -> LoadReport:
+        with open(path, newline="", encoding="utf-8") as stream:
+            rows = self._read_csv(stream) if path.endswith(".csv") else self._read_jsonl(stream)
+            return self._load_categories(rows)
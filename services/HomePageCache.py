@@ -0,0 +1,81 @@
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from models.ProductChange import ProductChange
+from services.ProductChangeFeed import ProductChangeFeed
+
+ChangeFilter = Callable[[ProductChange], bool]
+
+
+# Shared, versioned store for home page sections that are identical for every
+# user. A section is rebuilt only when the version it was built at no longer
+# matches, so one HomePageCache can back every HomePageService that renders
+# the same catalog and banners.
+#
+# Product sections can instead be kept current by a ProductChangeFeed: such a
+# section is rebuilt only when a change touches one of its products or one its
+# `admits` filter says could enter it, rather than on every catalog change.
+# Feed-kept sections are stored under their own keys, apart from sections of
+# the same name versioned by catalog_version, so both kinds can share a cache.
+class HomePageCache:
+    def __init__(self):
+        self._sections: Dict[str, Tuple[Hashable, object]] = {}
+        self._source_versions: Dict[str, int] = {}
+        self._product_sections: Dict[str, Tuple[frozenset, Optional[ChangeFilter]]] = {}
+        self._feeds: List[ProductChangeFeed] = []
+        self.hits = 0
+        self.misses = 0
+
+    def get_version(self, source: str) -> int:
+        return self._source_versions.get(source, 0)
+
+    def bump(self, source: str):
+        self._source_versions[source] = self.get_version(source) + 1
+
+    def get_section(self, name: str, version: Hashable, builder: Callable[[], object]):
+        entry = self._sections.get(name)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = builder()
+        self._sections[name] = (version, value)
+        return value
+
+    async def get_section_async(self, name: str, version: Hashable,
+                                builder: Callable[[], Awaitable[object]]):
+        entry = self._sections.get(name)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = await builder()
+        self._sections[name] = (version, value)
+        return value
+
+    def invalidate(self, name: str = None):
+        if name is None:
+            self._sections.clear()
+        else:
+            self._sections.pop(name, None)
+
+    def watch(self, change_feed: ProductChangeFeed):
+        if not any(feed is change_feed for feed in self._feeds):
+            self._feeds.append(change_feed)
+            change_feed.subscribe(self.on_product_changes)
+
+    def get_product_section(self, name: str, builder: Callable[[], list],
+                            admits_factory: Callable[[list], ChangeFilter] = None) -> list:
+        def build() -> list:
+            products = builder()
+            admits = admits_factory(products) if admits_factory else None
+            self._product_sections[name] = (frozenset(p.product_id for p in products), admits)
+            return products
+        key = f"section:{name}"
+        return self.get_section(key, self.get_version(key), build)
+
+    def on_product_changes(self, changes: List[ProductChange]):
+        for name, (members, admits) in list(self._product_sections.items()):
+            for change in changes:
+                if change.product_id in members or (admits is not None and admits(change)):
+                    self.bump(f"section:{name}")
+                    self._product_sections.pop(name, None)
+                    break
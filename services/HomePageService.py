@@ -5,33 +5,90 @@ from models.Cart import CartItem
 from services.ProductService import ProductService
 from services.CartService import CartService
 from services.UserService import UserService
+from services.HomePageCache import HomePageCache
+from services.ProductChangeFeed import ProductChangeFeed
+from services.RecommendationService import RecommendationService
 
 # Basic Home Page render which combines logics
+# Sections shared by every user (banners, categories, deals, featured) come from
+# section_cache; pass the same cache to every HomePageService built over the same
+# product service and banners so they are assembled once per change. With a
+# change_feed, deals and featured are invalidated only by the changes that can
+# affect them instead of by every catalog update.
 class HomePageService:
     def __init__(self, product_service: ProductService = None, 
                  cart_service: CartService = None,
                  user_service: UserService = None,
-                 banners: List[Banner] = None):
+                 banners: List[Banner] = None,
+                 section_cache: HomePageCache = None,
+                 change_feed: ProductChangeFeed = None,
+                 recommendation_service: RecommendationService = None):
         self.product_service = product_service or ProductService()
         self.cart_service = cart_service or CartService()
         self.user_service = user_service
         self.banners = banners or []
+        self.section_cache = section_cache or HomePageCache()
+        self.change_feed = change_feed
+        self.recommendation_service = recommendation_service
+        if change_feed:
+            self.section_cache.watch(change_feed)
+    
+    def _get_shared_section(self, name: str, version, builder) -> list:
+        return list(self.section_cache.get_section(name, version, builder))
+    
+    def add_banner(self, banner: Banner):
+        self.banners.append(banner)
+        self.section_cache.bump("banners")
+    
+    def set_banner_active(self, banner_id: str, is_active: bool) -> bool:
+        for banner in self.banners:
+            if banner.banner_id == banner_id:
+                banner.is_active = is_active
+                self.section_cache.bump("banners")
+                return True
+        return False
     
     def get_active_banners(self) -> List[Banner]:
-        return [b for b in self.banners if b.is_valid()]
+        return self._get_shared_section(
+            "banners", self.section_cache.get_version("banners"),
+            lambda: [b for b in self.banners if b.is_valid()])
     
     def get_categories(self) -> List[Category]:
-        return self.product_service.get_all_categories()
+        return self._get_shared_section(
+            "categories", self.product_service.category_version,
+            self.product_service.get_all_categories)
     
     def get_deals_products(self, limit: int = 20) -> List[Product]:
-        all_products = self.product_service.get_all_products()
-        deals = [p for p in all_products if p.get_discount_percentage() > 0]
-        sorted_deals = self.product_service.sort_products_by_discount(deals, descending=True)
-        return sorted_deals[:limit]
+        builder = lambda: self.product_service.get_top_discounted_products(limit)
+        if self.change_feed:
+            return list(self.section_cache.get_product_section(
+                f"deals:{limit}", builder, lambda deals: self._deal_admits(deals, limit)))
+        return self._get_shared_section(f"deals:{limit}", self.product_service.catalog_version, builder)
+    
+    @staticmethod
+    def _deal_admits(deals: List[Product], limit: int):
+        # An outside product can only enter by a discount or availability change
+        # that puts it at or above the smallest discount shown
+        min_discount = deals[-1].discount if len(deals) >= limit else None
+        return lambda change: (change.is_available
+                               and ("discount" in change.changed or "available" in change.changed)
+                               and (min_discount is None or change.discount >= min_discount))
     
     def get_featured_products(self, limit: int = 20) -> List[Product]:
-        all_products = self.product_service.filter_available_products()
-        return all_products[:limit]
+        # Most popular in-stock products; catalog order until there are sales
+        builder = lambda: self.product_service.get_products_sorted_by_popularity(limit)
+        if self.change_feed:
+            return list(self.section_cache.get_product_section(
+                f"featured:{limit}", builder, lambda featured: self._featured_admits(featured, limit)))
+        version = (self.product_service.catalog_version, self.product_service.popularity_version)
+        return self._get_shared_section(f"featured:{limit}", version, builder)
+    
+    def _featured_admits(self, featured: List[Product], limit: int):
+        min_popularity = (self.product_service.get_product_popularity(featured[-1].product_id)
+                          if len(featured) >= limit else None)
+        return lambda change: ("available" in change.changed
+                               or ("popularity" in change.changed
+                                   and (min_popularity is None or change.popularity >= min_popularity)))
     
     def get_top_deals(self, limit: int = 10) -> List[Product]:
         deals = self.get_deals_products(limit * 2)
@@ -43,15 +100,23 @@ class HomePageService:
         return available[:limit] if limit else available
     
     def search_products(self, query: str, limit: int = None) -> List[Product]:
-        results = self.product_service.search_products(query)
-        available = self.product_service.filter_available_products(results)
-        return available[:limit] if limit else available
+        return self.product_service.search_products(query, limit=limit, available_only=True)
     
     def get_recently_viewed_products(self, limit: int = 10) -> List[Product]:
         if not self.user_service: # No login case
             return [] 
         return self.user_service.get_previously_ordered_products()[:limit]
     
+    def get_recommended_products(self, limit: int = 10) -> List[Product]:
+        if not self.user_service or not self.recommendation_service:
+            return []
+        return self.recommendation_service.get_recommendations(self.user_service.user_id, limit)
+    
+    def get_frequently_bought_together(self, product_id: str, limit: int = 10) -> List[Product]:
+        if not self.recommendation_service:
+            return []
+        return self.recommendation_service.get_frequently_bought_together(product_id, limit)
+    
     def get_quick_reorder_section(self) -> List[CartItem]:
         if not self.user_service:
             return []
@@ -67,11 +132,12 @@ class HomePageService:
         return self.cart_service.cart.get_item_count()
     
     def get_homepage_data(self, user_id: str = None) -> Dict:
+        deals = self.get_deals_products(20)
         data = {
             "banners": self.get_active_banners(),
             "categories": self.get_categories(),
-            "top_deals": self.get_top_deals(10),
-            "deals_products": self.get_deals_products(20),
+            "top_deals": deals[:10],
+            "deals_products": deals,
             "featured_products": self.get_featured_products(20),
             "cart_item_count": self.get_cart_item_count()
         }
@@ -79,6 +145,8 @@ class HomePageService:
         if self.user_service:
             data["quick_reorder"] = self.get_quick_reorder_section()
             data["recently_viewed"] = self.get_recently_viewed_products(10)
+            if self.recommendation_service:
+                data["recommendations"] = self.get_recommended_products(10)
         
         return data
     
@@ -86,22 +154,20 @@ class HomePageService:
                                  search_query: str = None,
                                  sort_by: str = "default",
                                  ascending: bool = True,
-                                 limit: int = None) -> List[Product]:
-        if search_query:
-            products = self.product_service.search_products(search_query)
-        elif category_id:
-            products = self.product_service.get_products_by_category(category_id)
-        else:
-            products = self.product_service.get_all_products()
-        
-        products = self.product_service.filter_available_products(products)
-        
-        if sort_by == "price":
-            products = self.product_service.sort_products_by_price(products, ascending)
-        elif sort_by == "discount":
-            products = self.product_service.sort_products_by_discount(products, descending=not ascending)
-        
-        return products[:limit] if limit else products
+                                 limit: int = None,
+                                 offset: int = 0,
+                                 min_price: float = None,
+                                 max_price: float = None) -> List[Product]:
+        return self.product_service.find_products(
+            category_id=category_id,
+            search_query=search_query,
+            min_price=min_price,
+            max_price=max_price,
+            sort_by=sort_by,
+            ascending=ascending,
+            limit=limit,
+            offset=offset
+        )
     
     def get_product_with_cart_info(self, product_id: str) -> Optional[Dict]:
         product = self.product_service.get_product_by_id(product_id)
@@ -0,0 +1,125 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.Product import Product
+from models.Profile import Location
+from models.Store import Store, StoreAssignment
+from models.UserSettings import UserSettings
+from indexes.StoreSpatialIndex import StoreSpatialIndex
+
+
+# Per-store stock. Every product gets one column index shared by all stores,
+# and each store keeps its stock for every product in a single int32 array,
+# so lookups are O(1) and tens of stores x hundreds of thousands of SKUs stay
+# a few megabytes per store.
+class InventoryService:
+    def __init__(self, stores: List[Store] = None, product_ids: Iterable[str] = None):
+        self.stores: List[Store] = []
+        self._store_map: Dict[str, Store] = {}
+        self._stock: Dict[str, array] = {}
+        self._pincode_stores: Dict[str, str] = {}
+        self._spatial_index = StoreSpatialIndex()
+        self._product_ids: List[str] = []
+        self._columns: Dict[str, int] = {}
+        for product_id in product_ids or []:
+            self.register_product(product_id)
+        for store in stores or []:
+            self.add_store(store)
+
+    def add_store(self, store: Store):
+        if store.store_id in self._store_map:
+            return
+        self.stores.append(store)
+        self._store_map[store.store_id] = store
+        self._stock[store.store_id] = array("i", bytes(4 * len(self._product_ids)))
+        for pincode in store.pincodes:
+            self._pincode_stores.setdefault(pincode, store.store_id)
+        self._spatial_index.add_store(store)
+
+    def get_store_by_id(self, store_id: str) -> Optional[Store]:
+        return self._store_map.get(store_id)
+    
+    def set_store_active(self, store_id: str, is_active: bool) -> bool:
+        return self._spatial_index.set_store_active(store_id, is_active)
+
+    def register_product(self, product_id: str) -> int:
+        column = self._columns.get(product_id)
+        if column is None:
+            column = len(self._product_ids)
+            self._product_ids.append(product_id)
+            self._columns[product_id] = column
+            for stock in self._stock.values():
+                stock.append(0)
+        return column
+
+    def set_stock(self, store_id: str, product_id: str, quantity: int) -> bool:
+        stock = self._stock.get(store_id)
+        if stock is None:
+            return False
+        stock[self.register_product(product_id)] = max(0, quantity)
+        return True
+
+    def adjust_stock(self, store_id: str, product_id: str, delta: int) -> int:
+        stock = self._stock.get(store_id)
+        if stock is None:
+            raise KeyError(f"Unknown store: {store_id}")
+        column = self.register_product(product_id)
+        stock[column] = max(0, stock[column] + delta)
+        return stock[column]
+
+    def load_stock(self, store_id: str, quantities: Iterable[Tuple[str, int]]) -> int:
+        loaded = 0
+        for product_id, quantity in quantities:
+            if self.set_stock(store_id, product_id, quantity):
+                loaded += 1
+        return loaded
+
+    def get_stock(self, store_id: str, product_id: str) -> int:
+        stock = self._stock.get(store_id)
+        column = self._columns.get(product_id)
+        if stock is None or column is None:
+            return 0
+        return stock[column]
+
+    def is_available(self, store_id: str, product_id: str, quantity: int = 1) -> bool:
+        return self.get_stock(store_id, product_id) >= max(quantity, 1)
+
+    def is_valid_quantity(self, store_id: str, product: Product, quantity: int) -> bool:
+        return 0 < quantity <= min(self.get_stock(store_id, product.product_id), product.max_quantity)
+
+    def filter_available_products(self, store_id: str, products: Iterable[Product],
+                                  limit: int = None) -> List[Product]:
+        stock = self._stock.get(store_id)
+        if stock is None:
+            return []
+        available = []
+        for product in products:
+            column = self._columns.get(product.product_id)
+            if column is not None and stock[column] > 0:
+                available.append(product)
+                if limit and len(available) >= limit:
+                    break
+        return available
+
+    def get_assignment_for_location(self, location: Location) -> Optional[StoreAssignment]:
+        return self._spatial_index.resolve(location)
+    
+    def get_assignments_for_locations(self, locations: Iterable[Location]) -> List[Optional[StoreAssignment]]:
+        return self._spatial_index.resolve_many(locations)
+    
+    def get_store_for_location(self, location: Location) -> Optional[Store]:
+        assignment = self._spatial_index.resolve(location)
+        if assignment is not None:
+            return assignment.store
+        # Addresses saved without coordinates fall back to the pincode map
+        store_id = self._pincode_stores.get(location.pincode)
+        if store_id and self._store_map[store_id].is_active:
+            return self._store_map[store_id]
+        return None
+    
+    def get_nearest_store(self, latitude: float, longitude: float) -> Optional[Store]:
+        assignment = self._spatial_index.find_store(latitude, longitude)
+        return assignment.store if assignment else None
+    
+    def get_store_for_user(self, user_settings: UserSettings) -> Optional[Store]:
+        location = user_settings.get_default_location()
+        return self.get_store_for_location(location) if location else None
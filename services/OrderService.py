@@ -1,21 +1,46 @@
-from typing import List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterator, List, Optional
 from datetime import datetime
 from models.Order import Order, OrderItem
+from indexes.UserOrderStats import UserOrderStats
+from indexes.OrderSearchIndex import OrderSearchIndex
+from persistence.OrderLog import OrderLog
 
 
 class OrderService:
-    def __init__(self, orders: List[Order] = None):
+    def __init__(self, orders: List[Order] = None, order_log: OrderLog = None):
+        # With an order log and no orders, history is restored from its snapshot and tail
+        self.order_log = order_log
+        if orders is None and order_log:
+            orders = order_log.load()
         self.orders = orders or []
         self._order_map = {o.order_id: o for o in self.orders}
-        self._user_orders: dict = {}
+        # Per-user orders oldest first, with a parallel list of dates to bisect
+        self._user_orders: Dict[str, List[Order]] = {}
+        self._user_order_dates: Dict[str, List[datetime]] = {}
+        self._user_stats: Dict[str, UserOrderStats] = {}
+        # Built on a user's first search, then kept current by create_order
+        self._search_indexes: Dict[str, OrderSearchIndex] = {}
+        # Called with each newly created order
+        self._order_listeners: List[Callable[[Order], None]] = []
+        # Called with the order and its previous status on each status change
+        self._status_listeners: List[Callable[[Order, str], None]] = []
         self._build_user_index()
     
     def _build_user_index(self):
         self._user_orders.clear()
+        self._user_order_dates.clear()
+        self._user_stats.clear()
+        self._search_indexes.clear()
         for order in self.orders:
             if order.user_id not in self._user_orders:
                 self._user_orders[order.user_id] = []
+                self._user_stats[order.user_id] = UserOrderStats()
             self._user_orders[order.user_id].append(order)
+            self._user_stats[order.user_id].add_order(order)
+        for user_id, user_orders in self._user_orders.items():
+            user_orders.sort(key=lambda o: o.order_date)
+            self._user_order_dates[user_id] = [o.order_date for o in user_orders]
     
     def create_order(self, order: Order):
         if order.order_id not in self._order_map:
@@ -23,55 +48,140 @@ class OrderService:
             self._order_map[order.order_id] = order
             if order.user_id not in self._user_orders:
                 self._user_orders[order.user_id] = []
-            self._user_orders[order.user_id].append(order)
+                self._user_order_dates[order.user_id] = []
+                self._user_stats[order.user_id] = UserOrderStats()
+            self._user_stats[order.user_id].add_order(order)
+            if order.user_id in self._search_indexes:
+                self._search_indexes[order.user_id].add(order)
+            dates = self._user_order_dates[order.user_id]
+            position = bisect_right(dates, order.order_date)
+            dates.insert(position, order.order_date)
+            self._user_orders[order.user_id].insert(position, order)
+            if self.order_log:
+                self.order_log.append_created(order)
+                self._snapshot_if_due()
+            for listener in self._order_listeners:
+                listener(order)
+    
+    def add_order_listener(self, listener: Callable[[Order], None]):
+        self._order_listeners.append(listener)
+    
+    def remove_order_listener(self, listener: Callable[[Order], None]) -> bool:
+        if listener in self._order_listeners:
+            self._order_listeners.remove(listener)
+            return True
+        return False
+    
+    def add_status_listener(self, listener: Callable[[Order, str], None]):
+        self._status_listeners.append(listener)
+    
+    def remove_status_listener(self, listener: Callable[[Order, str], None]) -> bool:
+        if listener in self._status_listeners:
+            self._status_listeners.remove(listener)
+            return True
+        return False
     
     def get_order_by_id(self, order_id: str) -> Optional[Order]:
         return self._order_map.get(order_id)
     
+    def update_order_status(self, order_id: str, status: str) -> bool:
+        order = self._order_map.get(order_id)
+        if not order:
+            return False
+        if order.status != status:
+            old_status = order.status
+            order.status = status
+            self._user_stats[order.user_id].change_status(order, old_status, status)
+            if self.order_log:
+                self.order_log.append_status(order_id, status)
+                self._snapshot_if_due()
+            for listener in self._status_listeners:
+                listener(order, old_status)
+        return True
+    
+    def _snapshot_if_due(self):
+        if self.order_log.needs_snapshot():
+            self.order_log.write_snapshot(self.orders)
+    
+    def write_snapshot(self) -> bool:
+        if not self.order_log:
+            return False
+        self.order_log.write_snapshot(self.orders)
+        return True
+    
+    def get_user_stats(self, user_id: str) -> UserOrderStats:
+        return self._user_stats.get(user_id) or UserOrderStats()
+    
     def get_user_orders(self, user_id: str) -> List[Order]:
+        return self._user_orders.get(user_id, [])[::-1]
+    
+    def iter_user_orders(self, user_id: str) -> Iterator[Order]:
+        return reversed(self._user_orders.get(user_id, []))
+    
+    def get_user_orders_page(self, user_id: str, offset: int = 0, limit: int = 20) -> List[Order]:
         user_orders = self._user_orders.get(user_id, [])
-        return sorted(user_orders, key=lambda o: o.order_date, reverse=True)
+        end = len(user_orders) - offset
+        if end <= 0:
+            return []
+        return user_orders[max(0, end - limit):end][::-1]
     
     def get_recent_orders(self, user_id: str, limit: int = 5) -> List[Order]:
-        return self.get_user_orders(user_id)[:limit]
+        return self.get_user_orders_page(user_id, 0, limit)
     
     def get_order_by_status(self, user_id: str, status: str) -> List[Order]:
-        return [o for o in self.get_user_orders(user_id) if o.status == status]
-    
-    def search_orders(self, user_id: str, query: str) -> List[Order]:
-        user_orders = self.get_user_orders(user_id)
-        query_lower = query.lower()
-        results = []
-        for order in user_orders:
-            if query_lower in order.order_id.lower():
-                results.append(order)
-                continue
-            for item in order.order_items:
-                if query_lower in item.product_name.lower():
-                    results.append(order)
-                    break
-        return results
+        # Reads order.status itself, so an order whose status was set directly
+        # rather than through update_order_status is still found
+        return [o for o in self.iter_user_orders(user_id) if o.status == status]
+    
+    def get_order_count_by_status(self, user_id: str, status: str) -> int:
+        # Maintained by create_order and update_order_status
+        return self.get_user_stats(user_id).get_status_count(status)
+    
+    def _get_search_index(self, user_id: str) -> OrderSearchIndex:
+        search_index = self._search_indexes.get(user_id)
+        if search_index is None:
+            search_index = OrderSearchIndex()
+            for order in self._user_orders.get(user_id, []):
+                search_index.add(order)
+            self._search_indexes[user_id] = search_index
+        return search_index
+    
+    def search_orders(self, user_id: str, query: str, prefix: bool = False,
+                      year: int = None, month: int = None,
+                      offset: int = 0, limit: int = None) -> List[Order]:
+        if user_id not in self._user_orders:
+            return []
+        return self._get_search_index(user_id).search(query, prefix, year, month, offset, limit)
     
     def get_previously_ordered_products(self, user_id: str) -> List[str]:
-        product_ids = set()
-        for order in self.get_user_orders(user_id):
-            product_ids.update(order.get_ordered_product_ids())
-        return list(product_ids)
+        # Most recently ordered first
+        return self.get_user_stats(user_id).get_product_ids_by_recency()
+    
+    def get_frequently_ordered_products(self, user_id: str, limit: int = None) -> List[str]:
+        product_ids = self.get_user_stats(user_id).get_product_ids_by_frequency()
+        return product_ids[:limit] if limit else product_ids
     
     def get_quick_reorder_items(self, user_id: str) -> List[OrderItem]:
         recent_orders = self.get_recent_orders(user_id, limit=1)
         return recent_orders[0].order_items if recent_orders else []
     
+    def _date_range_bounds(self, user_id: str, start_date: datetime, end_date: datetime):
+        dates = self._user_order_dates.get(user_id, [])
+        return bisect_left(dates, start_date), bisect_right(dates, end_date)
+    
     def get_orders_by_date_range(self, user_id: str, start_date: datetime, 
                                  end_date: datetime) -> List[Order]:
-        return [
-            o for o in self.get_user_orders(user_id)
-            if start_date <= o.order_date <= end_date
-        ]
+        lower, upper = self._date_range_bounds(user_id, start_date, end_date)
+        return self._user_orders.get(user_id, [])[lower:upper][::-1]
+    
+    def iter_orders_by_date_range(self, user_id: str, start_date: datetime,
+                                  end_date: datetime) -> Iterator[Order]:
+        lower, upper = self._date_range_bounds(user_id, start_date, end_date)
+        user_orders = self._user_orders.get(user_id, [])
+        return (user_orders[i] for i in range(upper - 1, lower - 1, -1))
     
     def get_total_orders_count(self, user_id: str) -> int:
         return len(self._user_orders.get(user_id, []))
     
     def get_total_spent(self, user_id: str) -> float:
-        delivered_orders = [o for o in self.get_user_orders(user_id) if o.is_delivered()]
-        return sum(o.total_amount for o in delivered_orders)
+        return self.get_user_stats(user_id).get_total_spent()
@@ -0,0 +1,90 @@
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from models.Order import Order
+from models.Product import Product
+from services.OrderService import OrderService
+from services.ProductService import ProductService
+
+# Past this exponent the stored scores are rescaled to a new landmark
+_MAX_EXPONENT = 60.0
+
+
+# Exponentially decayed units sold per product, fed by OrderService as orders
+# are created and published to ProductService's popularity view. Scores use
+# forward decay: a sale at time t adds quantity * 2^((t - landmark) / half_life),
+# so a new sale never requires decaying every other counter and the ranking
+# equals the ranking by decayed sales at any instant. Published popularity is
+# therefore a relative score; get_score gives the decayed value at a time.
+# Cancelling an order takes its sales back out (the decayed weight of a sale
+# at t is the same whenever it is removed); reinstating it adds them again.
+class PopularityService:
+    def __init__(self, product_service: ProductService, order_service: OrderService = None,
+                 half_life_days: float = 7.0):
+        self.product_service = product_service
+        self._rate = math.log(2) / (half_life_days * 86400.0)
+        self._scores: Dict[str, float] = {}
+        self._landmark: Optional[datetime] = None
+        if order_service:
+            order_service.add_order_listener(self.record_order)
+            order_service.add_status_listener(self.record_status_change)
+
+    def _exponent(self, when: datetime) -> float:
+        return self._rate * (when - self._landmark).total_seconds()
+
+    def _rescale(self, landmark: datetime):
+        factor = math.exp(-self._exponent(landmark))
+        self._landmark = landmark
+        for product_id in self._scores:
+            self._scores[product_id] *= factor
+        self.product_service.update_product_popularities(self._scores)
+
+    def record_sale(self, product_id: str, quantity: int, when: datetime = None):
+        when = when or datetime.now()
+        if self._landmark is None:
+            self._landmark = when
+        elif self._exponent(when) > _MAX_EXPONENT:
+            self._rescale(when)
+        # Floored at zero against rounding when sales are taken back out
+        score = max(0.0, self._scores.get(product_id, 0.0) + quantity * math.exp(self._exponent(when)))
+        self._scores[product_id] = score
+        self.product_service.update_product_popularity(product_id, score)
+
+    def record_order(self, order: Order):
+        if order.status == "cancelled":
+            return
+        for item in order.order_items:
+            self.record_sale(item.product_id, item.quantity, order.order_date)
+
+    def record_status_change(self, order: Order, old_status: str):
+        if (order.status == "cancelled") == (old_status == "cancelled"):
+            return
+        sign = -1 if order.status == "cancelled" else 1
+        for item in order.order_items:
+            self.record_sale(item.product_id, sign * item.quantity, order.order_date)
+    
+    def rebuild(self, orders: Iterable[Order]) -> int:
+        orders = [order for order in orders if order.status != "cancelled"]
+        stale = dict.fromkeys(self._scores, 0.0)
+        self._scores = {}
+        if not orders:
+            self.product_service.update_product_popularities(stale)
+            return 0
+        # Anchored at the newest order, so every weight is at most 1
+        self._landmark = max(order.order_date for order in orders)
+        for order in orders:
+            weight = math.exp(self._exponent(order.order_date))
+            for item in order.order_items:
+                self._scores[item.product_id] = self._scores.get(item.product_id, 0.0) + item.quantity * weight
+        stale.update(self._scores)
+        self.product_service.update_product_popularities(stale)
+        return len(orders)
+
+    def get_score(self, product_id: str, at: datetime = None) -> float:
+        score = self._scores.get(product_id, 0.0)
+        if not score:
+            return 0.0
+        return score * math.exp(-self._exponent(at or datetime.now()))
+
+    def get_top_products(self, limit: int = 20, offset: int = 0) -> List[Product]:
+        return self.product_service.get_products_sorted_by_popularity(limit, offset)
@@ -0,0 +1,180 @@
+import asyncio
+from contextlib import contextmanager
+from threading import Lock, Timer
+from typing import Callable, Dict, Iterable, List, Optional
+from models.ProductChange import ProductChange
+
+ChangeCallback = Callable[[List[ProductChange]], None]
+
+
+# An asyncio consumer's view of the feed. Batches that arrive while the
+# consumer is busy are coalesced per product, so a slow consumer holds at most
+# one pending change per product; past max_pending products the backlog is
+# dropped and `overflowed` is set on the next batch, telling the consumer to
+# resync from the catalog instead.
+class AsyncChangeSubscription:
+    def __init__(self, feed: "ProductChangeFeed", loop: asyncio.AbstractEventLoop,
+                 max_pending: int, product_ids: Iterable[str] = None):
+        self._feed = feed
+        self._loop = loop
+        self.max_pending = max_pending
+        self.product_ids = frozenset(product_ids) if product_ids is not None else None
+        self._pending: Dict[str, ProductChange] = {}
+        self._ready = asyncio.Event()
+        self._overflow = False
+        self.overflowed = False
+        self.closed = False
+
+    def _deliver(self, changes: List[ProductChange]):
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._merge, changes)
+
+    def _merge(self, changes: List[ProductChange]):
+        pending = self._pending
+        for change in changes:
+            existing = pending.get(change.product_id)
+            pending[change.product_id] = existing.merge(change) if existing else change
+        if len(pending) > self.max_pending:
+            pending.clear()
+            self._overflow = True
+        self._ready.set()
+
+    async def get(self) -> List[ProductChange]:
+        await self._ready.wait()
+        self._ready.clear()
+        changes = list(self._pending.values())
+        self._pending = {}
+        self.overflowed, self._overflow = self._overflow, False
+        return changes
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> List[ProductChange]:
+        if self.closed:
+            raise StopAsyncIteration
+        return await self.get()
+
+    def close(self):
+        self.closed = True
+        self._feed.unsubscribe(self._deliver)
+
+
+# Fan-out of product changes published by ProductService. Changes are
+# coalesced per product until the feed is flushed. By default every publish
+# flushes on its own; with a flush_interval, a publish schedules a flush that
+# many seconds later instead, so a burst of updates to one product goes out as
+# one change. Updates made inside `with feed.batch():` go out together when the
+# batch ends either way. Subscribers may restrict themselves to a set of product
+# ids; those are indexed by product, so a change reaches only the subscribers
+# watching its product and the unrestricted ones.
+class ProductChangeFeed:
+    def __init__(self, flush_interval: float = None):
+        self.flush_interval = flush_interval
+        # Unrestricted subscribers, and restricted ones by product id. Lists are
+        # replaced, never mutated, so flush can iterate a copy without the lock.
+        self._subscribers: List[ChangeCallback] = []
+        self._product_subscribers: Dict[str, List[ChangeCallback]] = {}
+        self._filters: Dict[ChangeCallback, frozenset] = {}
+        self._pending: Dict[str, ProductChange] = {}
+        self._batch_depth = 0
+        self._timer: Optional[Timer] = None
+        self._lock = Lock()
+        self.published = 0
+        self.delivered = 0
+
+    def _remove(self, callback: ChangeCallback) -> bool:
+        if callback in self._subscribers:
+            self._subscribers = [c for c in self._subscribers if c != callback]
+            return True
+        product_ids = self._filters.pop(callback, None)
+        if product_ids is None:
+            return False
+        for product_id in product_ids:
+            remaining = [c for c in self._product_subscribers[product_id] if c != callback]
+            if remaining:
+                self._product_subscribers[product_id] = remaining
+            else:
+                del self._product_subscribers[product_id]
+        return True
+
+    def subscribe(self, callback: ChangeCallback, product_ids: Iterable[str] = None) -> ChangeCallback:
+        # Subscribing a callback again replaces its product ids
+        product_ids = frozenset(product_ids) if product_ids is not None else None
+        with self._lock:
+            self._remove(callback)
+            if product_ids is None:
+                self._subscribers = self._subscribers + [callback]
+            else:
+                self._filters[callback] = product_ids
+                for product_id in product_ids:
+                    self._product_subscribers[product_id] = self._product_subscribers.get(product_id, []) + [callback]
+        return callback
+
+    def subscribe_async(self, max_pending: int = 10000, product_ids: Iterable[str] = None,
+                        loop: asyncio.AbstractEventLoop = None) -> AsyncChangeSubscription:
+        subscription = AsyncChangeSubscription(self, loop or asyncio.get_running_loop(),
+                                               max_pending, product_ids)
+        self.subscribe(subscription._deliver, subscription.product_ids)
+        return subscription
+
+    def unsubscribe(self, callback: ChangeCallback) -> bool:
+        with self._lock:
+            return self._remove(callback)
+
+    def publish(self, change: ProductChange):
+        with self._lock:
+            self.published += 1
+            existing = self._pending.get(change.product_id)
+            self._pending[change.product_id] = existing.merge(change) if existing else change
+            if self._batch_depth > 0:
+                return
+            if self.flush_interval is not None:
+                if self._timer is None:
+                    self._timer = Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                done = self._batch_depth == 0
+            if done:
+                self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return 0
+            changes = list(self._pending.values())
+            self._pending = {}
+            deliveries: Dict[ChangeCallback, List[ProductChange]] = {
+                callback: changes for callback in self._subscribers}
+            for change in changes:
+                for callback in self._product_subscribers.get(change.product_id, ()):
+                    deliveries.setdefault(callback, []).append(change)
+        for callback, selected in deliveries.items():
+            callback(selected)
+            self.delivered += len(selected)
+        return len(changes)
+
+    def close(self):
+        # Delivers anything still waiting on the flush timer
+        self.flush()
+
+    def get_pending_count(self) -> int:
+        return len(self._pending)
+
+    def get_subscriber_count(self) -> int:
+        return len(self._subscribers) + len(self._filters)
@@ -1,33 +1,222 @@
-from typing import List, Optional
+from itertools import islice
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from models.Product import Product, Category
+from models.ProductChange import ProductChange
+from indexes.ProductSearchIndex import ProductSearchIndex
+from indexes.CategoryIndex import CategoryIndex
+from indexes.SortedProductIndex import SortedProductIndex
+from indexes.CatalogSnapshot import CatalogSnapshot
+from persistence.CatalogFile import CatalogFile, CatalogProducts
+from services.BatchExecutor import BatchExecutor
+from services.InventoryService import InventoryService
+from services.ProductChangeFeed import ProductChangeFeed
+
+
+def _index_search(search_index: ProductSearchIndex, doc_id: int, product: Product) -> List[str]:
+    # All or nothing per product: a malformed row is held as an empty document
+    # with no categories instead of stalling every doc id after it
+    try:
+        category_ids = product.get_category_ids()
+        search_index.add(doc_id, product)
+    except (AttributeError, TypeError):
+        search_index.add_empty(doc_id)
+        return []
+    return category_ids
+
+
+def _index_shard(catalog_file: CatalogFile, start: int, end: int) -> Tuple[ProductSearchIndex, List[List[str]]]:
+    search_index = ProductSearchIndex(start)
+    category_ids = [_index_search(search_index, doc_id, catalog_file.get_product(doc_id))
+                    for doc_id in range(start, end)]
+    return search_index, category_ids
 
 
 class ProductService:
-    def __init__(self, products: List[Product] = None, categories: List[Category] = None):
-        self.products = products or []
-        self.categories = categories or []
-        self._product_map = {p.product_id: p for p in self.products}
+    def __init__(self, products: List[Product] = None, categories: List[Category] = None,
+                 inventory_service: InventoryService = None, change_feed: ProductChangeFeed = None,
+                 catalog_file: CatalogFile = None):
+        # With a compiled catalog file, products are read from the mapped file on
+        # access and the sorted views are built from its numeric columns
+        self.catalog_file = catalog_file
+        if catalog_file:
+            self.products = CatalogProducts(catalog_file)
+            self.categories = categories if categories is not None else catalog_file.get_categories()
+        else:
+            self.products = products or []
+            self.categories = categories or []
+        # Per-store stock; product.stock stays the catalog-wide figure
+        self.inventory_service = inventory_service
+        # Stock, price and discount changes are published here when set
+        self.change_feed = change_feed
         self._category_map = {c.category_id: c for c in self.categories}
+        # Bumped on every change so callers can cache derived data
+        self.catalog_version = 0
+        self.category_version = 0
+        # Popularity changes bump only this, so sections that don't rank by
+        # popularity stay cached as sales come in
+        self.popularity_version = 0
+        # Doc ids by product_id; catalog-file products are added as they are looked up
+        self._doc_ids: Dict[str, int] = {}
+        self._popularity: Dict[str, float] = {}
+        # Search and category indexes are built on first use
+        self._search_index = ProductSearchIndex()
+        self._category_index = CategoryIndex()
+        self._indexed_count = 0
+        self._index_lock = Lock()
+        # Sorted view updates may come from checkout threads (refresh_stock)
+        self._views_lock = Lock()
+        # Sorted views hold in-stock products only
+        self._price_view = SortedProductIndex()
+        self._discount_view = SortedProductIndex()
+        self._popularity_view = SortedProductIndex()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._snapshot_dirty: Set[int] = set()
+        for category in self.categories:
+            self._category_index.add_category(category.category_id, category.parent_id)
+        # A catalog file's views are built from its columns on first use
+        self._views_pending = bool(catalog_file)
+        if catalog_file:
+            return
+        for doc_id, product in enumerate(self.products):
+            self._doc_ids[product.product_id] = doc_id
+        available = [(doc_id, p) for doc_id, p in enumerate(self.products) if p.is_available()]
+        self._price_view.bulk_set((doc_id, p.get_discounted_price()) for doc_id, p in available)
+        self._discount_view.bulk_set((doc_id, -p.discount) for doc_id, p in available)
+        self._popularity_view.bulk_set((doc_id, 0.0) for doc_id, _ in available)
+    
+    def _ensure_views(self):
+        if not self._views_pending:
+            return
+        with self._index_lock:
+            if not self._views_pending:
+                return
+            catalog_file = self.catalog_file
+            stock, discounted_price, discount = (
+                catalog_file.stock, catalog_file.discounted_price, catalog_file.discount)
+            available = [doc_id for doc_id in range(len(catalog_file)) if stock[doc_id] > 0]
+            self._price_view.bulk_set((doc_id, discounted_price[doc_id]) for doc_id in available)
+            self._discount_view.bulk_set((doc_id, -discount[doc_id]) for doc_id in available)
+            self._popularity_view.bulk_set((doc_id, 0.0) for doc_id in available)
+            self._views_pending = False
+    
+    def _find_doc_id(self, product_id: str) -> Optional[int]:
+        doc_id = self._doc_ids.get(product_id)
+        if doc_id is None and self.catalog_file:
+            doc_id = self.catalog_file.find_doc_id(product_id)
+            if doc_id is not None:
+                self._doc_ids[product_id] = doc_id
+        return doc_id
+    
+    def _find_product(self, product_id: str) -> Optional[Product]:
+        doc_id = self._find_doc_id(product_id)
+        return self.products[doc_id] if doc_id is not None else None
+    
+    def _scan_products(self, start: int = 0) -> Iterator[Tuple[int, Product]]:
+        # Catalog-file products are read for the pass without being kept
+        if isinstance(self.products, CatalogProducts):
+            return self.products.scan(start)
+        return enumerate(islice(self.products, start, None), start)
+    
+    def _ensure_indexed(self):
+        if self._indexed_count == len(self.products):
+            return
+        with self._index_lock:
+            for doc_id, product in self._scan_products(self._indexed_count):
+                category_ids = _index_search(self._search_index, doc_id, product)
+                self._category_index.add_product(doc_id, category_ids)
+                self._indexed_count = doc_id + 1
+    
+    def build_indexes(self, executor: BatchExecutor = None):
+        # With an executor, a catalog file's products are indexed in worker-built
+        # shards that are appended in doc id order
+        if executor and self.catalog_file:
+            with self._index_lock:
+                if self._indexed_count == 0:
+                    for search_index, category_ids in executor.map_catalog(self.catalog_file, _index_shard):
+                        self._search_index.extend(search_index)
+                        for doc_id, product_category_ids in enumerate(category_ids, search_index.first_doc_id):
+                            self._category_index.add_product(doc_id, product_category_ids)
+                    self._indexed_count = len(self.catalog_file)
+        self._ensure_indexed()
+    
+    def _refresh_views(self, doc_id: int):
+        self._ensure_views()
+        with self._views_lock:
+            self.catalog_version += 1
+            self._snapshot_dirty.add(doc_id)
+            product = self.products[doc_id]
+            if product.is_available():
+                self._price_view.set(doc_id, product.get_discounted_price())
+                self._discount_view.set(doc_id, -product.discount)
+                self._popularity_view.set(doc_id, -self._popularity.get(product.product_id, 0.0))
+            else:
+                self._price_view.discard(doc_id)
+                self._discount_view.discard(doc_id)
+                self._popularity_view.discard(doc_id)
+    
+    def _publish_change(self, product: Product, field: str, was_available: bool):
+        if not self.change_feed:
+            return
+        is_available = product.is_available()
+        changed = (field, "available") if is_available != was_available else (field,)
+        self.change_feed.publish(ProductChange(
+            product.product_id, changed, product.price, product.discount,
+            product.get_discounted_price(), product.stock, is_available, self.catalog_version,
+            self._popularity.get(product.product_id, 0.0)))
+    
+    def _products_for(self, doc_ids: List[int]) -> List[Product]:
+        return [self.products[doc_id] for doc_id in doc_ids]
     
     def get_all_products(self) -> List[Product]:
         return self.products
     
     def get_product_by_id(self, product_id: str) -> Optional[Product]:
-        return self._product_map.get(product_id)
+        return self._find_product(product_id)
+    
+    def get_products_by_category(self, category_id: str,
+                                 include_subcategories: bool = True) -> List[Product]:
+        self._ensure_indexed()
+        return self._products_for(self._category_index.get_doc_ids(category_id, include_subcategories))
     
-    def get_products_by_category(self, category_id: str) -> List[Product]:
-        return [p for p in self.products if p.category_id == category_id]
+    def get_product_count_by_category(self, category_id: str,
+                                      include_subcategories: bool = True) -> int:
+        self._ensure_indexed()
+        return self._category_index.count(category_id, include_subcategories)
     
-    def search_products(self, query: str) -> List[Product]:
-        query_lower = query.lower()
-        return [
-            p for p in self.products
-            if query_lower in p.name.lower() or query_lower in p.description.lower()
-        ]
+    def search_products(self, query: str, limit: int = None,
+                        available_only: bool = False) -> List[Product]:
+        self._ensure_indexed()
+        results = []
+        for doc_id in self._search_index.search(query):
+            product = self.products[doc_id]
+            if available_only and not product.is_available():
+                continue
+            results.append(product)
+            if limit and len(results) >= limit:
+                break
+        return results
     
-    def filter_available_products(self, products: List[Product] = None) -> List[Product]:
+    def is_product_available(self, product_id: str, store_id: str = None) -> bool:
+        if store_id and self.inventory_service:
+            return self.inventory_service.is_available(store_id, product_id)
+        product = self._find_product(product_id)
+        return product is not None and product.is_available()
+    
+    def filter_available_products(self, products: List[Product] = None,
+                                  limit: int = None, store_id: str = None) -> List[Product]:
         product_list = products or self.products
-        return [p for p in product_list if p.is_available()]
+        if store_id and self.inventory_service:
+            return self.inventory_service.filter_available_products(store_id, product_list, limit)
+        if not limit:
+            return [p for p in product_list if p.is_available()]
+        available = []
+        for product in product_list:
+            if product.is_available():
+                available.append(product)
+                if len(available) >= limit:
+                    break
+        return available
     
     def sort_products_by_price(self, products: List[Product], ascending: bool = True) -> List[Product]:
         return sorted(products, key=lambda p: p.get_discounted_price(), reverse=not ascending)
@@ -35,18 +224,223 @@ class ProductService:
     def sort_products_by_discount(self, products: List[Product], descending: bool = True) -> List[Product]:
         return sorted(products, key=lambda p: p.get_discount_percentage(), reverse=descending)
     
+    def sort_products_by_popularity(self, products: List[Product]) -> List[Product]:
+        return sorted(products, key=lambda p: self._popularity.get(p.product_id, 0.0), reverse=True)
+    
+    def get_products_sorted_by_price(self, ascending: bool = True, limit: int = None,
+                                     offset: int = 0) -> List[Product]:
+        self._ensure_views()
+        return self._products_for(self._price_view.doc_ids(offset, limit, reverse=not ascending))
+    
+    def get_products_sorted_by_discount(self, descending: bool = True, limit: int = None,
+                                        offset: int = 0) -> List[Product]:
+        self._ensure_views()
+        return self._products_for(self._discount_view.doc_ids(offset, limit, reverse=not descending))
+    
+    def get_products_sorted_by_popularity(self, limit: int = None, offset: int = 0) -> List[Product]:
+        self._ensure_views()
+        return self._products_for(self._popularity_view.doc_ids(offset, limit))
+    
+    def get_top_discounted_products(self, limit: int = None, offset: int = 0) -> List[Product]:
+        self._ensure_views()
+        discounted_count = self._discount_view.count_below(0)
+        return self._products_for(self._discount_view.doc_ids(offset, limit, stop=discounted_count))
+    
+    def get_catalog_snapshot(self) -> CatalogSnapshot:
+        if self._snapshot is None and self.catalog_file:
+            catalog_file = self.catalog_file
+            self._snapshot = CatalogSnapshot.from_columns(
+                self.products, catalog_file.price, catalog_file.discount, catalog_file.discounted_price,
+                catalog_file.stock, catalog_file.max_quantity, catalog_file.get_string_column("category_id"))
+        # Taken before patching, so a doc id marked dirty meanwhile is kept for the next call
+        with self._views_lock:
+            dirty, self._snapshot_dirty = self._snapshot_dirty, set()
+        if self._snapshot is None:
+            self._snapshot = CatalogSnapshot(self.products)
+        elif dirty or len(self._snapshot) != len(self.products):
+            self._snapshot = self._snapshot.patched(self.products, dirty)
+        return self._snapshot
+    
+    def find_products(self, category_id: str = None, search_query: str = None,
+                      min_price: float = None, max_price: float = None,
+                      sort_by: str = "default", ascending: bool = True,
+                      limit: int = None, offset: int = 0) -> List[Product]:
+        has_price_range = min_price is not None or max_price is not None
+        if not search_query and not category_id and not has_price_range:
+            if sort_by == "price":
+                return self.get_products_sorted_by_price(ascending, limit, offset)
+            if sort_by == "discount":
+                return self.get_products_sorted_by_discount(not ascending, limit, offset)
+            if sort_by == "popularity":
+                return self.get_products_sorted_by_popularity(limit, offset)
+        
+        snapshot = self.get_catalog_snapshot()
+        self._ensure_indexed()
+        self._ensure_views()
+        doc_ids = None
+        if search_query:
+            doc_ids = list(self._search_index.search(search_query))
+            if category_id:
+                in_category = set(self._category_index.get_doc_ids(category_id))
+                doc_ids = [d for d in doc_ids if d in in_category]
+        elif category_id:
+            doc_ids = self._category_index.get_doc_ids(category_id)
+        doc_ids = snapshot.select(doc_ids, available_only=True, min_price=min_price, max_price=max_price)
+        
+        page_end = offset + limit if limit else None
+        if sort_by in ("price", "discount"):
+            doc_ids = snapshot.top_k(doc_ids, sort_by, page_end, descending=not ascending)
+        elif sort_by == "popularity":
+            doc_ids = sorted(doc_ids, key=self._popularity_view.get_key)
+        return snapshot.to_products(doc_ids[offset:page_end])
+    
+    def get_product_popularity(self, product_id: str) -> float:
+        return self._popularity.get(product_id, 0.0)
+    
+    def update_product_price(self, product_id: str, price: float) -> bool:
+        doc_id = self._find_doc_id(product_id)
+        if doc_id is None:
+            return False
+        product = self.products[doc_id]
+        was_available = product.is_available()
+        product.price = price
+        self._refresh_views(doc_id)
+        self._publish_change(product, "price", was_available)
+        return True
+    
+    def update_product_discount(self, product_id: str, discount: float) -> bool:
+        doc_id = self._find_doc_id(product_id)
+        if doc_id is None:
+            return False
+        product = self.products[doc_id]
+        was_available = product.is_available()
+        product.discount = discount
+        self._refresh_views(doc_id)
+        self._publish_change(product, "discount", was_available)
+        return True
+    
+    def update_product_stock(self, product_id: str, stock: int) -> bool:
+        doc_id = self._find_doc_id(product_id)
+        if doc_id is None:
+            return False
+        product = self.products[doc_id]
+        was_available = product.is_available()
+        product.stock = stock
+        self._refresh_views(doc_id)
+        self._publish_change(product, "stock", was_available)
+        return True
+    
+    def refresh_stock(self, product_id: str, was_available: bool) -> bool:
+        # For callers that set product.stock under their own locks: brings the
+        # views up to date and publishes the change, outside those locks
+        doc_id = self._find_doc_id(product_id)
+        if doc_id is None:
+            return False
+        self._refresh_views(doc_id)
+        self._publish_change(self.products[doc_id], "stock", was_available)
+        return True
+    
+    def update_product_popularity(self, product_id: str, popularity: float) -> bool:
+        doc_id = self._find_doc_id(product_id)
+        if doc_id is None:
+            return False
+        product = self.products[doc_id]
+        self._popularity[product_id] = popularity
+        self.popularity_version += 1
+        self._ensure_views()
+        if product.is_available():
+            self._popularity_view.set(doc_id, -popularity)
+        self._publish_change(product, "popularity", product.is_available())
+        return True
+    
+    def update_product_popularities(self, popularities: Dict[str, float]) -> int:
+        # Bulk form: the popularity view is rebuilt once instead of re-keyed per product
+        known = {}
+        for product_id, score in popularities.items():
+            doc_id = self._find_doc_id(product_id)
+            if doc_id is not None:
+                known[product_id] = (doc_id, score)
+        if not known:
+            return 0
+        self._ensure_views()
+        self._popularity.update((product_id, score) for product_id, (_, score) in known.items())
+        self.popularity_version += 1
+        # Keys come from the popularity map and the price view's in-stock doc ids,
+        # so no product is read for the rebuild
+        keys = {}
+        for product_id, score in self._popularity.items():
+            doc_id = self._find_doc_id(product_id) if score else None
+            if doc_id is not None:
+                keys[doc_id] = -score
+        self._popularity_view = SortedProductIndex()
+        self._popularity_view.bulk_set(
+            (doc_id, keys.get(doc_id, 0.0)) for doc_id in self._price_view.doc_ids())
+        if self.change_feed:
+            with self.change_feed.batch():
+                for doc_id, _ in known.values():
+                    product = self.products[doc_id]
+                    self._publish_change(product, "popularity", product.is_available())
+        return len(known)
+    
     def get_all_categories(self) -> List[Category]:
         return self.categories
     
     def get_category_by_id(self, category_id: str) -> Optional[Category]:
         return self._category_map.get(category_id)
     
+    def get_root_categories(self) -> List[Category]:
+        return [c for c in self.categories if not self._category_index.get_parent(c.category_id)]
+    
+    def get_subcategories(self, category_id: str) -> List[Category]:
+        return [c for cid in self._category_index.get_children(category_id)
+                if (c := self._category_map.get(cid))]
+    
+    def get_category_ancestors(self, category_id: str) -> List[str]:
+        return self._category_index.get_ancestors(category_id)
+    
+    def get_parent_category(self, category_id: str) -> Optional[Category]:
+        parent_id = self._category_index.get_parent(category_id)
+        return self._category_map.get(parent_id) if parent_id else None
+    
     def add_product(self, product: Product):
-        if product.product_id not in self._product_map:
+        if self._find_doc_id(product.product_id) is None:
+            doc_id = len(self.products)
+            self.products.append(product)
+            self._doc_ids[product.product_id] = doc_id
+            self._refresh_views(doc_id)
+            # A new in-stock product can enter feed-kept sections
+            if product.is_available():
+                self._publish_change(product, "available", True)
+    
+    def add_products(self, products: Iterable[Product]) -> int:
+        # Bulk install: the sorted views are rebuilt once instead of per product
+        self._ensure_views()
+        added_count = 0
+        available = []
+        for product in products:
+            if self._find_doc_id(product.product_id) is not None:
+                continue
+            added_count += 1
+            doc_id = len(self.products)
             self.products.append(product)
-            self._product_map[product.product_id] = product
+            self._doc_ids[product.product_id] = doc_id
+            if product.is_available():
+                available.append((doc_id, product))
+        
+        self._price_view.bulk_set((doc_id, p.get_discounted_price()) for doc_id, p in available)
+        self._discount_view.bulk_set((doc_id, -p.discount) for doc_id, p in available)
+        self._popularity_view.bulk_set(
+            (doc_id, -self._popularity.get(p.product_id, 0.0)) for doc_id, p in available)
+        self.catalog_version += 1
+        if self.change_feed and available:
+            with self.change_feed.batch():
+                for _, product in available:
+                    self._publish_change(product, "available", True)
+        return added_count
     
     def add_category(self, category: Category):
         if category.category_id not in self._category_map:
+            self._category_index.add_category(category.category_id, category.parent_id)
             self.categories.append(category)
             self._category_map[category.category_id] = category
+            self.category_version += 1
@@ -1,18 +1,38 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from models.PromoCode import PromoCode
+from models.PromoContext import PromoContext
 from datetime import datetime
+from services.PromoEngine import PromoEngine
+from services.PromoRuleCompiler import PromoRuleCompiler, Rule
 
 
 class PromoCodeService:
     def __init__(self, promo_codes: List[PromoCode] = None):
         self.promo_codes = promo_codes or []
         self._code_map = {pc.code.upper(): pc for pc in self.promo_codes}
+        self._engine = PromoEngine(self.promo_codes)
+        # Without a PromoContext only codes with no conditions can be offered
+        self._unconditional_engine = PromoEngine([pc for pc in self.promo_codes if not pc.has_conditions()])
+        self._rules: Dict[str, Rule] = {
+            pc.code.upper(): PromoRuleCompiler.compile(pc.conditions) for pc in self.promo_codes
+        }
     
     def get_promo_code_by_code(self, code: str) -> Optional[PromoCode]:
         return self._code_map.get(code.upper())
     
+    def get_rule(self, promo_code: PromoCode) -> Rule:
+        rule = self._rules.get(promo_code.code.upper())
+        if rule is None:
+            rule = PromoRuleCompiler.compile(promo_code.conditions)
+        return rule
+    
+    def is_eligible(self, promo_code: PromoCode, context: PromoContext,
+                    current_date: datetime = None) -> bool:
+        return promo_code.is_valid(context.order_value, current_date) and self.get_rule(promo_code)(context)
+    
     def validate_promo_code(self, code: str, order_value: float, 
-                           current_date: datetime = None) -> Tuple[bool, Optional[PromoCode]]:
+                           current_date: datetime = None,
+                           context: PromoContext = None) -> Tuple[bool, Optional[PromoCode]]:
         promo_code = self.get_promo_code_by_code(code)
         if promo_code is None:
             return False, None
@@ -21,14 +41,52 @@ class PromoCodeService:
             current_date = datetime.now()
         
         is_valid = promo_code.is_valid(order_value, current_date)
+        if is_valid and promo_code.has_conditions():
+            # Conditional codes can't be checked without knowing the cart and user
+            is_valid = context is not None and self.get_rule(promo_code)(context)
         return is_valid, promo_code if is_valid else None
     
     def get_all_active_promo_codes(self, current_date: datetime = None) -> List[PromoCode]:
-        if current_date is None:
-            current_date = datetime.now()
-        return [pc for pc in self.promo_codes if pc.is_active and pc.is_valid(0.0, current_date)]
+        return self._engine.get_active_promo_codes(current_date)
+    
+    def get_best_promo_code(self, order_value: float,
+                            current_date: datetime = None) -> Tuple[Optional[PromoCode], float]:
+        best = self._unconditional_engine.get_best_offer(order_value, current_date)
+        return best if best else (None, 0.0)
+    
+    def get_best_promo_codes(self, order_values: Sequence[float],
+                             current_date: datetime = None) -> List[Tuple[Optional[PromoCode], float]]:
+        return [best if best else (None, 0.0)
+                for best in self._unconditional_engine.get_best_offers(order_values, current_date)]
+    
+    def get_applicable_promo_codes(self, order_value: float,
+                                   current_date: datetime = None) -> List[Tuple[PromoCode, float]]:
+        return self._unconditional_engine.get_applicable_offers(order_value, current_date)
+    
+    def get_best_promo_code_for_context(self, context: PromoContext,
+                                        current_date: datetime = None) -> Tuple[Optional[PromoCode], float]:
+        # Offers come largest discount first, so the first one whose rule holds wins
+        for promo_code, discount in self._engine.get_applicable_offers(context.order_value, current_date):
+            if self.get_rule(promo_code)(context):
+                return promo_code, discount
+        return None, 0.0
     
     def add_promo_code(self, promo_code: PromoCode):
         if promo_code.code.upper() not in self._code_map:
+            rule = PromoRuleCompiler.compile(promo_code.conditions)
             self.promo_codes.append(promo_code)
-            self._code_map[promo_code.code.upper()] = promo_code
\ No newline at end of file
+            self._code_map[promo_code.code.upper()] = promo_code
+            self._rules[promo_code.code.upper()] = rule
+            self._rebuild_engines()
+    
+    def set_promo_code_active(self, code: str, is_active: bool) -> bool:
+        promo_code = self.get_promo_code_by_code(code)
+        if promo_code is None:
+            return False
+        promo_code.is_active = is_active
+        self._rebuild_engines()
+        return True
+    
+    def _rebuild_engines(self):
+        self._engine.rebuild(self.promo_codes)
+        self._unconditional_engine.rebuild([pc for pc in self.promo_codes if not pc.has_conditions()])
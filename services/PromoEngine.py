@@ -0,0 +1,98 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from models.PromoCode import PromoCode
+
+
+class _ActivePromoTable:
+    # Active promos ordered by min_order_value. For every prefix (the promos an
+    # order value qualifies for) the best fixed and best uncapped percentage
+    # promo are precomputed, so only capped percentage promos are compared
+    # per lookup.
+    def __init__(self, promo_codes: List[PromoCode]):
+        self.promo_codes = sorted(promo_codes, key=lambda pc: pc.min_order_value)
+        self.min_order_values = [pc.min_order_value for pc in self.promo_codes]
+        self.best_fixed: List[Optional[PromoCode]] = []
+        self.best_percentage: List[Optional[PromoCode]] = []
+        self.capped_percentage: List[Tuple[int, PromoCode]] = []
+
+        best_fixed = best_percentage = None
+        for position, promo_code in enumerate(self.promo_codes):
+            if promo_code.discount_type == "fixed":
+                if best_fixed is None or promo_code.discount_value > best_fixed.discount_value:
+                    best_fixed = promo_code
+            elif promo_code.discount_type == "percentage":
+                if promo_code.max_discount > 0:
+                    self.capped_percentage.append((position, promo_code))
+                elif best_percentage is None or promo_code.discount_value > best_percentage.discount_value:
+                    best_percentage = promo_code
+            self.best_fixed.append(best_fixed)
+            self.best_percentage.append(best_percentage)
+        self.capped_positions = [position for position, _ in self.capped_percentage]
+
+    def best_offer(self, order_value: float) -> Optional[Tuple[PromoCode, float]]:
+        eligible = bisect_right(self.min_order_values, order_value)
+        if not eligible:
+            return None
+
+        best: Optional[Tuple[PromoCode, float]] = None
+        candidates = [self.best_fixed[eligible - 1], self.best_percentage[eligible - 1]]
+        capped_eligible = bisect_left(self.capped_positions, eligible)
+        candidates.extend(promo_code for _, promo_code in self.capped_percentage[:capped_eligible])
+        for promo_code in candidates:
+            if promo_code is None:
+                continue
+            discount = promo_code.get_discount_amount(order_value)
+            if discount > 0 and (best is None or discount > best[1]):
+                best = (promo_code, discount)
+        return best
+
+
+# Batch promo evaluation. Validity windows are pre-indexed as a sorted list of
+# window boundaries: the set of active promos only changes at a boundary, so
+# the active table built for one instant is reused until the next boundary.
+class PromoEngine:
+    def __init__(self, promo_codes: Sequence[PromoCode] = None):
+        self.rebuild(promo_codes or [])
+
+    def rebuild(self, promo_codes: Sequence[PromoCode]):
+        self._promo_codes = [pc for pc in promo_codes if pc.is_active]
+        boundaries = set()
+        for promo_code in self._promo_codes:
+            if promo_code.valid_from:
+                boundaries.add(promo_code.valid_from)
+            if promo_code.valid_until:
+                boundaries.add(promo_code.valid_until)
+        self._boundaries: List[datetime] = sorted(boundaries)
+        self._tables: Dict[int, _ActivePromoTable] = {}
+
+    def _table_for(self, current_date: datetime) -> _ActivePromoTable:
+        window = bisect_right(self._boundaries, current_date)
+        on_boundary = window > 0 and self._boundaries[window - 1] == current_date
+        table = None if on_boundary else self._tables.get(window)
+        if table is None:
+            table = _ActivePromoTable([pc for pc in self._promo_codes if pc.is_active_at(current_date)])
+            # Validity is inclusive at both ends, so an exact boundary instant
+            # can differ from the window around it and is not cached
+            if not on_boundary:
+                self._tables[window] = table
+        return table
+
+    def get_active_promo_codes(self, current_date: datetime = None) -> List[PromoCode]:
+        return list(self._table_for(current_date or datetime.now()).promo_codes)
+
+    def get_best_offer(self, order_value: float,
+                       current_date: datetime = None) -> Optional[Tuple[PromoCode, float]]:
+        return self._table_for(current_date or datetime.now()).best_offer(order_value)
+
+    def get_best_offers(self, order_values: Sequence[float],
+                        current_date: datetime = None) -> List[Optional[Tuple[PromoCode, float]]]:
+        table = self._table_for(current_date or datetime.now())
+        return [table.best_offer(order_value) for order_value in order_values]
+
+    def get_applicable_offers(self, order_value: float,
+                              current_date: datetime = None) -> List[Tuple[PromoCode, float]]:
+        table = self._table_for(current_date or datetime.now())
+        eligible = table.promo_codes[:bisect_right(table.min_order_values, order_value)]
+        offers = [(pc, pc.get_discount_amount(order_value)) for pc in eligible]
+        return sorted([offer for offer in offers if offer[1] > 0], key=lambda offer: offer[1], reverse=True)
@@ -0,0 +1,137 @@
+from typing import Callable, List, Tuple
+from models.PromoContext import PromoContext
+
+Rule = Callable[[PromoContext], bool]
+
+
+def _always(context: PromoContext) -> bool:
+    return True
+
+
+# Compiles a promo's declarative conditions into a single predicate once, so
+# evaluating it per cart update is a few closure calls with no parsing or
+# dictionary lookups.
+#
+# Conditions are a dict; several keys in one dict must all hold.
+#   {"all": [...]} / {"any": [...]} / {"not": {...}}   combinators
+#   {"min_order_value": 499}         {"min_item_count": 3}    {"max_item_count": 10}
+#   {"category_in": ["dairy"]}       at least one cart item in any listed category
+#   {"sku_in": ["p1", "p2"]}         at least one listed product in the cart
+#   {"sku_all": ["p1", "p2"]}        every listed product in the cart
+#   {"exclude_sku": ["p9"]}          none of the listed products in the cart
+#   {"first_order": true}            {"payment_method_in": ["upi"]}
+#   {"user_segment_in": ["gold"]}    {"not_with": ["FREEDEL"]}  not stacked with these codes
+class PromoRuleCompiler:
+    # Cheaper checks run first inside "all"/"any"
+    _COSTS = {
+        "first_order": 0, "payment_method_in": 0, "min_order_value": 0, "min_item_count": 0,
+        "max_item_count": 0, "user_segment_in": 1, "not_with": 1, "category_in": 2,
+        "sku_in": 2, "sku_all": 2, "exclude_sku": 2, "all": 3, "any": 3, "not": 3,
+    }
+
+    @staticmethod
+    def compile(conditions: dict) -> Rule:
+        if not conditions:
+            return _always
+        if not isinstance(conditions, dict):
+            raise ValueError(f"Promo conditions must be a dict, got {type(conditions).__name__}")
+        rules = PromoRuleCompiler._compile_terms(conditions)
+        return PromoRuleCompiler._all(rules)
+
+    @staticmethod
+    def _compile_terms(conditions: dict) -> List[Rule]:
+        compiled: List[Tuple[int, Rule]] = []
+        for key, value in conditions.items():
+            if key not in PromoRuleCompiler._COSTS:
+                raise ValueError(f"Unknown promo condition: {key}")
+            compiled.append((PromoRuleCompiler._COSTS[key], PromoRuleCompiler._compile_term(key, value)))
+        compiled.sort(key=lambda entry: entry[0])
+        return [rule for _, rule in compiled]
+
+    @staticmethod
+    def _compile_term(key: str, value) -> Rule:
+        if key in ("all", "any"):
+            if not isinstance(value, list):
+                raise ValueError(f"'{key}' expects a list of conditions")
+            rules = [PromoRuleCompiler.compile(condition) for condition in value]
+            return PromoRuleCompiler._all(rules) if key == "all" else PromoRuleCompiler._any(rules)
+        if key == "not":
+            rule = PromoRuleCompiler.compile(value)
+            return lambda context: not rule(context)
+
+        if key == "min_order_value":
+            threshold = float(value)
+            return lambda context: context.order_value >= threshold
+        if key == "min_item_count":
+            minimum = int(value)
+            return lambda context: context.item_count >= minimum
+        if key == "max_item_count":
+            maximum = int(value)
+            return lambda context: context.item_count <= maximum
+        if key == "first_order":
+            expected = bool(value)
+            return lambda context: context.is_first_order == expected
+
+        values = frozenset(PromoRuleCompiler._as_list(key, value))
+        if key == "category_in":
+            return lambda context: not values.isdisjoint(context.category_ids)
+        if key == "sku_in":
+            return lambda context: not values.isdisjoint(context.product_ids)
+        if key == "sku_all":
+            return lambda context: values <= context.product_ids
+        if key == "exclude_sku":
+            return lambda context: values.isdisjoint(context.product_ids)
+        if key == "payment_method_in":
+            return lambda context: context.payment_method in values
+        if key == "user_segment_in":
+            return lambda context: not values.isdisjoint(context.user_segments)
+        # not_with
+        codes = frozenset(code.upper() for code in values)
+        return lambda context: codes.isdisjoint(context.applied_promo_codes)
+
+    @staticmethod
+    def _as_list(key: str, value) -> list:
+        if isinstance(value, str) or not hasattr(value, "__iter__"):
+            raise ValueError(f"'{key}' expects a list of values")
+        return list(value)
+
+    # Small arities get straight-line closures; a generator inside all()/any()
+    # costs more than the checks themselves
+    @staticmethod
+    def _all(rules: List[Rule]) -> Rule:
+        if not rules:
+            return _always
+        if len(rules) == 1:
+            return rules[0]
+        if len(rules) == 2:
+            first, second = rules
+            return lambda context: first(context) and second(context)
+        if len(rules) == 3:
+            first, second, third = rules
+            return lambda context: first(context) and second(context) and third(context)
+        rules = tuple(rules)
+        
+        def check_all(context: PromoContext) -> bool:
+            for rule in rules:
+                if not rule(context):
+                    return False
+            return True
+        return check_all
+
+    @staticmethod
+    def _any(rules: List[Rule]) -> Rule:
+        if not rules:
+            return lambda context: False
+        if len(rules) == 1:
+            return rules[0]
+        if len(rules) == 2:
+            first, second = rules
+            return lambda context: first(context) or second(context)
+        rules = tuple(rules)
+        
+        def check_any(context: PromoContext) -> bool:
+            for rule in rules:
+                if rule(context):
+                    return True
+            return False
+        return check_any
@@ -0,0 +1,59 @@
+from typing import Iterable, List
+from models.Order import Order
+from models.Product import Product
+from indexes.CoPurchaseIndex import CoPurchaseIndex
+from services.OrderService import OrderService
+from services.ProductService import ProductService
+
+
+# "Frequently bought together" and per-user recommendations served from the
+# precomputed neighbour lists of a CoPurchaseIndex. Built in bulk from order
+# history with build_from_orders, then kept current by OrderService's order
+# and status listeners as orders are created, cancelled or reinstated.
+class RecommendationService:
+    def __init__(self, product_service: ProductService, order_service: OrderService = None,
+                 index: CoPurchaseIndex = None, seed_count: int = 5):
+        self.product_service = product_service
+        self.order_service = order_service
+        self.index = index if index is not None else CoPurchaseIndex()
+        self.seed_count = seed_count
+        if order_service:
+            order_service.add_order_listener(self.record_order)
+            order_service.add_status_listener(self.record_status_change)
+
+    def record_order(self, order: Order):
+        if order.status != "cancelled":
+            self.index.add_basket(order.get_ordered_product_ids())
+
+    def record_status_change(self, order: Order, old_status: str):
+        if (order.status == "cancelled") == (old_status == "cancelled"):
+            return
+        if order.status == "cancelled":
+            self.index.remove_basket(order.get_ordered_product_ids())
+        else:
+            self.index.add_basket(order.get_ordered_product_ids())
+
+    def build_from_orders(self, orders: Iterable[Order]) -> int:
+        return self.index.build(order.get_ordered_product_ids()
+                                for order in orders if order.status != "cancelled")
+
+    def _available_products(self, product_ids: Iterable[str], limit: int) -> List[Product]:
+        products = []
+        for product_id in product_ids:
+            product = self.product_service.get_product_by_id(product_id)
+            if product and product.is_available():
+                products.append(product)
+                if len(products) >= limit:
+                    break
+        return products
+
+    def get_frequently_bought_together(self, product_id: str, limit: int = 10) -> List[Product]:
+        return self._available_products((other_id for other_id, _ in self.index.get_neighbors(product_id)),
+                                        limit)
+
+    def get_recommendations(self, user_id: str, limit: int = 10) -> List[Product]:
+        if not self.order_service:
+            return []
+        seeds = self.order_service.get_previously_ordered_products(user_id)[:self.seed_count]
+        # Over-fetch so out-of-stock candidates can be skipped
+        return self._available_products(self.index.recommend(seeds, limit * 2), limit)
@@ -0,0 +1,200 @@
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Callable, Dict, List, MutableMapping, Optional
+from models.Banner import Banner
+from models.ProductChange import ProductChange
+from models.Profile import Profile
+from models.UserSettings import UserSettings
+from factories.CartFactory import CartFactory
+from persistence.CartStore import CartStore
+from services.CartService import CartService
+from services.HomePageCache import HomePageCache
+from services.HomePageService import HomePageService
+from services.OrderService import OrderService
+from services.ProductChangeFeed import ProductChangeFeed
+from services.ProductService import ProductService
+from services.PromoCodeService import PromoCodeService
+from services.RecommendationService import RecommendationService
+from services.UserService import UserService
+
+
+# Per-user state kept by SessionManager between requests
+class UserSession:
+    __slots__ = ("user_id", "cart_service", "user_settings", "profile", "last_access")
+
+    def __init__(self, user_id: str, cart_service: CartService, user_settings: UserSettings,
+                 profile: Profile, last_access: float):
+        self.user_id = user_id
+        self.cart_service = cart_service
+        self.user_settings = user_settings
+        self.profile = profile
+        self.last_access = last_access
+
+
+# What a request works with: the user's session plus the shared services.
+# UserService and HomePageService are built on first use and wired to the
+# shared catalog, order store and section cache, never to fresh empty ones.
+class SessionHandle:
+    __slots__ = ("_manager", "session", "_user_service", "_home_page_service")
+
+    def __init__(self, manager: "SessionManager", session: UserSession):
+        self._manager = manager
+        self.session = session
+        self._user_service: Optional[UserService] = None
+        self._home_page_service: Optional[HomePageService] = None
+
+    @property
+    def user_id(self) -> str:
+        return self.session.user_id
+
+    @property
+    def cart_service(self) -> CartService:
+        return self.session.cart_service
+
+    @property
+    def user_settings(self) -> UserSettings:
+        return self.session.user_settings
+
+    @property
+    def user_service(self) -> UserService:
+        if self._user_service is None:
+            manager = self._manager
+            self._user_service = UserService(self.session.user_id, self.session.profile,
+                                             self.session.user_settings, self.session.cart_service,
+                                             manager.order_service, manager.product_service)
+        return self._user_service
+
+    @property
+    def home_page_service(self) -> HomePageService:
+        if self._home_page_service is None:
+            manager = self._manager
+            self._home_page_service = HomePageService(manager.product_service, self.session.cart_service,
+                                                      self.user_service, manager.banners,
+                                                      manager.section_cache, manager.change_feed,
+                                                      manager.recommendation_service)
+        return self._home_page_service
+
+
+# Process-wide owner of the shared catalog, order store and home page cache,
+# plus an LRU of per-user sessions. A session idle past idle_timeout, or the
+# least recently used one once max_sessions is reached, is evicted: its cart
+# goes to cart_store and its settings to settings_store, and both are
+# restored the next time the user is seen.
+class SessionManager:
+    def __init__(self, product_service: ProductService, order_service: OrderService = None,
+                 promo_code_service: PromoCodeService = None, banners: List[Banner] = None,
+                 section_cache: HomePageCache = None, cart_store: CartStore = None,
+                 settings_store: MutableMapping[str, UserSettings] = None,
+                 max_sessions: int = 50000, idle_timeout: float = 1800.0,
+                 persist_on_change: bool = False, change_feed: ProductChangeFeed = None,
+                 recommendation_service: RecommendationService = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.product_service = product_service
+        self.order_service = order_service or OrderService()
+        self.promo_code_service = promo_code_service
+        self.banners = banners or []
+        self.section_cache = section_cache or HomePageCache()
+        self.cart_store = cart_store
+        self.settings_store = settings_store if settings_store is not None else {}
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        # Otherwise carts are only written when their session is evicted
+        self.persist_on_change = persist_on_change
+        self.change_feed = change_feed
+        self.recommendation_service = recommendation_service
+        self._clock = clock
+        self._sessions: "OrderedDict[str, UserSession]" = OrderedDict()
+        self._lock = RLock()
+        self.evictions = 0
+        # One subscription fans changes out to open carts, rather than one per session
+        if change_feed:
+            change_feed.subscribe(self._on_product_changes)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _load_session(self, user_id: str, now: float) -> UserSession:
+        cart_service = CartService(
+            cart=CartFactory.create_cart(cart_id=user_id),
+            cart_store=self.cart_store if self.persist_on_change else None,
+            promo_code_service=self.promo_code_service,
+            product_service=self.product_service)
+        if self.cart_store:
+            cart = self.cart_store.load_cart(user_id)
+            if cart is not None:
+                cart_service.set_cart(cart)
+        user_settings = self.settings_store.get(user_id) or UserSettings(user_id=user_id)
+        return UserSession(user_id, cart_service, user_settings, Profile(user_id=user_id), now)
+
+    def _persist_session(self, session: UserSession):
+        if self.cart_store:
+            if session.cart_service.cart.items:
+                self.cart_store.save_cart(session.cart_service.cart)
+            else:
+                self.cart_store.delete(session.user_id)
+        self.settings_store[session.user_id] = session.user_settings
+
+    def _evict(self, session: UserSession):
+        session.cart_service.release_stock()
+        self._persist_session(session)
+        self.evictions += 1
+
+    def _on_product_changes(self, changes: List[ProductChange]):
+        with self._lock:
+            cart_services = [session.cart_service for session in self._sessions.values()
+                             if session.cart_service.cart.items]
+        for cart_service in cart_services:
+            items = cart_service.cart.items
+            relevant = [change for change in changes if change.product_id in items]
+            if relevant:
+                cart_service.on_product_changes(relevant)
+
+    def get_session(self, user_id: str) -> SessionHandle:
+        now = self._clock()
+        with self._lock:
+            session = self._sessions.get(user_id)
+            if session is None:
+                session = self._load_session(user_id, now)
+                self._sessions[user_id] = session
+            else:
+                self._sessions.move_to_end(user_id)
+            session.last_access = now
+            self._evict_overflow()
+        return SessionHandle(self, session)
+
+    def _evict_overflow(self):
+        while len(self._sessions) > self.max_sessions:
+            _, session = self._sessions.popitem(last=False)
+            self._evict(session)
+
+    def evict_idle(self, now: float = None) -> int:
+        now = self._clock() if now is None else now
+        evicted = 0
+        with self._lock:
+            # Oldest access first, so the scan stops at the first live session
+            while self._sessions:
+                user_id, session = next(iter(self._sessions.items()))
+                if now - session.last_access < self.idle_timeout:
+                    break
+                del self._sessions[user_id]
+                self._evict(session)
+                evicted += 1
+        return evicted
+
+    def end_session(self, user_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(user_id, None)
+            if session is None:
+                return False
+            self._evict(session)
+        return True
+
+    def close(self):
+        with self._lock:
+            while self._sessions:
+                _, session = self._sessions.popitem(last=False)
+                self._evict(session)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"active_sessions": len(self._sessions), "evictions": self.evictions}
@@ -0,0 +1,179 @@
+import heapq
+import itertools
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from services.InventoryService import InventoryService
+from services.ProductService import ProductService
+
+StockKey = Tuple[Optional[str], str]
+
+
+class _Reservation:
+    __slots__ = ("reservation_id", "store_id", "items", "expires_at")
+
+    def __init__(self, reservation_id: str, store_id: Optional[str],
+                 items: List[Tuple[str, int]], expires_at: float):
+        self.reservation_id = reservation_id
+        self.store_id = store_id
+        self.items = items
+        self.expires_at = expires_at
+
+
+# Holds stock for checkouts: try_reserve sets quantities aside, commit turns
+# them into a stock decrement and release (or TTL expiry) hands them back.
+# Counters are guarded by striped locks chosen by hashing (store_id, product_id),
+# so checkouts on different SKUs rarely share a lock; a reservation spanning
+# several SKUs takes their stripes in index order to stay deadlock free.
+# Without a store_id, Product.stock is the source of truth; with one, the
+# InventoryService stock for that store is. A commit changes the counters under
+# its stripes only; ProductService's views and change feed are brought up to
+# date after the stripes are released.
+class StockReservationService:
+    def __init__(self, product_service: ProductService, inventory_service: InventoryService = None,
+                 default_ttl_seconds: float = 600.0, stripe_count: int = 64,
+                 clock: Callable[[], float] = time.monotonic):
+        self.product_service = product_service
+        self.inventory_service = inventory_service
+        self.default_ttl_seconds = default_ttl_seconds
+        self._clock = clock
+        self._stripes = [Lock() for _ in range(stripe_count)]
+        self._reserved: Dict[StockKey, int] = {}
+        self._reservations: Dict[str, _Reservation] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_lock = Lock()
+        self._ids = itertools.count(1)
+
+    def _stripe_indexes(self, keys: Iterable[StockKey]) -> List[int]:
+        return sorted({hash(key) % len(self._stripes) for key in keys})
+
+    def _acquire(self, stripe_indexes: List[int]):
+        for index in stripe_indexes:
+            self._stripes[index].acquire()
+
+    def _release_stripes(self, stripe_indexes: List[int]):
+        for index in reversed(stripe_indexes):
+            self._stripes[index].release()
+
+    def _on_hand(self, store_id: Optional[str], product_id: str) -> int:
+        if store_id is not None:
+            if not self.inventory_service:
+                return 0
+            return self.inventory_service.get_stock(store_id, product_id)
+        product = self.product_service.get_product_by_id(product_id)
+        return product.stock if product else 0
+
+    def get_available_stock(self, product_id: str, store_id: str = None) -> int:
+        return max(0, self._on_hand(store_id, product_id) - self._reserved.get((store_id, product_id), 0))
+
+    def get_reserved_quantity(self, product_id: str, store_id: str = None) -> int:
+        return self._reserved.get((store_id, product_id), 0)
+
+    def try_reserve(self, items: Iterable[Tuple[str, int]], store_id: str = None,
+                    ttl_seconds: float = None) -> Optional[str]:
+        quantities: Dict[str, int] = {}
+        for product_id, quantity in items:
+            if quantity <= 0:
+                return None
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        if not quantities:
+            return None
+        self.expire_reservations()
+
+        keys = [(store_id, product_id) for product_id in quantities]
+        stripe_indexes = self._stripe_indexes(keys)
+        self._acquire(stripe_indexes)
+        try:
+            for key in keys:
+                if self._on_hand(store_id, key[1]) - self._reserved.get(key, 0) < quantities[key[1]]:
+                    return None
+            for key in keys:
+                self._reserved[key] = self._reserved.get(key, 0) + quantities[key[1]]
+        finally:
+            self._release_stripes(stripe_indexes)
+
+        reservation_id = f"res-{next(self._ids)}"
+        expires_at = self._clock() + (ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds)
+        self._reservations[reservation_id] = _Reservation(reservation_id, store_id,
+                                                          list(quantities.items()), expires_at)
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (expires_at, reservation_id))
+        return reservation_id
+
+    def _return_reserved(self, reservation: _Reservation):
+        keys = [(reservation.store_id, product_id) for product_id, _ in reservation.items]
+        stripe_indexes = self._stripe_indexes(keys)
+        self._acquire(stripe_indexes)
+        try:
+            for product_id, quantity in reservation.items:
+                key = (reservation.store_id, product_id)
+                remaining = self._reserved.get(key, 0) - quantity
+                if remaining > 0:
+                    self._reserved[key] = remaining
+                else:
+                    self._reserved.pop(key, None)
+        finally:
+            self._release_stripes(stripe_indexes)
+
+    def release(self, reservation_id: str) -> bool:
+        # Popping is atomic, so a reservation is released or committed exactly once
+        reservation = self._reservations.pop(reservation_id, None)
+        if reservation is None:
+            return False
+        self._return_reserved(reservation)
+        return True
+
+    def commit(self, reservation_id: str) -> bool:
+        reservation = self._reservations.pop(reservation_id, None)
+        if reservation is None:
+            return False
+        if reservation.expires_at <= self._clock():
+            self._return_reserved(reservation)
+            return False
+
+        store_id = reservation.store_id
+        keys = [(store_id, product_id) for product_id, _ in reservation.items]
+        stripe_indexes = self._stripe_indexes(keys)
+        # (product_id, was_available) for catalog stock changed by this commit
+        changed: List[Tuple[str, bool]] = []
+        self._acquire(stripe_indexes)
+        try:
+            for product_id, quantity in reservation.items:
+                key = (store_id, product_id)
+                remaining = self._reserved.get(key, 0) - quantity
+                if remaining > 0:
+                    self._reserved[key] = remaining
+                else:
+                    self._reserved.pop(key, None)
+                if store_id is not None:
+                    self.inventory_service.adjust_stock(store_id, product_id, -quantity)
+                    continue
+                product = self.product_service.get_product_by_id(product_id)
+                if product is not None:
+                    changed.append((product_id, product.is_available()))
+                    product.stock = max(0, product.stock - quantity)
+        finally:
+            self._release_stripes(stripe_indexes)
+        for product_id, was_available in changed:
+            self.product_service.refresh_stock(product_id, was_available)
+        return True
+
+    def expire_reservations(self, now: float = None) -> int:
+        now = self._clock() if now is None else now
+        heap = self._expiry_heap
+        # Unlocked peek: the common case has nothing due
+        if not heap or heap[0][0] > now:
+            return 0
+        due = []
+        with self._expiry_lock:
+            while heap and heap[0][0] <= now:
+                due.append(heapq.heappop(heap)[1])
+        expired = 0
+        for reservation_id in due:
+            reservation = self._reservations.get(reservation_id)
+            if reservation is not None and reservation.expires_at <= now and self.release(reservation_id):
+                expired += 1
+        return expired
+
+    def get_active_reservation_count(self) -> int:
+        return len(self._reservations)
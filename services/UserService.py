@@ -20,8 +20,9 @@ class UserService:
         self.product_service = product_service or ProductService()
     
     def get_order_history(self, limit: int = None) -> List[Order]:
-        orders = self.order_service.get_user_orders(self.user_id)
-        return orders[:limit] if limit else orders
+        if limit:
+            return self.order_service.get_user_orders_page(self.user_id, 0, limit)
+        return self.order_service.get_user_orders(self.user_id)
     
     def get_previously_ordered_products(self) -> List[Product]:
         product_ids = self.order_service.get_previously_ordered_products(self.user_id)
@@ -54,13 +55,12 @@ class UserService:
         return True
     
     def get_order_stats(self) -> dict:
-        pending = self.order_service.get_order_by_status(self.user_id, "pending")
-        delivered = self.order_service.get_order_by_status(self.user_id, "delivered")
+        stats = self.order_service.get_user_stats(self.user_id)
         return {
-            "total_orders": self.order_service.get_total_orders_count(self.user_id),
-            "total_spent": self.order_service.get_total_spent(self.user_id),
-            "pending_orders": len(pending),
-            "delivered_orders": len(delivered)
+            "total_orders": stats.total_orders,
+            "total_spent": stats.get_total_spent(),
+            "pending_orders": stats.get_status_count("pending"),
+            "delivered_orders": stats.get_status_count("delivered")
         }
     
     def add_to_wishlist(self, product_id: str) -> bool:
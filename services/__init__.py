@@ -4,6 +4,22 @@ from services.PromoCodeService import PromoCodeService
 from services.OrderService import OrderService
 from services.UserService import UserService
 from services.HomePageService import HomePageService
+from services.HomePageCache import HomePageCache
+from services.CatalogLoader import CatalogLoader, LoadReport
+from services.PromoEngine import PromoEngine
+from services.PromoRuleCompiler import PromoRuleCompiler
+from services.InventoryService import InventoryService
+from services.StockReservationService import StockReservationService
+from services.ProductChangeFeed import ProductChangeFeed, AsyncChangeSubscription
+from services.AsyncServiceAdapter import AsyncServiceAdapter
+from services.AsyncProductService import AsyncProductService
+from services.AsyncOrderService import AsyncOrderService
+from services.AsyncUserService import AsyncUserService
+from services.AsyncHomePageService import AsyncHomePageService
+from services.SessionManager import SessionManager, SessionHandle, UserSession
+from services.PopularityService import PopularityService
+from services.RecommendationService import RecommendationService
+from services.BatchExecutor import BatchExecutor
 
 __all__ = [
     'CartService',
@@ -11,6 +27,26 @@ __all__ = [
     'PromoCodeService',
     'OrderService',
     'UserService',
-    'HomePageService'
+    'HomePageService',
+    'HomePageCache',
+    'CatalogLoader',
+    'LoadReport',
+    'PromoEngine',
+    'PromoRuleCompiler',
+    'InventoryService',
+    'StockReservationService',
+    'ProductChangeFeed',
+    'AsyncChangeSubscription',
+    'AsyncServiceAdapter',
+    'AsyncProductService',
+    'AsyncOrderService',
+    'AsyncUserService',
+    'AsyncHomePageService',
+    'SessionManager',
+    'SessionHandle',
+    'UserSession',
+    'PopularityService',
+    'RecommendationService',
+    'BatchExecutor'
 ]
 
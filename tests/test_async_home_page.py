@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta
+from models.Banner import Banner
+from models.Order import Order, OrderItem
+from models.Product import Product, Category
+from services.AsyncHomePageService import AsyncHomePageService
+from services.AsyncOrderService import AsyncOrderService
+from services.AsyncProductService import AsyncProductService
+from services.AsyncUserService import AsyncUserService
+from services.HomePageCache import HomePageCache
+from services.HomePageService import HomePageService
+from services.OrderService import OrderService
+from services.ProductService import ProductService
+from services.UserService import UserService
+
+
+def make_services():
+    products = [Product(f"p{i}", f"Product {i}", "", "c", 10.0 + i, float(i % 4) * 10, "1kg",
+                        stock=i % 3) for i in range(30)]
+    product_service = ProductService(products, [Category("c", "C")])
+    start = datetime(2026, 1, 1)
+    orders = [Order(f"o{i}", "u1", start + timedelta(days=i), "delivered", 50.0, "", "upi",
+                    [OrderItem(f"o{i}", f"p{(i * 7) % 30}", 2, 10.0), OrderItem(f"o{i}", f"p{i}", 1, 10.0)])
+              for i in range(6)]
+    order_service = OrderService(orders)
+    user_service = UserService("u1", order_service=order_service, product_service=product_service)
+    return product_service, order_service, user_service
+
+
+def make_async_page(product_service, order_service, user_service, offload=True, **options):
+    async_products = AsyncProductService(product_service, offload=offload)
+    async_orders = AsyncOrderService(order_service, offload=offload)
+    async_user = AsyncUserService(user_service, async_orders, async_products)
+    return AsyncHomePageService(async_products, user_service=async_user,
+                                banners=[Banner("b1", ""), Banner("b2", "", is_active=False)], **options)
+
+
+def section_ids(data):
+    return {name: [getattr(item, "product_id", None) or getattr(item, "banner_id", None)
+                   or item.category_id for item in value]
+            for name, value in data.items() if isinstance(value, list) and name != "degraded_sections"}
+
+
+def test_async_page_matches_the_sync_page():
+    product_service, order_service, user_service = make_services()
+    sync_page = HomePageService(product_service, user_service=user_service,
+                                banners=[Banner("b1", ""), Banner("b2", "", is_active=False)])
+    expected = section_ids(sync_page.get_homepage_data())
+    for offload in (True, False):
+        page = make_async_page(product_service, order_service, user_service, offload)
+        data = asyncio.run(page.get_homepage_data())
+        assert data["degraded_sections"] == []
+        assert section_ids(data) == expected
+
+
+def test_sync_and_async_pages_share_cached_sections():
+    product_service, order_service, user_service = make_services()
+    cache = HomePageCache()
+    HomePageService(product_service, section_cache=cache).get_homepage_data()
+    misses = cache.misses
+    page = make_async_page(product_service, order_service, user_service, section_cache=cache)
+    asyncio.run(page.get_homepage_data())
+    assert cache.misses == misses
+
+
+class SlowProductService(AsyncProductService):
+    delay = 0.0
+
+    async def get_top_discounted_products(self, limit: int = 10, offset: int = 0):
+        await asyncio.sleep(self.delay)
+        return await super().get_top_discounted_products(limit, offset)
+
+
+def test_slow_section_is_served_from_its_last_good_value():
+    product_service, _, _ = make_services()
+    async_products = SlowProductService(product_service, offload=False)
+    page = AsyncHomePageService(async_products, default_timeout=0.05)
+    first = asyncio.run(page.get_homepage_data())
+    assert first["degraded_sections"] == [] and first["deals_products"]
+    product_service.update_product_discount("p1", 60.0)
+    async_products.delay = 1.0
+    second = asyncio.run(page.get_homepage_data())
+    assert second["degraded_sections"] == ["deals_products"]
+    assert second["deals_products"] == first["deals_products"]
+    assert second["featured_products"] == product_service.get_products_sorted_by_popularity(20)
+    async_products.delay = 0.0
+    third = asyncio.run(page.get_homepage_data())
+    assert third["degraded_sections"] == []
+    assert third["deals_products"][0].product_id == "p1"
@@ -0,0 +1,83 @@
+from collections import Counter
+from datetime import datetime, timedelta
+import pytest
+from models.Order import Order, OrderItem
+from models.Product import Product, Category
+from persistence.CatalogFile import CatalogFile
+from services.BatchExecutor import BatchExecutor
+from services.ProductService import ProductService
+
+
+# Tasks run in the worker processes, so they live at module level
+def catalog_stock(catalog_file: CatalogFile, start: int, end: int, minimum: int):
+    return [(catalog_file.get_product_id(doc_id), catalog_file.stock[doc_id])
+            for doc_id in range(start, end) if catalog_file.stock[doc_id] >= minimum]
+
+
+def units_sold(orders, status: str):
+    return Counter({(order.order_id, item.product_id): item.quantity
+                    for order in orders if order.status == status for item in order.order_items})
+
+
+def make_products(count: int):
+    return [Product(f"p{i}", f"Item {['milk', 'bread', 'rice'][i % 3]} {i}", "", f"c{i % 4}",
+                    10.0 + i, 0.0, "1kg", f"desc {i}", i % 5)
+            for i in range(count)]
+
+
+def make_orders(count: int):
+    start = datetime(2026, 2, 1)
+    return [Order(f"o{i}", f"u{i % 7}", start + timedelta(minutes=i), ["placed", "delivered"][i % 2],
+                  25.0, "addr", "upi", [OrderItem(f"o{i}", f"p{(i * j) % 50}", j, 5.0) for j in range(1, 4)])
+            for i in range(count)]
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with BatchExecutor(max_workers=2, shards_per_worker=3) as executor:
+        yield executor
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    CatalogFile.compile(path, make_products(250), [Category(f"c{i}", f"C{i}") for i in range(4)])
+    catalog_file = CatalogFile(path)
+    yield catalog_file
+    catalog_file.close()
+
+
+def test_shard_ranges_cover_every_index_once(executor):
+    for count in (0, 1, 5, 6, 7, 250):
+        ranges = executor.shard_ranges(count)
+        covered = [i for start, end in ranges for i in range(start, end)]
+        assert covered == list(range(count))
+        assert len(ranges) == max(1, min(count, 6))
+
+
+def test_map_catalog_matches_inline(executor, catalog):
+    shards = executor.map_catalog(catalog, catalog_stock, 2)
+    assert len(shards) == 6
+    assert [row for shard in shards for row in shard] == catalog_stock(catalog, 0, len(catalog), 2)
+
+
+def test_map_orders_matches_inline(executor):
+    orders = make_orders(300)
+    merged = Counter()
+    for partial in executor.map_orders(orders, units_sold, "delivered"):
+        merged.update(partial)
+    assert merged == units_sold(orders, "delivered")
+    assert executor.map_orders([], units_sold, "delivered") == [Counter()]
+
+
+def test_sharded_index_build_matches_inline(executor, catalog):
+    inline = ProductService(catalog_file=catalog)
+    inline.build_indexes()
+    sharded = ProductService(catalog_file=catalog)
+    sharded.build_indexes(executor)
+    for query in ("milk", "ead 1", "desc 24", "z"):
+        assert [p.product_id for p in sharded.search_products(query)] == [
+            p.product_id for p in inline.search_products(query)]
+    for category_id in ("c0", "c3"):
+        assert [p.product_id for p in sharded.get_products_by_category(category_id)] == [
+            p.product_id for p in inline.get_products_by_category(category_id)]
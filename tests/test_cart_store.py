@@ -0,0 +1,120 @@
+import threading
+import pytest
+from models.Cart import Cart, CartItem
+from models.PromoCode import PromoCode
+from persistence.CartStore import CartStore, FileCartStore, SQLiteCartStore
+from persistence.WriteBehindCartStore import WriteBehindCartStore
+from services.CartService import CartService
+from services.PromoCodeService import PromoCodeService
+
+
+def make_cart(cart_id: str = "cart-1") -> Cart:
+    cart = Cart(cart_id, minimum_order_value=99.0, delivery_charges=20.0)
+    cart.add_item(CartItem("p1", 2, 50.0, "Milk", "milk.png", "1L"))
+    cart.add_item(CartItem("p2", 1, 35.5, "Bread", "", "400g"))
+    return cart
+
+
+def assert_same_cart(restored: Cart, cart: Cart):
+    assert restored.cart_id == cart.cart_id
+    assert restored.minimum_order_value == cart.minimum_order_value
+    assert restored.delivery_charges == cart.delivery_charges
+    assert {pid: (i.quantity, i.unit_price, i.product_name, i.weight) for pid, i in restored.items.items()} == {
+        pid: (i.quantity, i.unit_price, i.product_name, i.weight) for pid, i in cart.items.items()}
+    assert restored.get_subtotal() == cart.get_subtotal()
+    assert restored.get_item_count() == cart.get_item_count()
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    store = FileCartStore(str(tmp_path / "carts")) if request.param == "file" else \
+        SQLiteCartStore(str(tmp_path / "carts.db"))
+    yield store
+    store.close()
+
+
+def test_cart_store_is_abstract():
+    with pytest.raises(TypeError):
+        CartStore()
+
+
+def test_backends_round_trip_and_delete(store):
+    cart = make_cart("../escape attempt")
+    store.save_cart(cart)
+    assert_same_cart(store.load_cart(cart.cart_id), cart)
+    store.delete(cart.cart_id)
+    assert store.load_cart(cart.cart_id) is None
+
+
+def test_write_behind_survives_restart(tmp_path):
+    store = WriteBehindCartStore(FileCartStore(str(tmp_path)), flush_interval=60)
+    cart = make_cart()
+    for quantity in range(1, 6):
+        cart.update_item_quantity("p1", quantity)
+        store.save_cart(cart)
+    assert store.pending_count() == 1
+    assert_same_cart(store.load_cart(cart.cart_id), cart)
+    store.close()
+    assert store.writes_flushed == 1
+    assert_same_cart(FileCartStore(str(tmp_path)).load_cart(cart.cart_id), cart)
+
+
+class SlowStore(FileCartStore):
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, cart_id: str, data: bytes):
+        self.writing.set()
+        self.release.wait(5)
+        super().write(cart_id, data)
+
+
+def test_read_during_flush_sees_the_newest_cart(tmp_path):
+    FileCartStore(str(tmp_path)).save_cart(make_cart())
+    backing = SlowStore(str(tmp_path))
+    store = WriteBehindCartStore(backing, flush_interval=60)
+    new = make_cart()
+    new.update_item_quantity("p1", 7)
+    store.save_cart(new)
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+    assert backing.writing.wait(5)
+    assert store.load_cart(new.cart_id).items["p1"].quantity == 7
+    backing.release.set()
+    flusher.join()
+    assert store.load_cart(new.cart_id).items["p1"].quantity == 7
+    store.close()
+
+
+def test_restored_promo_codes_are_resolved_again(tmp_path):
+    store = FileCartStore(str(tmp_path))
+    promo_service = PromoCodeService([PromoCode("SAVE10", "percentage", 10.0)])
+    cart = make_cart()
+    service = CartService(cart, cart_store=store, promo_code_service=promo_service)
+    service.apply_promo_code(promo_service.get_promo_code_by_code("SAVE10"))
+    assert cart.discount_amount == pytest.approx(13.55)
+
+    restored = CartService(store.load_cart(cart.cart_id), promo_code_service=promo_service)
+    assert restored.cart.applied_promo_code == "SAVE10"
+    assert restored.cart.discount_amount == pytest.approx(13.55)
+    restored.cart.update_item_quantity("p1", 1)
+    assert restored.cart.discount_amount == pytest.approx(8.55)
+
+    service = CartService(cart_store=store, promo_code_service=promo_service)
+    assert service.restore_cart(cart.cart_id)
+    assert service.cart.get_applied_promo().code == "SAVE10"
+
+
+def test_codes_are_kept_without_a_promo_service(tmp_path):
+    store = FileCartStore(str(tmp_path))
+    cart = make_cart()
+    cart.apply_promo(PromoCode("SAVE10", "percentage", 10.0))
+    store.save_cart(cart)
+
+    service = CartService(store.load_cart(cart.cart_id))
+    assert service.cart.applied_promo_code == "SAVE10"
+    assert service.cart.discount_amount == pytest.approx(13.55)
+    store.save_cart(service.cart)
+    assert store.load_cart(cart.cart_id).applied_promo_code == "SAVE10"
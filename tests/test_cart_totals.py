@@ -0,0 +1,56 @@
+import random
+import pytest
+from models.Cart import Cart, CartItem
+from models.PromoCode import PromoCode
+
+PRICES = [0.1, 0.2, 0.3, 9.99, 19.95, 49.5, 99.0]
+
+
+def recompute(cart: Cart):
+    subtotal = round(sum(item.quantity * item.unit_price for item in cart.items.values()), 2)
+    return subtotal, sum(item.quantity for item in cart.items.values())
+
+
+def test_running_totals_match_recomputation(monkeypatch):
+    monkeypatch.setattr(Cart, "debug_checks", True)
+    rng = random.Random(12)
+    cart = Cart("c1")
+    for step in range(2000):
+        product_id = f"p{rng.randrange(15)}"
+        action = rng.randrange(5)
+        if action == 0:
+            cart.add_item(CartItem(product_id, rng.randint(1, 4), rng.choice(PRICES)))
+        elif action == 1:
+            cart.remove_item(product_id)
+        elif action == 2:
+            cart.update_item_quantity(product_id, rng.randint(-1, 6))
+        elif action == 3:
+            cart.update_item_price(product_id, rng.choice(PRICES))
+        elif step % 100 == 0:
+            cart.clear()
+        assert (cart.get_subtotal(), cart.get_item_count()) == recompute(cart)
+
+
+def test_debug_checks_report_drift(monkeypatch):
+    monkeypatch.setattr(Cart, "debug_checks", True)
+    cart = Cart("c1")
+    cart.add_item(CartItem("p1", 2, 5.0))
+    # Changed behind the cart's back
+    cart.items["p1"].quantity = 3
+    with pytest.raises(AssertionError, match="drifted"):
+        cart.get_subtotal()
+
+
+def test_promo_discount_follows_the_subtotal():
+    cart = Cart("c1")
+    cart.apply_promo(PromoCode("TEN", "percentage", 10, max_discount=5.0))
+    cart.add_item(CartItem("p1", 2, 10.0))
+    assert cart.discount_amount == 2.0
+    cart.add_item(CartItem("p2", 1, 80.0))
+    assert cart.discount_amount == 5.0
+    cart.remove_item("p2")
+    cart.update_item_price("p1", 5.0)
+    assert cart.discount_amount == 1.0
+    assert cart.get_total() == 9.0
+    cart.clear()
+    assert cart.discount_amount == 0.0 and cart.applied_promo_code == ""
@@ -0,0 +1,101 @@
+import random
+import pytest
+from models.Product import Product, Category
+from persistence.CatalogFile import CatalogFile
+from services.ProductService import ProductService
+
+CATEGORIES = [Category(f"c{i}", f"Cat {i}", parent_id="" if i < 3 else f"c{i % 3}") for i in range(9)]
+
+
+def make_products(count: int, seed: int = 24, prefix: str = "p"):
+    rng = random.Random(seed)
+    return [Product(f"{prefix}{i:04d}", f"Item {rng.choice(['milk', 'bread', 'rice'])} ü{i}", f"img{i}",
+                    f"c{rng.randrange(9)}", round(rng.uniform(5, 500), 2), rng.choice([0, 0, 5, 10.5]),
+                    rng.choice(["1kg", "500g"]), f"desc {i}" if i % 4 else "", rng.randrange(0, 4), 10,
+                    [f"a{i}.png", "b.png"] if i % 3 == 0 else None,
+                    {"c1": ["c4"]} if i % 7 == 0 else None)
+            for i in range(count)]
+
+
+def fields(product: Product):
+    return (product.product_id, product.name, product.image, product.category_id, product.price,
+            product.discount, product.weight, product.description, product.stock,
+            product.max_quantity, product.images, product.categories)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    CatalogFile.compile(path, make_products(400), CATEGORIES)
+    catalog_file = CatalogFile(path)
+    yield catalog_file
+    catalog_file.close()
+
+
+def test_compiled_catalog_round_trips(catalog):
+    products = make_products(400)
+    assert len(catalog) == len(products)
+    for doc_id, product in enumerate(products):
+        assert fields(catalog.get_product(doc_id)) == fields(product)
+        assert catalog.get_product_id(doc_id) == product.product_id
+    assert [(c.category_id, c.parent_id) for c in catalog.get_categories()] == [
+        (c.category_id, c.parent_id) for c in CATEGORIES]
+    assert list(catalog.price) == [p.price for p in products]
+    assert list(catalog.stock) == [p.stock for p in products]
+    assert list(catalog.discounted_price) == [p.get_discounted_price() for p in products]
+    assert catalog.get_string_column("category_id") == [p.category_id for p in products]
+
+
+def test_find_doc_id(catalog):
+    rng = random.Random(1)
+    doc_ids = list(range(len(catalog)))
+    rng.shuffle(doc_ids)
+    for doc_id in doc_ids:
+        assert catalog.find_doc_id(f"p{doc_id:04d}") == doc_id
+    for missing in ("", "p", "p9999", "q0001", "p00001"):
+        assert catalog.find_doc_id(missing) is None
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 128)
+    with pytest.raises(ValueError):
+        CatalogFile(str(path))
+
+
+def ids(products):
+    return [p.product_id for p in products]
+
+
+def check_parity(eager: ProductService, lazy: ProductService):
+    assert ids(eager.get_products_sorted_by_price(limit=40)) == ids(lazy.get_products_sorted_by_price(limit=40))
+    assert ids(eager.get_top_discounted_products(limit=40)) == ids(lazy.get_top_discounted_products(limit=40))
+    assert ids(eager.get_products_sorted_by_popularity(limit=40)) == ids(
+        lazy.get_products_sorted_by_popularity(limit=40))
+    for query in ("milk", "bread ü1", "ric", "desc 3"):
+        assert ids(eager.search_products(query)) == ids(lazy.search_products(query)), query
+    for category_id in ("c1", "c4"):
+        assert ids(eager.get_products_by_category(category_id)) == ids(lazy.get_products_by_category(category_id))
+        assert ids(eager.find_products(category_id=category_id, min_price=50, sort_by="price", limit=20)) == ids(
+            lazy.find_products(category_id=category_id, min_price=50, sort_by="price", limit=20))
+
+
+def test_product_service_over_a_catalog_file_matches_one_over_a_list(catalog):
+    eager = ProductService(make_products(400), list(CATEGORIES))
+    lazy = ProductService(catalog_file=catalog)
+    assert lazy.products.loaded_count == 0
+    check_parity(eager, lazy)
+    rng = random.Random(7)
+    for _ in range(300):
+        product_id = f"p{rng.randrange(400):04d}"
+        change, value = rng.randrange(4), rng.randrange(400)
+        for service in (eager, lazy):
+            (service.update_product_price, service.update_product_stock, service.update_product_discount,
+             service.update_product_popularity)[change](product_id, value % 3 if change == 1 else value)
+    for service in (eager, lazy):
+        service.add_products(make_products(20, seed=5, prefix="x"))
+    check_parity(eager, lazy)
+    assert fields(lazy.get_product_by_id("x0003")) == fields(eager.get_product_by_id("x0003"))
+    assert lazy.get_product_by_id("missing") is None
+    assert [c.category_id for c in lazy.get_subcategories("c1")] == ["c4", "c7"]
+    assert lazy.products.loaded_count < len(catalog)
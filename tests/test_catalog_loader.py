@@ -0,0 +1,66 @@
+import io
+import json
+from services.CatalogLoader import CatalogLoader
+from services.ProductService import ProductService
+
+
+def jsonl(*rows) -> io.StringIO:
+    return io.StringIO("\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows))
+
+
+def product_row(product_id: str, **fields) -> dict:
+    row = {"product_id": product_id, "name": f"Product {product_id}", "category_id": "dairy",
+           "price": 40.0, "discount": 5.0, "weight": "1L", "stock": 4, "images": ["a.png"]}
+    row.update(fields)
+    return row
+
+
+def test_jsonl_rows_are_loaded_and_indexed():
+    service = ProductService()
+    report = CatalogLoader(service, batch_size=2).load_products_jsonl(jsonl(
+        product_row("p1", name="Fresh Milk"), product_row("p2"), product_row("p3")))
+    assert report.loaded == 3 and report.rejected == []
+    assert [p.product_id for p in service.search_products("milk")] == ["p1"]
+    assert len(service.get_products_by_category("dairy")) == 3
+
+
+def test_invalid_rows_are_rejected_with_a_reason():
+    service = ProductService()
+    report = CatalogLoader(service).load_products_jsonl(jsonl(
+        product_row("ok"),
+        "{not json",
+        product_row("float-stock", stock=5.0),
+        product_row("text-max", max_quantity="5"),
+        product_row("text-price", price="40"),
+        product_row("list-name", name=["Milk"]),
+        product_row("int-description", description=7),
+        product_row("text-images", images="a.png"),
+        product_row("mixed-images", images=["a.png", 3]),
+        product_row("bad-categories", categories={"dairy": "milk"}),
+        product_row("negative", stock=-1),
+        product_row("ok")))
+    assert report.loaded == 1
+    reasons = dict(report.rejected)
+    assert sorted(reasons) == list(range(2, 13))
+    assert reasons[3] == "stock must be a whole number"
+    assert reasons[4] == "max_quantity must be a whole number"
+    assert reasons[5] == "price must be a number"
+    assert reasons[6] == "name must be a string"
+    assert reasons[7] == "description must be a string"
+    assert "images" in reasons[8]
+    assert reasons[9] == "images must be a list of strings"
+    assert reasons[12] == "duplicate product_id ok"
+    assert [p.product_id for p in service.find_products(sort_by="price")] == ["ok"]
+
+
+def test_csv_rows_are_converted_and_validated():
+    service = ProductService()
+    csv_data = io.StringIO(
+        "product_id,name,category_id,price,discount,weight,stock,max_quantity,images,categories\n"
+        "p1,Milk,dairy,40,5,1L,3,5,a.png|b.png,{\"dairy\": [\"milk\"]}\n"
+        "p2,Bread,bakery,abc,0,400g,3,5,,\n")
+    report = CatalogLoader(service).load_products_csv(csv_data)
+    assert report.loaded == 1 and [row for row, _ in report.rejected] == [3]
+    product = service.get_product_by_id("p1")
+    assert product.images == ["a.png", "b.png"] and product.stock == 3
+    assert product in service.get_products_by_category("milk")
@@ -0,0 +1,64 @@
+import random
+from indexes.CatalogSnapshot import CatalogSnapshot
+from models.Product import Product
+from services.ProductService import ProductService
+
+
+def make_products(count: int = 300, seed: int = 3):
+    rng = random.Random(seed)
+    return [Product(product_id=f"p{i}", name=f"item {i}", image="", category_id=f"c{i % 7}",
+                    price=float(rng.randint(10, 500)), discount=float(rng.choice([0, 5, 10, 25])),
+                    weight="1kg", stock=rng.randint(0, 5), max_quantity=rng.randint(1, 10))
+            for i in range(count)]
+
+
+def brute_force(products, category_id=None, min_price=None, max_price=None):
+    return [p for p in products if p.is_available()
+            and (category_id is None or p.category_id == category_id)
+            and (min_price is None or p.get_discounted_price() >= min_price)
+            and (max_price is None or p.get_discounted_price() <= max_price)]
+
+
+def test_select_and_top_k_match_brute_force():
+    products = make_products()
+    snapshot = CatalogSnapshot(products)
+    for category_id in (None, "c3"):
+        for min_price, max_price in ((None, None), (100.0, None), (None, 250.0), (50.0, 300.0)):
+            code = snapshot.get_category_code(category_id) if category_id else None
+            doc_ids = snapshot.select(None, True, min_price, max_price, code)
+            expected = brute_force(products, category_id, min_price, max_price)
+            assert snapshot.to_products(doc_ids) == expected
+            cheapest = snapshot.to_products(snapshot.top_k(doc_ids, "price", 10))
+            assert [p.get_discounted_price() for p in cheapest] == sorted(
+                p.get_discounted_price() for p in expected)[:10]
+            best = snapshot.to_products(snapshot.top_k(doc_ids, "discount", 10, descending=True))
+            assert [p.discount for p in best] == sorted((p.discount for p in expected), reverse=True)[:10]
+
+
+def test_patched_snapshot_sees_changes_and_leaves_original():
+    products = make_products(20)
+    snapshot = CatalogSnapshot(products)
+    before = snapshot.select()
+    products[0].stock = 0 if products[0].stock else 3
+    products.append(Product("p20", "new", "", "c1", 10.0, 0.0, "1kg", stock=2))
+    patched = snapshot.patched(products, [0])
+    assert snapshot.select() == before
+    assert patched.to_products(patched.select()) == brute_force(products)
+
+
+def test_float_stock_does_not_break_listings():
+    products = make_products(10)
+    products.append(Product("float", "float stock", "", "c1", 20.0, 0.0, "1kg", stock=5.0, max_quantity=3.0))
+    service = ProductService(products)
+    assert "float" in {p.product_id for p in service.find_products(category_id="c1", sort_by="price")}
+    assert "float" in {p.product_id for p in service.find_products(min_price=0.0)}
+
+
+def test_unreadable_numbers_are_stored_as_zero():
+    products = [Product("text", "", "", "c1", "30", 0.0, "1kg", stock="5", max_quantity="5.0"),
+                Product("bad", "", "", "c1", 40.0, 0.0, "1kg", stock="many", max_quantity=None)]
+    snapshot = CatalogSnapshot(products)
+    assert list(snapshot.stock) == [5, 0]
+    assert list(snapshot.max_quantity) == [5, 0]
+    assert snapshot.price[0] == 30.0
+    assert snapshot.select() == [0]
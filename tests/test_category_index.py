@@ -0,0 +1,80 @@
+import random
+import pytest
+from models.Product import Product, Category
+from indexes.CategoryIndex import CategoryIndex
+from services.ProductService import ProductService
+
+# fruit > citrus > lemons, fruit > berries, dairy > cheese, bakery
+CATEGORIES = [Category("fruit", "Fruit"), Category("citrus", "Citrus", parent_id="fruit"),
+              Category("lemons", "Lemons", parent_id="citrus"),
+              Category("berries", "Berries", parent_id="fruit"),
+              Category("dairy", "Dairy"), Category("cheese", "Cheese", parent_id="dairy"),
+              Category("bakery", "Bakery")]
+
+
+def make_products(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    ids = [c.category_id for c in CATEGORIES]
+    products = []
+    for i in range(count):
+        extra = {}
+        if rng.random() < 0.4:
+            extra[rng.choice(ids)] = rng.sample(ids, rng.randint(0, 2))
+        products.append(Product(f"p{i}", f"Product {i}", "", rng.choice(ids + [""]), 1.0, 0.0,
+                                "1kg", stock=1, categories=extra))
+    return products
+
+
+def descendants(category_id: str):
+    found = {category_id}
+    changed = True
+    while changed:
+        changed = False
+        for category in CATEGORIES:
+            if category.parent_id in found and category.category_id not in found:
+                found.add(category.category_id)
+                changed = True
+    return found
+
+
+def brute_force(products, category_id: str, include_subcategories: bool):
+    wanted = descendants(category_id) if include_subcategories else {category_id}
+    return [p.product_id for p in products if wanted & set(p.get_category_ids())]
+
+
+def test_category_listing_matches_brute_force():
+    products = make_products(400)
+    service = ProductService(products, CATEGORIES)
+    for category in CATEGORIES:
+        for include_subcategories in (True, False):
+            expected = brute_force(products, category.category_id, include_subcategories)
+            listed = service.get_products_by_category(category.category_id, include_subcategories)
+            assert [p.product_id for p in listed] == expected
+            assert service.get_product_count_by_category(
+                category.category_id, include_subcategories) == len(expected)
+
+
+def test_category_tree_navigation():
+    service = ProductService([], CATEGORIES)
+    assert [c.category_id for c in service.get_root_categories()] == ["fruit", "dairy", "bakery"]
+    assert [c.category_id for c in service.get_subcategories("fruit")] == ["citrus", "berries"]
+    assert service.get_category_ancestors("lemons") == ["citrus", "fruit"]
+    assert service.get_products_by_category("unknown") == []
+
+
+def test_products_before_their_category_is_attached():
+    index = CategoryIndex()
+    index.add_product(0, ["lemons"])
+    index.add_product(1, ["citrus"])
+    index.add_category("lemons", "citrus")
+    index.add_category("citrus", "fruit")
+    assert index.get_doc_ids("fruit") == [0, 1]
+    assert index.get_doc_ids("citrus", include_subcategories=False) == [1]
+
+
+def test_category_cycles_are_rejected():
+    index = CategoryIndex()
+    index.add_category("citrus", "fruit")
+    index.add_category("lemons", "citrus")
+    with pytest.raises(ValueError):
+        index.add_category("fruit", "lemons")
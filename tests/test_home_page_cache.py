@@ -0,0 +1,97 @@
+import random
+from models.Banner import Banner
+from models.Product import Product, Category
+from services.HomePageCache import HomePageCache
+from services.HomePageService import HomePageService
+from services.ProductChangeFeed import ProductChangeFeed
+from services.ProductService import ProductService
+
+
+def make_products(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [Product(f"p{i}", f"Product {i}", "", "c", 10.0, float(rng.choice([0, 5, 10, 30])),
+                    "1kg", stock=rng.randint(0, 2))
+            for i in range(count)]
+
+
+def fresh_sections(product_service: ProductService, banners):
+    # What an uncached render would show
+    page = HomePageService(product_service, banners=banners)
+    return ([p.product_id for p in page.get_deals_products(5)],
+            [p.product_id for p in page.get_featured_products(5)],
+            [b.banner_id for b in page.get_active_banners()])
+
+
+def cached_sections(page: HomePageService):
+    return ([p.product_id for p in page.get_deals_products(5)],
+            [p.product_id for p in page.get_featured_products(5)],
+            [b.banner_id for b in page.get_active_banners()])
+
+
+def mutate(page: HomePageService, products, rng: random.Random):
+    product = rng.choice(products)
+    change = rng.randrange(5)
+    service = page.product_service
+    if change == 0:
+        service.update_product_discount(product.product_id, float(rng.choice([0, 5, 10, 30, 50])))
+    elif change == 1:
+        service.update_product_stock(product.product_id, rng.randint(0, 2))
+    elif change == 2:
+        service.update_product_popularity(product.product_id, float(rng.randint(0, 20)))
+    elif change == 3:
+        service.update_product_price(product.product_id, float(rng.randint(5, 15)))
+    else:
+        page.set_banner_active(rng.choice(page.banners).banner_id, rng.random() < 0.5)
+
+
+def check_cached_sections_stay_current(change_feed: ProductChangeFeed = None):
+    products = make_products(60)
+    service = ProductService(products, change_feed=change_feed)
+    banners = [Banner(f"b{i}", "") for i in range(3)]
+    page = HomePageService(service, banners=banners, change_feed=change_feed)
+    rng = random.Random(6)
+    for _ in range(200):
+        mutate(page, products, rng)
+        assert cached_sections(page) == fresh_sections(service, banners)
+    return page
+
+
+def test_versioned_sections_stay_current():
+    check_cached_sections_stay_current()
+
+
+def test_feed_kept_sections_stay_current():
+    check_cached_sections_stay_current(ProductChangeFeed())
+
+
+def test_unchanged_sections_are_served_from_cache():
+    service = ProductService(make_products(30), [Category("c", "C")])
+    cache = HomePageCache()
+    first = HomePageService(service, section_cache=cache)
+    second = HomePageService(service, section_cache=cache)
+    first.get_homepage_data()
+    misses = cache.misses
+    second.get_homepage_data()
+    assert cache.misses == misses and cache.hits > 0
+    # Popularity changes leave deals cached but rebuild featured
+    service.update_product_popularity("p3", 5.0)
+    second.get_deals_products(20)
+    assert cache.misses == misses
+    second.get_featured_products(20)
+    assert cache.misses == misses + 1
+
+
+def test_feed_kept_sections_ignore_unrelated_changes():
+    feed = ProductChangeFeed()
+    products = [Product(f"p{i}", f"Product {i}", "", "c", 10.0, 10.0 * (i + 1), "1kg", stock=1)
+                for i in range(6)]
+    service = ProductService(products, change_feed=feed)
+    page = HomePageService(service, change_feed=feed)
+    assert [p.product_id for p in page.get_deals_products(3)] == ["p5", "p4", "p3"]
+    misses = page.section_cache.misses
+    # p0 stays below the smallest discount shown
+    service.update_product_discount("p0", 15.0)
+    page.get_deals_products(3)
+    assert page.section_cache.misses == misses
+    service.update_product_discount("p0", 55.0)
+    assert [p.product_id for p in page.get_deals_products(3)] == ["p5", "p0", "p4"]
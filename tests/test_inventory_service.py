@@ -0,0 +1,86 @@
+import random
+import pytest
+from models.Product import Product
+from models.Profile import Location
+from models.Store import Store
+from services.CartService import CartService
+from services.InventoryService import InventoryService
+from services.ProductService import ProductService
+
+
+def test_stock_matches_a_plain_map_as_stores_and_products_arrive():
+    rng = random.Random(15)
+    inventory = InventoryService([Store("s0")], product_ids=["p0", "p1"])
+    expected = {}
+    store_ids = ["s0"]
+    for step in range(3000):
+        if step % 400 == 0:
+            store_id = f"s{len(store_ids)}"
+            inventory.add_store(Store(store_id))
+            store_ids.append(store_id)
+        store_id = rng.choice(store_ids)
+        product_id = f"p{rng.randrange(60)}"
+        if rng.random() < 0.5:
+            quantity = rng.randint(-2, 9)
+            assert inventory.set_stock(store_id, product_id, quantity)
+            expected[store_id, product_id] = max(0, quantity)
+        else:
+            delta = rng.randint(-5, 5)
+            updated = max(0, expected.get((store_id, product_id), 0) + delta)
+            assert inventory.adjust_stock(store_id, product_id, delta) == updated
+            expected[store_id, product_id] = updated
+    for store_id in store_ids + ["missing"]:
+        for i in range(65):
+            quantity = expected.get((store_id, f"p{i}"), 0)
+            assert inventory.get_stock(store_id, f"p{i}") == quantity
+            assert inventory.is_available(store_id, f"p{i}") == (quantity > 0)
+            assert inventory.is_available(store_id, f"p{i}", 3) == (quantity >= 3)
+
+
+def test_unknown_stores_are_refused():
+    inventory = InventoryService([Store("s0")])
+    assert not inventory.set_stock("missing", "p1", 3)
+    assert inventory.load_stock("s0", [("p1", 3), ("p2", 0)]) == 2
+    with pytest.raises(KeyError):
+        inventory.adjust_stock("missing", "p1", 1)
+    assert inventory.filter_available_products("missing", []) == []
+
+
+def test_filter_available_products_per_store():
+    products = [Product(f"p{i}", f"P{i}", "", "c", 1.0, 0.0, "1kg", stock=5) for i in range(10)]
+    inventory = InventoryService([Store("s0"), Store("s1")])
+    inventory.load_stock("s0", [(f"p{i}", i % 3) for i in range(10)])
+    inventory.load_stock("s1", [("p9", 1)])
+    service = ProductService(products, inventory_service=inventory)
+    assert [p.product_id for p in service.filter_available_products(store_id="s0")] == [
+        f"p{i}" for i in range(10) if i % 3]
+    assert [p.product_id for p in service.filter_available_products(limit=2, store_id="s0")] == ["p1", "p2"]
+    assert [p.product_id for p in service.filter_available_products(store_id="s1")] == ["p9"]
+    assert service.is_product_available("p0")
+    assert not service.is_product_available("p0", store_id="s0")
+
+
+def test_cart_quantities_are_checked_against_the_store():
+    product = Product("p1", "Milk", "", "dairy", 30.0, 0.0, "1l", stock=50)
+    inventory = InventoryService([Store("s0")])
+    inventory.set_stock("s0", "p1", 3)
+    cart_service = CartService(inventory_service=inventory, store_id="s0")
+    assert cart_service.add_product_to_cart(product, 2)
+    assert not cart_service.add_product_to_cart(product, 2)
+    assert cart_service.add_product_to_cart(product, 1)
+    assert not cart_service.increment_quantity("p1")
+    assert cart_service.update_product_quantity("p1", 1)
+    assert cart_service.cart.get_item_count() == 1
+
+
+def test_store_for_location_prefers_coordinates_then_pincode():
+    near = Store("near", latitude=12.97, longitude=77.59, pincodes=["560001"], service_radius_km=3.0)
+    far = Store("far", latitude=13.10, longitude=77.70, pincodes=["560002"], service_radius_km=3.0)
+    inventory = InventoryService([near, far])
+    assert inventory.get_nearest_store(12.971, 77.591) is near
+    assert inventory.get_nearest_store(12.5, 77.0) is None
+    located = Location(pincode="560002", latitude=12.971, longitude=77.591)
+    assert inventory.get_store_for_location(located) is near
+    assert inventory.get_store_for_location(Location(pincode="560002")) is far
+    inventory.set_store_active("far", False)
+    assert inventory.get_store_for_location(Location(pincode="560002")) is None
@@ -0,0 +1,48 @@
+import pytest
+from models.Cart import CartItem
+from models.Order import Order, OrderItem
+from models.OrderItemStore import OrderItemStore
+from models.Product import Product
+
+
+def test_models_use_slots():
+    product = Product("p1", "Milk", "", "dairy", 50.0, 0.0, "1L")
+    with pytest.raises(AttributeError):
+        product.colour = "white"
+    assert not hasattr(CartItem("p1", 1, 50.0), "__dict__")
+    assert not hasattr(Order("o1", "u1"), "__dict__")
+
+
+def test_repeated_strings_are_shared():
+    first = CartItem("".join(["p", "1"]), 1, 50.0, weight="".join(["1", "L"]))
+    second = OrderItem("o1", "".join(["p", "1"]), 1, 50.0, weight="".join(["1", "L"]))
+    assert first.product_id is second.product_id
+    assert first.weight is second.weight
+
+
+def test_non_str_fields_are_kept_as_given():
+    product = Product("p1", "Milk", "", None, 50.0, 0.0, None)
+    assert product.category_id is None and product.weight is None
+    item = OrderItem("o1", 7, 1, 5.0, None, None, None)
+    assert item.product_id == 7 and item.product_name is None
+    assert CartItem(None, 1, 5.0).product_id is None
+
+
+def test_images_stay_a_list():
+    product = Product("p1", "Milk", "", "dairy", 50.0, 0.0, "1L", images=("a.png", "b.png"))
+    assert product.images == ["a.png", "b.png"]
+    assert Product("p2", "Tea", "", "drinks", 5.0, 0.0, "").images == []
+    with pytest.raises(TypeError):
+        Product("p3", "Rice", "", "grains", 5.0, 0.0, "", images="a.png")
+
+
+def test_order_item_store_round_trips():
+    store = OrderItemStore()
+    items = [OrderItem("o1", "p1", 2, 50.0, "Milk", "m.png", "1L"),
+             OrderItem("o1", "p2", 1, 10.0, "Bread", "", "400g"),
+             OrderItem("o2", "p1", 3, 50.0, "Milk", "m.png", "1L")]
+    store.add_order_items("o1", items[:2])
+    store.add_order_items("o2", items[2:])
+    assert len(store) == 3
+    assert [(i.order_id, i.product_id, i.quantity, i.unit_price, i.product_name, i.weight)
+            for i in store.get_order_items("o2")] == [("o2", "p1", 3, 50.0, "Milk", "1L")]
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+from models.Order import Order, OrderItem
+from persistence.OrderLog import OrderLog
+from services.OrderService import OrderService
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def make_order(order_id: str, user_id: str = "u1", order_date: datetime = None,
+               status: str = "placed") -> Order:
+    return Order(order_id, user_id, order_date or datetime(2026, 1, 1, 12), status, 110.0,
+                 "12 MG Road", "upi",
+                 [OrderItem(order_id, "p1", 2, 50.0, "Milk", "milk.png", "1L"),
+                  OrderItem(order_id, "p2", 1, 10.0, "Bread", "", "400g")])
+
+
+def test_restart_replays_snapshot_and_tail(tmp_path):
+    service = OrderService(order_log=OrderLog(str(tmp_path), snapshot_interval=3))
+    for i in range(5):
+        service.create_order(make_order(f"o{i}", order_date=datetime(2026, 1, 1, i)))
+    service.update_order_status("o1", "delivered")
+    service.order_log.close()
+
+    restored = OrderService(order_log=OrderLog(str(tmp_path)))
+    assert [o.order_id for o in restored.orders] == [f"o{i}" for i in range(5)]
+    assert restored.get_order_by_id("o1").status == "delivered"
+    order = restored.get_order_by_id("o4")
+    assert order.order_date == datetime(2026, 1, 1, 4)
+    assert [(i.product_id, i.quantity, i.unit_price, i.product_name) for i in order.order_items] == [
+        ("p1", 2, 50.0, "Milk"), ("p2", 1, 10.0, "Bread")]
+
+
+def test_restart_with_offset_aware_dates_in_snapshot_and_tail(tmp_path):
+    service = OrderService(order_log=OrderLog(str(tmp_path), snapshot_interval=2))
+    for i in range(3):
+        service.create_order(make_order(f"o{i}", order_date=datetime(2026, 1, 1, 10 + i, tzinfo=IST)))
+    assert service.order_log.generation == 1
+    service.order_log.close()
+
+    restored = OrderService(order_log=OrderLog(str(tmp_path)))
+    dates = sorted(o.order_date for o in restored.get_user_orders("u1"))
+    assert dates == [datetime(2026, 1, 1, 4 + i, 30) for i in range(3)]
+    assert all(d.tzinfo is None for d in dates)
+
+
+def test_torn_record_is_cut_off(tmp_path):
+    log = OrderLog(str(tmp_path))
+    log.append_created(make_order("o1"))
+    log.append_created(make_order("o2"))
+    log.close()
+    path = tmp_path / "orders-0.log"
+    path.write_bytes(path.read_bytes()[:-5])
+
+    log = OrderLog(str(tmp_path))
+    assert [o.order_id for o in log.load()] == ["o1"]
+    log.append_created(make_order("o3"))
+    log.close()
+    assert [o.order_id for o in OrderLog(str(tmp_path)).load()] == ["o1", "o3"]
+
+
+def test_snapshot_encoding_round_trips():
+    orders = [make_order("o1"), make_order("o2", "u2", status="cancelled")]
+    orders[1].discount_amount = 5.0
+    orders[1].applied_promo_code = "SAVE5"
+    decoded = OrderLog.decode_snapshot(OrderLog.encode_snapshot(orders))
+    assert [(o.order_id, o.user_id, o.status, o.order_date, o.discount_amount, o.applied_promo_code)
+            for o in decoded] == [(o.order_id, o.user_id, o.status, o.order_date, o.discount_amount,
+                                   o.applied_promo_code) for o in orders]
@@ -0,0 +1,65 @@
+import random
+from datetime import datetime, timedelta
+from indexes.OrderSearchIndex import OrderSearchIndex
+from models.Order import Order, OrderItem
+from services.OrderService import OrderService
+
+NAMES = ["Amul Milk", "Brown Bread", "Basmati Rice", "Milk Bread", "Masala Chai", "Toor Dal",
+         "Paneer Tikka", "Greek Yogurt", "Mango Juice"]
+
+
+def make_orders(count: int = 120, seed: int = 5):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [Order(f"ORD-{1000 + i}", "u1", start + timedelta(days=i * 3), "delivered", 0.0, "", "upi",
+                  [OrderItem(f"ORD-{1000 + i}", f"p{j}", 1, 10.0, name)
+                   for j, name in enumerate(rng.sample(NAMES, rng.randint(1, 3)))])
+            for i in range(count)]
+
+
+def brute_force(orders, query):
+    query = query.lower()
+    return {o.order_id for o in orders
+            if query in o.order_id.lower() or any(query in i.product_name.lower() for i in o.order_items)}
+
+
+def test_default_search_matches_substrings_like_a_scan():
+    orders = make_orders()
+    index = OrderSearchIndex()
+    for order in orders:
+        index.add(order)
+    for query in ["1234", "1050", "ORD-10", "d-11", "mil", "MILK", "k bre", "a", "ai", "rice", "xyz", "ord"]:
+        assert {o.order_id for o in index.search(query)} == brute_force(orders, query), query
+
+
+def test_order_id_matches_rank_first_then_newest():
+    orders = make_orders()
+    service = OrderService(orders)
+    results = service.search_orders("u1", "11")
+    id_matches = [o for o in results if "11" in o.order_id]
+    assert results[:len(id_matches)] == id_matches
+    assert [o.order_date for o in id_matches] == sorted((o.order_date for o in id_matches), reverse=True)
+
+
+def test_prefix_mode_matches_word_prefixes():
+    orders = make_orders()
+    index = OrderSearchIndex()
+    for order in orders:
+        index.add(order)
+    expected = {o.order_id for o in orders
+                if any(w.startswith("bre") for i in o.order_items for w in i.product_name.lower().split())}
+    assert {o.order_id for o in index.search("bre", prefix=True)} == expected
+    assert {o.order_id for o in index.search("ilk", prefix=True)} == set()
+    assert [o.order_id for o in index.search("ord-1005", prefix=True)] == ["ORD-1005"]
+
+
+def test_facets_and_paging():
+    orders = make_orders()
+    index = OrderSearchIndex()
+    for order in orders:
+        index.add(order)
+    in_march = index.search("", year=2025, month=3)
+    assert {o.order_id for o in in_march} == {o.order_id for o in orders
+                                             if (o.order_date.year, o.order_date.month) == (2025, 3)}
+    page = index.search("milk", offset=2, limit=3)
+    assert page == index.search("milk")[2:5]
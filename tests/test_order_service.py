@@ -0,0 +1,88 @@
+import random
+from datetime import datetime, timedelta
+from models.Order import Order, OrderItem
+from services.OrderService import OrderService
+
+STATUSES = ["placed", "delivered", "cancelled"]
+
+
+def make_orders(count: int = 200, seed: int = 9):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    return [Order(f"o{i}", f"u{i % 4}", start + timedelta(hours=rng.randrange(24 * 365)),
+                  rng.choice(STATUSES), float(rng.randint(100, 900)) + 0.1, "", "upi",
+                  [OrderItem(f"o{i}", f"p{rng.randrange(15)}", 1, 10.0) for _ in range(rng.randint(1, 3))])
+            for i in range(count)]
+
+
+def test_user_aggregates_match_a_rescan_after_status_changes():
+    rng = random.Random(2)
+    orders = make_orders()
+    service = OrderService(orders[:100])
+    for order in orders[100:]:
+        service.create_order(order)
+    for order in rng.sample(orders, 80):
+        service.update_order_status(order.order_id, rng.choice(STATUSES))
+    for user_id in ("u0", "u1", "u2", "u3"):
+        user_orders = [o for o in orders if o.user_id == user_id]
+        for status in STATUSES:
+            assert service.get_order_count_by_status(user_id, status) == sum(
+                o.status == status for o in user_orders)
+        assert round(service.get_total_spent(user_id), 2) == round(
+            sum(o.total_amount for o in user_orders if o.status == "delivered"), 2)
+        frequency = service.get_user_stats(user_id)
+        for product_id in {i.product_id for o in user_orders for i in o.order_items}:
+            assert frequency.get_product_order_count(product_id) == sum(
+                product_id in o.get_ordered_product_ids() for o in user_orders)
+
+
+def test_status_query_sees_a_status_set_directly():
+    orders = make_orders(20)
+    service = OrderService(orders)
+    order = next(o for o in orders if o.user_id == "u1" and o.status != "returned")
+    order.status = "returned"
+    assert service.get_order_by_status("u1", "returned") == [order]
+
+
+def test_status_listeners_get_the_previous_status():
+    service = OrderService([Order("o1", "u1", status="placed")])
+    seen = []
+    service.add_status_listener(lambda order, old_status: seen.append((order.order_id, old_status, order.status)))
+    service.update_order_status("o1", "delivered")
+    service.update_order_status("o1", "delivered")
+    assert seen == [("o1", "placed", "delivered")]
+
+
+def brute_force_range(orders, user_id: str, start_date: datetime, end_date: datetime):
+    return [o for o in orders if o.user_id == user_id and start_date <= o.order_date <= end_date]
+
+
+def test_date_ranges_match_brute_force():
+    rng = random.Random(5)
+    orders = make_orders(300)
+    service = OrderService(orders[:150])
+    # Later orders arrive out of date order
+    for order in orders[150:]:
+        service.create_order(order)
+    bounds = [o.order_date for o in orders] + [datetime(2024, 6, 1), datetime(2026, 6, 1)]
+    for _ in range(200):
+        user_id = f"u{rng.randrange(5)}"
+        start_date, end_date = sorted(rng.sample(bounds, 2))
+        expected = brute_force_range(orders, user_id, start_date, end_date)
+        found = service.get_orders_by_date_range(user_id, start_date, end_date)
+        assert {o.order_id for o in found} == {o.order_id for o in expected}
+        assert [o.order_date for o in found] == sorted((o.order_date for o in expected), reverse=True)
+        assert list(service.iter_orders_by_date_range(user_id, start_date, end_date)) == found
+
+
+def test_user_order_pages_are_newest_first():
+    orders = make_orders(120)
+    service = OrderService(orders)
+    for user_id in ("u0", "u3"):
+        dates = sorted((o.order_date for o in orders if o.user_id == user_id), reverse=True)
+        assert [o.order_date for o in service.get_user_orders(user_id)] == dates
+        full = service.get_user_orders(user_id)
+        assert service.get_user_orders_page(user_id, 5, 10) == full[5:15]
+        assert service.get_user_orders_page(user_id, len(full)) == []
+        assert service.get_recent_orders(user_id, 3) == full[:3]
+        assert service.get_quick_reorder_items(user_id) == full[0].order_items
@@ -0,0 +1,114 @@
+import math
+import random
+from datetime import datetime, timedelta
+import pytest
+from models.Order import Order, OrderItem
+from models.Product import Product
+from services.OrderService import OrderService
+from services.PopularityService import PopularityService
+from services.ProductService import ProductService
+
+START = datetime(2026, 1, 1)
+
+
+def make_product_service(count: int = 20) -> ProductService:
+    return ProductService([Product(f"p{i}", f"Product {i}", "", "c", 10.0, 0.0, "1kg", stock=5)
+                           for i in range(count)])
+
+
+def make_orders(count: int, days: int, seed: int = 21):
+    rng = random.Random(seed)
+    dates = sorted(START + timedelta(seconds=rng.randrange(days * 86400)) for _ in range(count))
+    return [Order(f"o{i}", f"u{i % 3}", date, "placed", 10.0, "", "upi",
+                  [OrderItem(f"o{i}", f"p{rng.randrange(20)}", rng.randint(1, 3), 10.0)
+                   for _ in range(rng.randint(1, 3))])
+            for i, date in enumerate(dates)]
+
+
+def brute_force(orders, half_life_days: float, at: datetime):
+    scores = {}
+    for order in orders:
+        if order.status == "cancelled":
+            continue
+        age_days = (at - order.order_date).total_seconds() / 86400.0
+        for item in order.order_items:
+            scores[item.product_id] = scores.get(item.product_id, 0.0) + item.quantity * 0.5 ** (
+                age_days / half_life_days)
+    return scores
+
+
+def assert_matches(popularity: PopularityService, product_service: ProductService, orders,
+                   half_life_days: float, at: datetime):
+    expected = brute_force(orders, half_life_days, at)
+    for i in range(20):
+        assert popularity.get_score(f"p{i}", at) == pytest.approx(expected.get(f"p{i}", 0.0), rel=1e-9, abs=1e-12)
+    ranked = [expected.get(p.product_id, 0.0) for p in popularity.get_top_products(limit=None)]
+    assert all(a >= b - 1e-9 * max(a, 1.0) for a, b in zip(ranked, ranked[1:]))
+
+
+def test_decayed_scores_match_brute_force_across_rescales():
+    product_service = make_product_service()
+    order_service = OrderService()
+    # A one-day half life over a year forces several landmark rescales
+    popularity = PopularityService(product_service, order_service, half_life_days=1.0)
+    orders = make_orders(400, days=365)
+    for order in orders:
+        order_service.create_order(order)
+    at = orders[-1].order_date + timedelta(hours=6)
+    assert_matches(popularity, product_service, orders, 1.0, at)
+
+
+def test_cancellation_takes_sales_back_out():
+    product_service = make_product_service()
+    order_service = OrderService()
+    popularity = PopularityService(product_service, order_service, half_life_days=7.0)
+    orders = make_orders(150, days=30)
+    for order in orders:
+        order_service.create_order(order)
+    rng = random.Random(3)
+    for order in rng.sample(orders, 50):
+        order_service.update_order_status(order.order_id, "cancelled")
+    for order in rng.sample(orders, 20):
+        order_service.update_order_status(order.order_id, rng.choice(["placed", "delivered"]))
+    at = START + timedelta(days=31)
+    assert_matches(popularity, product_service, orders, 7.0, at)
+    # A rebuild from history lands on the same scores
+    rebuilt = PopularityService(make_product_service(), half_life_days=7.0)
+    assert rebuilt.rebuild(orders) == sum(o.status != "cancelled" for o in orders)
+    for i in range(20):
+        assert rebuilt.get_score(f"p{i}", at) == pytest.approx(popularity.get_score(f"p{i}", at),
+                                                               rel=1e-9, abs=1e-12)
+
+
+def test_recent_sales_outrank_older_bigger_ones():
+    product_service = make_product_service(3)
+    popularity = PopularityService(product_service, half_life_days=1.0)
+    popularity.record_sale("p0", 10, START)
+    popularity.record_sale("p1", 2, START + timedelta(days=5))
+    assert [p.product_id for p in popularity.get_top_products(2)] == ["p1", "p0"]
+    assert popularity.get_score("p0", START + timedelta(days=1)) == pytest.approx(5.0)
+    assert math.isclose(popularity.get_score("p1", START + timedelta(days=6)), 1.0)
+
+
+def test_sales_leave_catalog_version_alone():
+    product_service = make_product_service()
+    order_service = OrderService()
+    PopularityService(product_service, order_service)
+    catalog_version = product_service.catalog_version
+    popularity_version = product_service.popularity_version
+    for order in make_orders(10, days=2):
+        order_service.create_order(order)
+    assert product_service.catalog_version == catalog_version
+    assert product_service.popularity_version > popularity_version
+
+
+def test_rebuild_clears_products_with_no_remaining_sales():
+    product_service = make_product_service()
+    popularity = PopularityService(product_service)
+    orders = make_orders(5, days=1)
+    popularity.rebuild(orders)
+    sold = {item.product_id for order in orders for item in order.order_items}
+    for order in orders:
+        order.status = "cancelled"
+    assert popularity.rebuild(orders) == 0
+    assert all(product_service.get_product_popularity(pid) == 0.0 for pid in sold)
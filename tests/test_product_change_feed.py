@@ -0,0 +1,101 @@
+import gc
+import time
+import weakref
+from models.Product import Product
+from services.CartService import CartService
+from services.ProductChangeFeed import ProductChangeFeed
+from services.ProductService import ProductService
+
+
+def make_service(feed: ProductChangeFeed) -> ProductService:
+    return ProductService([Product(f"p{i}", f"Product {i}", "", "c", 10.0, 0.0, "1kg", stock=5)
+                           for i in range(4)], change_feed=feed)
+
+
+def test_changes_reach_only_subscribers_of_their_product():
+    feed = ProductChangeFeed()
+    service = make_service(feed)
+    everything, p1_only = [], []
+    feed.subscribe(everything.extend)
+    feed.subscribe(p1_only.extend, ["p1"])
+    service.update_product_stock("p0", 3)
+    service.update_product_price("p1", 12.0)
+    assert [c.product_id for c in everything] == ["p0", "p1"]
+    assert [(c.product_id, c.price) for c in p1_only] == [("p1", 12.0)]
+
+
+def test_batches_coalesce_per_product():
+    feed = ProductChangeFeed()
+    service = make_service(feed)
+    batches = []
+    feed.subscribe(batches.append)
+    with feed.batch():
+        service.update_product_stock("p0", 0)
+        service.update_product_stock("p0", 2)
+        service.update_product_discount("p0", 10.0)
+    assert len(batches) == 1 and len(batches[0]) == 1
+    change = batches[0][0]
+    assert change.changed == {"stock", "available", "discount"}
+    assert change.stock == 2 and change.is_available
+
+
+def test_flush_interval_coalesces_bursts_outside_batches():
+    feed = ProductChangeFeed(flush_interval=60)
+    service = make_service(feed)
+    batches = []
+    feed.subscribe(batches.append)
+    for stock in range(5, 0, -1):
+        service.update_product_stock("p2", stock)
+    assert batches == [] and feed.get_pending_count() == 1
+    feed.close()
+    assert [[(c.product_id, c.stock) for c in batch] for batch in batches] == [[("p2", 1)]]
+
+    quick = ProductChangeFeed(flush_interval=0.01)
+    quick.subscribe(batches.append)
+    make_service(quick).update_product_stock("p3", 4)
+    deadline = time.monotonic() + 5
+    while len(batches) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [c.product_id for c in batches[1]] == ["p3"]
+
+
+def test_adding_in_stock_products_publishes():
+    feed = ProductChangeFeed()
+    service = make_service(feed)
+    seen = []
+    feed.subscribe(seen.extend)
+    service.add_product(Product("new", "New", "", "c", 5.0, 0.0, "", stock=1))
+    service.add_products([Product("a", "A", "", "c", 5.0, 0.0, "", stock=2),
+                          Product("b", "B", "", "c", 5.0, 0.0, "", stock=0)])
+    assert [c.product_id for c in seen] == ["new", "a"]
+
+
+def test_carts_watch_their_own_lines_only():
+    feed = ProductChangeFeed()
+    service = make_service(feed)
+    cart_service = CartService(product_service=service)
+    cart_service.watch_product_changes(feed)
+    assert feed.get_subscriber_count() == 0
+    cart_service.add_product_to_cart(service.get_product_by_id("p0"), 2)
+    assert feed.get_subscriber_count() == 1
+
+    service.update_product_price("p1", 99.0)
+    service.update_product_price("p0", 20.0)
+    assert cart_service.cart.items["p0"].unit_price == 20.0
+    service.update_product_stock("p0", 1)
+    assert cart_service.unavailable_product_ids == {"p0"}
+
+    cart_service.clear_cart()
+    assert feed.get_subscriber_count() == 0
+    cart_service.add_product_to_cart(service.get_product_by_id("p1"), 1)
+    cart_service.unwatch_product_changes()
+    assert feed.get_subscriber_count() == 0
+
+    dropped = CartService(product_service=service)
+    dropped.watch_product_changes(feed)
+    dropped.add_product_to_cart(service.get_product_by_id("p1"), 1)
+    dropped.clear_cart()
+    reference = weakref.ref(dropped)
+    del dropped
+    gc.collect()
+    assert reference() is None
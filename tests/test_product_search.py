@@ -0,0 +1,79 @@
+import random
+import pytest
+from models.Product import Product
+from indexes.ProductSearchIndex import ProductSearchIndex
+from services.ProductService import ProductService
+
+WORDS = ["apple", "green", "apple juice", "banana", "milk", "whole milk", "oat", "bread",
+         "Brown Bread", "cheese", "cheddar", "tea", "Green Tea", "a", "123"]
+QUERIES = ["apple", "APP", "a", "e", "milk", "ilk", "le ju", "brown b", "tea", "gre", "che",
+           "3", "xyz", "bread", "n", "  ", "oat "]
+
+
+def make_products(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [Product(f"p{i}", " ".join(rng.sample(WORDS, 2)), "", "c", 10.0, 0.0, "1kg",
+                    description=rng.choice(WORDS), stock=rng.randint(0, 3))
+            for i in range(count)]
+
+
+def brute_force(products, query: str):
+    query_lower = query.lower()
+    return {p.product_id for p in products
+            if query_lower in p.name.lower() or query_lower in p.description.lower()}
+
+
+def test_search_matches_substring_semantics():
+    products = make_products(300)
+    service = ProductService(products)
+    for query in QUERIES:
+        results = [p.product_id for p in service.search_products(query)]
+        assert len(results) == len(set(results))
+        assert set(results) == brute_force(products, query), query
+
+
+def test_search_ranks_whole_tokens_first():
+    products = [Product("p0", "Pineapple", "", "c", 1.0, 0.0, "1kg"),
+                Product("p1", "Juice", "", "c", 1.0, 0.0, "1kg", description="apple"),
+                Product("p2", "Apples", "", "c", 1.0, 0.0, "1kg"),
+                Product("p3", "Apple", "", "c", 1.0, 0.0, "1kg")]
+    service = ProductService(products)
+    assert [p.product_id for p in service.search_products("apple")] == ["p3", "p2", "p0", "p1"]
+
+
+def test_search_limit_and_available_only():
+    products = make_products(200)
+    service = ProductService(products)
+    expected = [p for p in service.search_products("a") if p.is_available()]
+    assert service.search_products("a", limit=5, available_only=True) == expected[:5]
+
+
+def test_products_added_later_are_searchable():
+    products = make_products(50)
+    service = ProductService(list(products))
+    service.search_products("milk")
+    extra = Product("late", "Skimmed milk", "", "c", 1.0, 0.0, "1kg")
+    service.products.append(extra)
+    assert "late" in {p.product_id for p in service.search_products("skimmed")}
+
+
+def test_extended_shards_match_a_single_index():
+    products = make_products(120, seed=11)
+    whole = ProductSearchIndex()
+    for doc_id, product in enumerate(products):
+        whole.add(doc_id, product)
+    sharded = ProductSearchIndex()
+    for start in range(0, len(products), 25):
+        shard = ProductSearchIndex(start)
+        for doc_id in range(start, min(start + 25, len(products))):
+            shard.add(doc_id, products[doc_id])
+        sharded.extend(shard)
+    for query in QUERIES:
+        assert list(sharded.search(query)) == list(whole.search(query)), query
+
+
+def test_shards_must_be_appended_in_order():
+    index = ProductSearchIndex()
+    index.add(0, make_products(1)[0])
+    with pytest.raises(ValueError):
+        index.extend(ProductSearchIndex(5))
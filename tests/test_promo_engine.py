@@ -0,0 +1,84 @@
+import random
+from datetime import datetime, timedelta
+from models.PromoCode import PromoCode
+from services.PromoCodeService import PromoCodeService
+
+START = datetime(2026, 3, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def make_promo_codes(count: int, seed: int = 21):
+    rng = random.Random(seed)
+    promo_codes = []
+    for i in range(count):
+        valid_from = START + timedelta(hours=rng.randrange(48)) if rng.random() < 0.7 else None
+        valid_until = (valid_from or START) + timedelta(hours=rng.randint(0, 48)) if rng.random() < 0.7 else None
+        if rng.random() < 0.5:
+            promo_code = PromoCode(f"FIX{i}", "fixed", float(rng.randint(10, 150)),
+                                   float(rng.choice([0, 100, 250, 500])), 0.0, valid_from, valid_until)
+        else:
+            promo_code = PromoCode(f"PCT{i}", "percentage", float(rng.choice([5, 10, 20, 40])),
+                                   float(rng.choice([0, 100, 250, 500])), float(rng.choice([0, 50, 120])),
+                                   valid_from, valid_until)
+        promo_code.is_active = rng.random() < 0.9
+        promo_codes.append(promo_code)
+    return promo_codes
+
+
+def brute_force_offers(promo_codes, order_value: float, current_date: datetime):
+    offers = [(pc, pc.calculate_discount(order_value, current_date)) for pc in promo_codes]
+    return [offer for offer in offers if offer[1] > 0]
+
+
+def boundary_times(promo_codes):
+    times = {START - timedelta(days=1), START + timedelta(days=10)}
+    for promo_code in promo_codes:
+        for instant in (promo_code.valid_from, promo_code.valid_until):
+            if instant:
+                times.update((instant - MICROSECOND, instant, instant + MICROSECOND))
+    return sorted(times)
+
+
+def test_offers_match_brute_force_at_window_boundaries():
+    promo_codes = make_promo_codes(40)
+    service = PromoCodeService(promo_codes)
+    order_values = [0.0, 50.0, 99.99, 100.0, 249.0, 250.0, 499.99, 500.0, 1200.0]
+    # Walked forwards and backwards so cached windows are revisited after boundary instants
+    times = boundary_times(promo_codes)
+    for current_date in times + times[::-1]:
+        active = {pc.code for pc in promo_codes if pc.is_active_at(current_date)}
+        assert {pc.code for pc in service.get_all_active_promo_codes(current_date)} == active
+        bests = service.get_best_promo_codes(order_values, current_date)
+        for order_value, (best, discount) in zip(order_values, bests):
+            offers = brute_force_offers(promo_codes, order_value, current_date)
+            expected = max((d for _, d in offers), default=0.0)
+            assert discount == expected
+            assert (best is None) == (not offers)
+            assert (best, discount) == service.get_best_promo_code(order_value, current_date)
+            applicable = service.get_applicable_promo_codes(order_value, current_date)
+            assert sorted((pc.code, d) for pc, d in applicable) == sorted((pc.code, d) for pc, d in offers)
+            assert [d for _, d in applicable] == sorted((d for _, d in offers), reverse=True)
+
+
+def test_validity_is_inclusive_at_both_ends():
+    valid_from, valid_until = START, START + timedelta(hours=2)
+    service = PromoCodeService([PromoCode("SAVE", "fixed", 40.0, 200.0, 0.0, valid_from, valid_until)])
+    inside = valid_from + timedelta(hours=1)
+    assert service.get_best_promo_code(200.0, inside)[1] == 40.0
+    assert service.get_best_promo_code(200.0, valid_from)[1] == 40.0
+    assert service.get_best_promo_code(200.0, valid_until)[1] == 40.0
+    assert service.get_best_promo_code(200.0, valid_from - MICROSECOND) == (None, 0.0)
+    assert service.get_best_promo_code(200.0, valid_until + MICROSECOND) == (None, 0.0)
+    assert service.get_best_promo_code(199.99, inside) == (None, 0.0)
+    assert service.validate_promo_code("save", 200.0, valid_until)[0]
+    assert not service.validate_promo_code("save", 200.0, valid_until + MICROSECOND)[0]
+
+
+def test_deactivating_and_adding_codes_rebuilds_offers():
+    service = PromoCodeService([PromoCode("TEN", "percentage", 10.0)])
+    assert service.get_best_promo_code(300.0, START)[1] == 30.0
+    service.add_promo_code(PromoCode("FLAT50", "fixed", 50.0, 250.0))
+    assert service.get_best_promo_code(300.0, START)[0].code == "FLAT50"
+    assert service.set_promo_code_active("flat50", False)
+    assert service.get_best_promo_code(300.0, START)[0].code == "TEN"
+    assert not service.set_promo_code_active("missing", False)
@@ -0,0 +1,161 @@
+import random
+import pytest
+from models.Product import Product, Category
+from models.PromoCode import PromoCode
+from models.PromoContext import PromoContext
+from services.CartService import CartService
+from services.ProductService import ProductService
+from services.PromoCodeService import PromoCodeService
+from services.PromoRuleCompiler import PromoRuleCompiler
+
+SKUS = ["p1", "p2", "p3", "p4"]
+CATEGORY_IDS = ["dairy", "fruit", "bakery"]
+
+
+def interpret(conditions: dict, context: PromoContext) -> bool:
+    # Reference reading of the condition language, one key at a time
+    for key, value in conditions.items():
+        if key == "all":
+            held = all(interpret(c, context) for c in value)
+        elif key == "any":
+            held = any(interpret(c, context) for c in value)
+        elif key == "not":
+            held = not interpret(value, context)
+        elif key == "min_order_value":
+            held = context.order_value >= value
+        elif key == "min_item_count":
+            held = context.item_count >= value
+        elif key == "max_item_count":
+            held = context.item_count <= value
+        elif key == "first_order":
+            held = context.is_first_order == value
+        elif key == "category_in":
+            held = any(c in context.category_ids for c in value)
+        elif key == "sku_in":
+            held = any(s in context.product_ids for s in value)
+        elif key == "sku_all":
+            held = all(s in context.product_ids for s in value)
+        elif key == "exclude_sku":
+            held = not any(s in context.product_ids for s in value)
+        elif key == "payment_method_in":
+            held = context.payment_method in value
+        elif key == "user_segment_in":
+            held = any(s in context.user_segments for s in value)
+        else:
+            held = not any(c.upper() in context.applied_promo_codes for c in value)
+        if not held:
+            return False
+    return True
+
+
+def random_conditions(rng: random.Random, depth: int = 0) -> dict:
+    conditions = {}
+    for _ in range(rng.randint(1, 3)):
+        key = rng.choice(["min_order_value", "min_item_count", "max_item_count", "first_order",
+                          "category_in", "sku_in", "sku_all", "exclude_sku", "payment_method_in",
+                          "user_segment_in", "not_with"] + (["all", "any", "not"] if depth < 2 else []))
+        if key in ("all", "any"):
+            conditions[key] = [random_conditions(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+        elif key == "not":
+            conditions[key] = random_conditions(rng, depth + 1)
+        elif key == "min_order_value":
+            conditions[key] = rng.choice([100, 250, 499.5])
+        elif key in ("min_item_count", "max_item_count"):
+            conditions[key] = rng.randint(1, 4)
+        elif key == "first_order":
+            conditions[key] = rng.random() < 0.5
+        elif key == "category_in":
+            conditions[key] = rng.sample(CATEGORY_IDS, rng.randint(1, 2))
+        elif key in ("sku_in", "sku_all", "exclude_sku"):
+            conditions[key] = rng.sample(SKUS, rng.randint(1, 2))
+        elif key == "payment_method_in":
+            conditions[key] = rng.sample(["upi", "card", "cod"], 1)
+        elif key == "user_segment_in":
+            conditions[key] = ["gold"]
+        else:
+            conditions[key] = [rng.choice(["freedel", "SAVE10"])]
+    return conditions
+
+
+def random_context(rng: random.Random) -> PromoContext:
+    return PromoContext(rng.choice([99.99, 100, 250, 499.5, 800]), rng.randint(0, 5),
+                        rng.sample(SKUS, rng.randint(0, 3)), rng.sample(CATEGORY_IDS, rng.randint(0, 2)),
+                        rng.random() < 0.5, rng.choice(["upi", "card", "cod"]),
+                        rng.sample(["gold", "new"], rng.randint(0, 2)),
+                        rng.sample(["FREEDEL", "save10"], rng.randint(0, 2)))
+
+
+def test_compiled_rules_match_the_reference_reading():
+    rng = random.Random(14)
+    contexts = [random_context(rng) for _ in range(60)]
+    for _ in range(300):
+        conditions = random_conditions(rng)
+        rule = PromoRuleCompiler.compile(conditions)
+        for context in contexts:
+            assert rule(context) == interpret(conditions, context), conditions
+
+
+def test_thresholds_are_inclusive():
+    rule = PromoRuleCompiler.compile({"min_order_value": 499, "min_item_count": 2, "max_item_count": 4})
+    assert rule(PromoContext(499.0, 2))
+    assert rule(PromoContext(499.0, 4))
+    assert not rule(PromoContext(498.99, 3))
+    assert not rule(PromoContext(600.0, 1))
+    assert not rule(PromoContext(600.0, 5))
+
+
+@pytest.mark.parametrize("conditions", [
+    {"unknown": 1}, {"sku_in": "p1"}, {"all": {"sku_in": ["p1"]}}, ["sku_in"], {"not": {"nope": 1}},
+])
+def test_malformed_conditions_are_rejected(conditions):
+    with pytest.raises(ValueError):
+        PromoRuleCompiler.compile(conditions)
+
+
+def make_cart_service(promo_codes):
+    categories = [Category("dairy", "Dairy"), Category("cheese", "Cheese", parent_id="dairy")]
+    products = [Product("p1", "Cheddar", "", "cheese", 200.0, 0.0, "200g", stock=10),
+                Product("p2", "Bread", "", "bakery", 50.0, 0.0, "400g", stock=10)]
+    product_service = ProductService(products, categories)
+    return CartService(promo_code_service=PromoCodeService(promo_codes),
+                       product_service=product_service), product_service
+
+
+def test_cart_codes_follow_their_conditions():
+    dairy = PromoCode("DAIRY", "fixed", 30.0, conditions={"category_in": ["dairy"], "min_item_count": 2})
+    cart_service, product_service = make_cart_service([dairy])
+    cart_service.add_product_to_cart(product_service.get_product_by_id("p1"), 1)
+    assert not cart_service.apply_promo_code(dairy)
+    # Cheese counts as dairy through the category tree
+    cart_service.add_product_to_cart(product_service.get_product_by_id("p1"), 1)
+    assert cart_service.apply_promo_code(dairy)
+    assert cart_service.cart.discount_amount == 30.0
+    cart_service.decrement_quantity("p1")
+    assert cart_service.cart.applied_promo_code == "" and cart_service.cart.discount_amount == 0.0
+
+
+def test_stacked_codes_respect_not_with_on_both_sides():
+    base = PromoCode("BASE", "fixed", 10.0, stackable=True)
+    loner = PromoCode("LONER", "fixed", 5.0, stackable=True, conditions={"not_with": ["base"]})
+    other = PromoCode("OTHER", "fixed", 5.0, stackable=True)
+    picky = PromoCode("PICKY", "fixed", 5.0, stackable=True, conditions={"not_with": ["OTHER"]})
+    cart_service, product_service = make_cart_service([base, loner, other, picky])
+    cart_service.add_product_to_cart(product_service.get_product_by_id("p2"), 2)
+    assert cart_service.apply_promo_code(base)
+    assert not cart_service.apply_promo_code(loner)
+    assert cart_service.apply_promo_code(picky)
+    assert not cart_service.apply_promo_code(other)
+    assert cart_service.cart.applied_promo_code == "BASE,PICKY"
+
+
+def test_conditional_codes_need_a_context():
+    gold = PromoCode("GOLD", "percentage", 50.0, conditions={"user_segment_in": ["gold"]})
+    plain = PromoCode("PLAIN", "percentage", 10.0)
+    service = PromoCodeService([gold, plain])
+    assert service.get_best_promo_code(200.0)[0] is plain
+    assert [pc for pc, _ in service.get_applicable_promo_codes(200.0)] == [plain]
+    assert service.validate_promo_code("GOLD", 200.0) == (False, None)
+    context = PromoContext(200.0, 1, user_segments=["gold"])
+    assert service.validate_promo_code("GOLD", 200.0, context=context) == (True, gold)
+    assert service.get_best_promo_code_for_context(context) == (gold, 100.0)
+    assert service.get_best_promo_code_for_context(PromoContext(200.0, 1)) == (plain, 20.0)
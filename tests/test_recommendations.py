@@ -0,0 +1,75 @@
+import random
+from datetime import datetime, timedelta
+from math import sqrt
+from indexes.CoPurchaseIndex import CoPurchaseIndex
+from models.Order import Order, OrderItem
+from models.Product import Product
+from services.OrderService import OrderService
+from services.ProductService import ProductService
+from services.RecommendationService import RecommendationService
+
+
+def make_baskets(count: int = 300, seed: int = 4):
+    rng = random.Random(seed)
+    return [[f"p{rng.randrange(12)}" for _ in range(rng.randint(1, 5))] for _ in range(count)]
+
+
+def brute_force_neighbors(baskets, product_id, min_support=2):
+    baskets = [set(b) for b in baskets]
+    counts = {}
+    for basket in baskets:
+        for p in basket:
+            counts[p] = counts.get(p, 0) + 1
+    scores = []
+    for other in counts:
+        if other == product_id:
+            continue
+        together = sum(product_id in b and other in b for b in baskets)
+        if together >= min_support:
+            scores.append((other, together / sqrt(counts[product_id] * counts[other])))
+    return sorted(scores, key=lambda entry: entry[1], reverse=True)
+
+
+def test_neighbors_match_brute_force_for_bulk_and_online_builds():
+    baskets = make_baskets()
+    bulk, online = CoPurchaseIndex(), CoPurchaseIndex()
+    bulk.build(baskets)
+    for basket in baskets:
+        online.add_basket(basket)
+    for i in range(12):
+        expected = brute_force_neighbors(baskets, f"p{i}")
+        for index in (bulk, online):
+            neighbors = index.get_neighbors(f"p{i}")
+            assert sorted((-round(s, 9), p) for p, s in neighbors) == sorted((-round(s, 9), p) for p, s in expected)
+
+
+def test_removed_basket_leaves_the_index_as_if_never_added():
+    baskets = make_baskets()
+    with_extra = CoPurchaseIndex()
+    with_extra.build(baskets)
+    with_extra.add_basket(["p0", "p1", "new"])
+    with_extra.remove_basket(["p0", "p1", "new"])
+    expected = CoPurchaseIndex()
+    expected.build(baskets)
+    for product_id in ["p0", "p1", "p2", "new"]:
+        assert with_extra.get_neighbors(product_id) == expected.get_neighbors(product_id)
+    assert len(with_extra) == len(expected)
+    assert with_extra.basket_count == expected.basket_count
+
+
+def test_cancelled_orders_are_taken_back_out():
+    products = ProductService([Product(f"p{i}", f"Product {i}", "", "c", 10.0, 0.0, "", stock=5)
+                               for i in range(4)])
+    order_service = OrderService([])
+    recommendations = RecommendationService(products, order_service, CoPurchaseIndex(min_support=1))
+    start = datetime(2026, 1, 1)
+    for i, basket in enumerate([["p0", "p1"], ["p0", "p2"], ["p0", "p2"]]):
+        order_service.create_order(Order(f"o{i}", "u1", start + timedelta(hours=i), "placed", 0.0, "", "upi",
+                                         [OrderItem(f"o{i}", product_id, 1, 10.0) for product_id in basket]))
+    assert recommendations.index.get_co_purchase_count("p0", "p2") == 2
+    order_service.update_order_status("o1", "cancelled")
+    order_service.update_order_status("o2", "cancelled")
+    assert recommendations.index.get_co_purchase_count("p0", "p2") == 0
+    assert [p.product_id for p in recommendations.get_frequently_bought_together("p0")] == ["p1"]
+    order_service.update_order_status("o2", "placed")
+    assert recommendations.index.get_co_purchase_count("p0", "p2") == 1
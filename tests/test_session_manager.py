@@ -0,0 +1,88 @@
+from models.Product import Product
+from persistence.CartStore import FileCartStore
+from services.ProductChangeFeed import ProductChangeFeed
+from services.ProductService import ProductService
+from services.SessionManager import SessionManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_product_service(feed: ProductChangeFeed = None) -> ProductService:
+    return ProductService([Product(f"p{i}", f"Product {i}", "", "c", 10.0, 0.0, "1kg", stock=20)
+                           for i in range(5)], change_feed=feed)
+
+
+def add(handle, product_service: ProductService, product_id: str, quantity: int = 1):
+    assert handle.cart_service.add_product_to_cart(product_service.get_product_by_id(product_id), quantity)
+
+
+def test_least_recently_used_sessions_are_evicted_and_restored(tmp_path):
+    product_service = make_product_service()
+    store = FileCartStore(str(tmp_path / "carts"))
+    manager = SessionManager(product_service, cart_store=store, max_sessions=2)
+    add(manager.get_session("u1"), product_service, "p1", 2)
+    manager.get_session("u1").user_settings.add_to_wishlist("p3")
+    add(manager.get_session("u2"), product_service, "p2")
+    manager.get_session("u1")
+    manager.get_session("u3")
+    # u2 was the least recently used
+    assert manager.get_stats() == {"active_sessions": 2, "evictions": 1}
+    assert store.load_cart("u2").items["p2"].quantity == 1
+    manager.close()
+    assert manager.get_stats() == {"active_sessions": 0, "evictions": 3}
+    # A new process over the same stores sees the same carts and settings
+    restarted = SessionManager(product_service, cart_store=FileCartStore(str(tmp_path / "carts")),
+                               settings_store=manager.settings_store)
+    u1 = restarted.get_session("u1")
+    assert {pid: item.quantity for pid, item in u1.cart_service.cart.items.items()} == {"p1": 2}
+    assert u1.user_settings.wishlist == ["p3"]
+    assert restarted.get_session("u3").cart_service.is_cart_empty()
+    store.close()
+
+
+def test_idle_sessions_are_evicted_oldest_first():
+    clock = FakeClock()
+    manager = SessionManager(make_product_service(), idle_timeout=100.0, clock=clock)
+    for user_id in ("u1", "u2", "u3"):
+        manager.get_session(user_id)
+        clock.now += 40.0
+    manager.get_session("u1")
+    # u2 at 40 and u3 at 80 against u1 refreshed at 120
+    assert manager.evict_idle(150.0) == 1
+    assert manager.evict_idle(190.0) == 1
+    assert len(manager) == 1 and manager.get_stats()["evictions"] == 2
+    assert manager.end_session("u1") and not manager.end_session("u1")
+
+
+def test_emptied_carts_are_deleted_on_eviction(tmp_path):
+    product_service = make_product_service()
+    store = FileCartStore(str(tmp_path / "carts"))
+    manager = SessionManager(product_service, cart_store=store, persist_on_change=True)
+    handle = manager.get_session("u1")
+    add(handle, product_service, "p1")
+    assert store.load_cart("u1") is not None
+    handle.cart_service.clear_cart()
+    manager.end_session("u1")
+    assert store.load_cart("u1") is None
+    store.close()
+
+
+def test_handles_share_the_catalog_and_open_carts_follow_price_changes():
+    feed = ProductChangeFeed()
+    product_service = make_product_service(feed)
+    manager = SessionManager(product_service, change_feed=feed)
+    first, second = manager.get_session("u1"), manager.get_session("u2")
+    assert first.home_page_service.product_service is product_service
+    assert first.user_service.product_service is product_service
+    assert first.home_page_service.section_cache is second.home_page_service.section_cache
+    assert first.user_service.order_service is manager.order_service
+    add(first, product_service, "p1", 3)
+    product_service.update_product_price("p1", 8.0)
+    assert first.cart_service.cart.get_subtotal() == 24.0
+    assert second.cart_service.cart.get_subtotal() == 0.0
@@ -0,0 +1,95 @@
+import random
+from models.Product import Product
+from services.ProductService import ProductService
+
+
+def make_products(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    return [Product(f"p{i}", f"Product {i}", "", "c", float(rng.randint(1, 20)),
+                    float(rng.choice([0, 0, 5, 10, 25])), "1kg", stock=rng.randint(0, 2))
+            for i in range(count)]
+
+
+def brute_force(products, key, reverse: bool = False):
+    # Ties are broken by catalog position, in the direction of the sort
+    ranked = sorted((key(p), doc_id) for doc_id, p in enumerate(products) if p.is_available())
+    if reverse:
+        ranked.reverse()
+    return [products[doc_id].product_id for _, doc_id in ranked]
+
+
+def ids(products):
+    return [p.product_id for p in products]
+
+
+def shuffle_catalog(service: ProductService, products, rng: random.Random):
+    for _ in range(150):
+        product = rng.choice(products)
+        change = rng.randrange(4)
+        if change == 0:
+            service.update_product_price(product.product_id, float(rng.randint(1, 20)))
+        elif change == 1:
+            service.update_product_discount(product.product_id, float(rng.choice([0, 5, 10, 25])))
+        elif change == 2:
+            service.update_product_stock(product.product_id, rng.randint(0, 2))
+        else:
+            service.update_product_popularity(product.product_id, float(rng.randint(0, 5)))
+
+
+def check_views(service: ProductService, products):
+    popularity = service.get_product_popularity
+    assert ids(service.get_products_sorted_by_price()) == brute_force(
+        products, Product.get_discounted_price)
+    assert ids(service.get_products_sorted_by_price(ascending=False)) == brute_force(
+        products, Product.get_discounted_price, reverse=True)
+    assert ids(service.get_products_sorted_by_discount()) == brute_force(
+        products, lambda p: -p.discount)
+    assert ids(service.get_products_sorted_by_popularity()) == brute_force(
+        products, lambda p: -popularity(p.product_id))
+    discounted = [pid for pid in brute_force(products, lambda p: -p.discount)
+                  if service.get_product_by_id(pid).discount > 0]
+    assert ids(service.get_top_discounted_products()) == discounted
+
+
+def test_views_match_brute_force_after_updates():
+    products = make_products(200)
+    service = ProductService(products)
+    check_views(service, products)
+    rng = random.Random(9)
+    for _ in range(3):
+        shuffle_catalog(service, products, rng)
+        check_views(service, products)
+
+
+def test_bulk_popularity_update_matches_brute_force():
+    products = make_products(100)
+    service = ProductService(products)
+    rng = random.Random(4)
+    service.update_product_popularities({p.product_id: float(rng.randint(0, 9)) for p in products[::3]})
+    service.update_product_popularities({"p1": 50.0, "missing": 1.0})
+    check_views(service, products)
+
+
+def test_pages_are_slices_of_the_full_order():
+    products = make_products(120)
+    service = ProductService(products)
+    shuffle_catalog(service, products, random.Random(2))
+    for ascending in (True, False):
+        full = ids(service.get_products_sorted_by_price(ascending))
+        for offset in (0, 7, len(full) - 3, len(full) + 5):
+            page = ids(service.get_products_sorted_by_price(ascending, limit=10, offset=offset))
+            assert page == full[offset:offset + 10]
+    full = ids(service.get_top_discounted_products())
+    assert ids(service.get_top_discounted_products(limit=4, offset=2)) == full[2:6]
+
+
+def test_find_products_sorted_matches_views():
+    products = make_products(150)
+    service = ProductService(products)
+    shuffle_catalog(service, products, random.Random(8))
+    in_range = [pid for pid in ids(service.get_products_sorted_by_price())
+                if 5 <= service.get_product_by_id(pid).get_discounted_price() <= 15]
+    found = service.find_products(min_price=5, max_price=15, sort_by="price")
+    assert sorted(ids(found)) == sorted(in_range)
+    prices = [p.get_discounted_price() for p in found]
+    assert prices == sorted(prices)
@@ -0,0 +1,97 @@
+import random
+import threading
+from models.Product import Product
+from services.ProductChangeFeed import ProductChangeFeed
+from services.ProductService import ProductService
+from services.StockReservationService import StockReservationService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_service(stock: int = 10, count: int = 5, change_feed: ProductChangeFeed = None) -> ProductService:
+    return ProductService([Product(f"p{i}", f"Product {i}", "", "c", 10.0, 0.0, "1kg", stock=stock)
+                           for i in range(count)], change_feed=change_feed)
+
+
+def test_concurrent_checkouts_never_oversell():
+    product_service = make_service(stock=50, count=4)
+    reservations = StockReservationService(product_service, stripe_count=2)
+    sold = [0] * 4
+    sold_lock = threading.Lock()
+    gate = threading.Barrier(16)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        gate.wait()
+        for _ in range(300):
+            basket = {rng.randrange(4): rng.randint(1, 3) for _ in range(rng.randint(1, 3))}
+            reservation_id = reservations.try_reserve((f"p{i}", q) for i, q in basket.items())
+            if reservation_id and (rng.random() < 0.2 or not reservations.commit(reservation_id)):
+                reservations.release(reservation_id)
+            elif reservation_id:
+                with sold_lock:
+                    for i, q in basket.items():
+                        sold[i] += q
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for i in range(4):
+        product = product_service.get_product_by_id(f"p{i}")
+        assert sold[i] <= 50
+        assert product.stock == 50 - sold[i]
+        assert reservations.get_reserved_quantity(f"p{i}") == 0
+    assert reservations.get_active_reservation_count() == 0
+    in_stock = {p.product_id for p in product_service.get_products_sorted_by_price()}
+    assert in_stock == {f"p{i}" for i in range(4) if sold[i] < 50}
+
+
+def test_expired_reservations_hand_stock_back():
+    clock = FakeClock()
+    reservations = StockReservationService(make_service(stock=3), default_ttl_seconds=10, clock=clock)
+    held = reservations.try_reserve([("p0", 3)])
+    assert held and reservations.try_reserve([("p0", 1)]) is None
+    clock.now = 11
+    assert reservations.expire_reservations() == 1
+    assert reservations.get_available_stock("p0") == 3
+    assert not reservations.commit(held)
+    late = reservations.try_reserve([("p0", 2)], ttl_seconds=5)
+    clock.now = 20
+    assert not reservations.commit(late)
+    assert reservations.get_reserved_quantity("p0") == 0
+
+
+def test_invalid_baskets_reserve_nothing():
+    reservations = StockReservationService(make_service(stock=2))
+    assert reservations.try_reserve([]) is None
+    assert reservations.try_reserve([("p0", 0)]) is None
+    assert reservations.try_reserve([("p0", 1), ("p1", 3)]) is None
+    assert reservations.get_reserved_quantity("p0") == 0
+
+
+def test_commit_publishes_after_releasing_its_locks():
+    feed = ProductChangeFeed()
+    product_service = make_service(stock=2, change_feed=feed)
+    reservations = StockReservationService(product_service, stripe_count=1)
+    seen = []
+
+    def on_changes(changes):
+        # Reserving from the callback needs the stripe the commit used
+        seen.append((changes[0].stock, reservations.try_reserve([("p1", 1)]) is not None))
+
+    feed.subscribe(on_changes, ["p0"])
+    reservation_id = reservations.try_reserve([("p0", 2)])
+    worker = threading.Thread(target=reservations.commit, args=(reservation_id,), daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+    assert seen == [(0, True)]
+    assert not product_service.get_product_by_id("p0").is_available()
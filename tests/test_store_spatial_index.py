@@ -0,0 +1,59 @@
+import random
+from indexes.StoreSpatialIndex import StoreSpatialIndex, haversine_km
+from models.Profile import Location
+from models.Store import Store
+
+
+def brute_force(stores, latitude, longitude):
+    best = None
+    for store in stores:
+        if not store.is_active:
+            continue
+        distance = haversine_km(latitude, longitude, store.latitude, store.longitude)
+        if store.service_polygon:
+            if not store.polygon_contains(latitude, longitude):
+                continue
+        elif distance > store.service_radius_km:
+            continue
+        if best is None or distance < best[1]:
+            best = (store.store_id, distance)
+    return best[0] if best else None
+
+
+def test_find_store_matches_brute_force():
+    rng = random.Random(11)
+    stores = [Store(f"s{i}", latitude=12.9 + rng.uniform(0, 0.3), longitude=77.5 + rng.uniform(0, 0.3),
+                    service_radius_km=rng.uniform(1.0, 6.0), is_active=rng.random() > 0.1)
+              for i in range(40)]
+    stores.append(Store("poly", service_polygon=[(12.9, 77.5), (12.9, 77.6), (13.0, 77.6), (13.0, 77.5)]))
+    index = StoreSpatialIndex(stores)
+    for _ in range(500):
+        latitude, longitude = 12.85 + rng.uniform(0, 0.4), 77.45 + rng.uniform(0, 0.4)
+        assignment = index.find_store(latitude, longitude)
+        assert (assignment.store.store_id if assignment else None) == brute_force(stores, latitude, longitude)
+
+
+def test_readding_an_edited_store_replaces_its_old_cells():
+    a = Store("a", latitude=12.97, longitude=77.59, service_radius_km=3.0)
+    b = Store("b", latitude=12.99, longitude=77.61, service_radius_km=4.0)
+    index = StoreSpatialIndex([a, b])
+    a.service_radius_km = 15.0
+    index.add_store(a)
+    a.latitude, a.longitude, a.service_radius_km = 28.6, 77.2, 2.0
+    index.add_store(a)
+    assignment = index.find_store(12.97, 77.59)
+    assert assignment.store is b
+    assert index.find_store(28.6, 77.2).store is a
+    assert index.remove_store("a") and index.remove_store("b")
+    assert index._cells == {}
+
+
+def test_location_cache_is_bounded_and_tracks_edits():
+    index = StoreSpatialIndex([Store("a", latitude=12.97, longitude=77.59)], max_cached_locations=2)
+    home = Location(location_id="home", latitude=12.97, longitude=77.59)
+    assert index.resolve(home).store.store_id == "a"
+    for i in range(5):
+        index.resolve(Location(location_id=f"l{i}", latitude=12.97, longitude=77.59 + i * 0.001))
+    assert len(index._cache) == 2
+    home.latitude, home.longitude = 28.6, 77.2
+    assert index.resolve(home) is None